@@ -0,0 +1,248 @@
+"""Benchmark harness for the dashboard's data paths.
+
+Times the load, merge, aggregate, filter, pagination, chart and export steps
+the dashboard pages run, outside Streamlit, on a synthetic dataset (see
+``synthetic.py``). The merge step is the metadata lookup for the rows on
+screen, as the results tables do it. Each step reports wall time and peak
+traced memory and is compared against ``baselines.json``.
+
+Wall times are also stored relative to a fixed calibration workload timed in
+the same run, and compared in that form, so a baseline recorded on another
+machine stays meaningful. Differences below ``NOISE_SECONDS`` and
+``NOISE_MB`` are never flagged.
+
+Usage:
+    python benchmarks/run_benchmarks.py --scale small
+    python benchmarks/run_benchmarks.py --scale medium --update-baseline
+    python benchmarks/run_benchmarks.py --pages 250000 --data /tmp/synth
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'dashboard'))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+import synthetic  # noqa: E402
+from core import (  # noqa: E402
+    DataConfig,
+    FilterSpec,
+    aggregate_documents,
+    attach_metadata,
+    discipline_scores,
+    disciplines,
+    display_name,
+    filter_documents,
+    load_page_scores,
+    metadata_columns,
+    overall_score_columns,
+    page_number_scores,
+    paginate,
+)
+
+BASELINES_PATH = Path(__file__).resolve().parent / 'baselines.json'
+
+SCALES = {
+    'small': 10_000,
+    'medium': 100_000,
+    'large': 1_000_000,
+    'xlarge': 10_000_000,
+}
+
+# A step is flagged when it is this much slower / bigger than its baseline
+TOLERANCE = 1.25
+# ... and the difference exceeds these, below which timings and tracing are noise
+NOISE_SECONDS = 0.05
+NOISE_MB = 1.0
+
+
+# --- Data paths, as the pages run them through the core package ---
+
+def step_load(config):
+    # Page scores only, as load_dataset reads them; metadata is looked up per view
+    page_df = load_page_scores(config)
+    page_df.columns = [display_name(col) for col in page_df.columns]
+    return page_df
+
+
+def step_aggregate(page_df):
+    return aggregate_documents(page_df), page_df
+
+
+def step_merge(agg_df, config, rows_per_page=25):
+    # Metadata for the rows on screen, walking the table like step_paginate;
+    # the first lookup reads the metadata, as the first rerun of a process does
+    show_columns = ['Filename', 'Discipline'] + metadata_columns(config)
+    total_pages = max(1, (len(agg_df) - 1) // rows_per_page + 1)
+    for page_num in np.linspace(1, total_pages, num=min(total_pages, 10), dtype=int):
+        paginate(agg_df, show_columns, int(page_num), rows_per_page, config=config)
+
+
+def step_filter(agg_df, page_df):
+    # Discipline, score range, word count and filename search as the sidebar applies them
+    spec = FilterSpec(
+        discipline=disciplines(agg_df)[0],
+        score_col='Overall Score Pymupdf',
+        score_range=(0.3, 0.9),
+        min_words=100,
+        search='1',
+    )
+    return filter_documents(agg_df, page_df, spec)
+
+
+def step_paginate(agg_df, rows_per_page=25):
+    show_columns = agg_df.columns[:8].tolist()
+    total_pages = max(1, (len(agg_df) - 1) // rows_per_page + 1)
+    # Walk a handful of pages spread over the table, as a reviewer paging through
+    for page_num in np.linspace(1, total_pages, num=min(total_pages, 10), dtype=int):
+        paginate(agg_df, show_columns, int(page_num), rows_per_page)
+
+
+def step_chart(page_df):
+    overall_score_cols = overall_score_columns(page_df)
+    fig_scores = go.Figure()
+    for col in overall_score_cols[:3]:
+        fig_scores.add_trace(go.Histogram(x=page_df[col], nbinsx=20))
+    px.bar(discipline_scores(page_df, overall_score_cols[0]), x='Discipline', y='Average Score', text='Count')
+    page_scores = page_number_scores(page_df, 'Page Num', overall_score_cols[0], min_count=5)
+    px.scatter(page_scores, x='Page Number', y='Average Score', size='Count')
+
+
+def step_export(agg_df, config):
+    # The export joins every metadata column onto the filtered documents
+    return attach_metadata(agg_df, config).to_csv(index=False)
+
+
+# --- Harness ---
+
+def calibrate(repeats=5):
+    """Seconds of a fixed sort, group-by and CSV workload on this machine, best of ``repeats``"""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'key': rng.integers(0, 1000, 1_000_000), 'value': rng.random(1_000_000)})
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        np.sort(frame['value'].to_numpy())
+        frame.groupby('key')['value'].agg(['mean', 'count'])
+        frame.head(100_000).to_csv(index=False)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(results, name, fn, *args):
+    """Run ``fn`` once, recording wall time and peak traced memory under ``name``"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    results[name] = {'seconds': round(elapsed, 4), 'peak_mb': round(peak / 1024 ** 2, 2)}
+    return value
+
+
+def run(paths):
+    """Run every step on the dataset at ``paths``; return ({step: {seconds, relative, peak_mb}}, calibration).
+
+    The calibration is timed before and after the steps and the faster of
+    the two is used, so a busy moment on the machine skews it less.
+    """
+    config = DataConfig(page_scores_csv=paths['page_scores_csv'], metadata_pkl=paths['metadata_pkl'])
+    calibration = calibrate()
+    results = {}
+    page_df = measure(results, 'load', step_load, config)
+    agg_df, page_df = measure(results, 'aggregate', step_aggregate, page_df)
+    measure(results, 'merge', step_merge, agg_df, config)
+    measure(results, 'filter', step_filter, agg_df, page_df)
+    measure(results, 'pagination', step_paginate, agg_df)
+    measure(results, 'chart', step_chart, page_df)
+    measure(results, 'export', step_export, agg_df, config)
+    calibration = min(calibration, calibrate())
+    for values in results.values():
+        values['relative'] = round(values['seconds'] / calibration, 4)
+    return results, calibration
+
+
+def _regressed(value, base, noise):
+    return value > base * TOLERANCE and value - base > noise
+
+
+def compare(results, baseline, calibration):
+    """Print a results table against ``baseline``; return the regressed step names.
+
+    Times are compared relative to the calibration workload, or in seconds
+    against baselines recorded before it existed.
+    """
+    regressions = []
+    print(f"{'step':<12}{'seconds':>10}{'relative':>10}{'base':>10}{'ratio':>8}{'peak MB':>10}{'base':>10}{'ratio':>8}")
+    for step, values in results.items():
+        base = baseline.get(step, {})
+        row = f"{step:<12}{values['seconds']:>10.3f}{values['relative']:>10.2f}"
+        flagged = False
+        time_key = 'relative' if 'relative' in base else 'seconds'
+        if base.get(time_key, 0) > 0:
+            # Seconds the difference amounts to on this machine
+            scale = calibration if time_key == 'relative' else 1.0
+            row += f"{base[time_key]:>10.3f}{values[time_key] / base[time_key]:>8.2f}"
+            flagged |= _regressed(values[time_key] * scale, base[time_key] * scale, NOISE_SECONDS)
+        else:
+            row += f"{'-':>10}{'-':>8}"
+        row += f"{values['peak_mb']:>10.1f}"
+        if base.get('peak_mb', 0) > 0:
+            row += f"{base['peak_mb']:>10.1f}{values['peak_mb'] / base['peak_mb']:>8.2f}"
+            flagged |= _regressed(values['peak_mb'], base['peak_mb'], NOISE_MB)
+        else:
+            row += f"{'-':>10}{'-':>8}"
+        if flagged:
+            regressions.append(step)
+            row += "  REGRESSION"
+        print(row)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard data paths")
+    parser.add_argument('--scale', choices=SCALES, default='small', help="Named dataset size")
+    parser.add_argument('--pages', type=int, help="Custom number of pages (overrides --scale)")
+    parser.add_argument('--data', type=Path, help="Dataset directory; generated here if missing")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--update-baseline', action='store_true', help="Store these results as the baseline")
+    args = parser.parse_args()
+
+    n_pages = args.pages or SCALES[args.scale]
+    key = args.scale if not args.pages else f'pages_{n_pages}'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data or Path(tmp)
+        csv_path = data_dir / 'page_scores_full.csv'
+        if csv_path.exists():
+            paths = {'page_scores_csv': csv_path, 'metadata_pkl': data_dir / 'metadata_openalex(silver).pkl'}
+        else:
+            print(f"Generating {n_pages:,} synthetic pages in {data_dir}")
+            paths = synthetic.generate(data_dir, n_pages, seed=args.seed, with_files=False)
+        results, calibration = run(paths)
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    print(f"\nDataset: {key} ({n_pages:,} pages), calibration {calibration:.3f}s")
+    regressions = compare(results, baselines.get(key, {}), calibration)
+
+    if args.update_baseline:
+        baselines[key] = results
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + '\n')
+        print(f"Baseline for '{key}' written to {BASELINES_PATH}")
+    elif regressions:
+        print(f"\nRegressions (> {TOLERANCE:.2f}x baseline): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
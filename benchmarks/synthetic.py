@@ -0,0 +1,200 @@
+"""Synthetic dataset generator for the benchmark suite.
+
+Produces a page-score CSV, a metadata pickle and (optionally) PDF/markdown
+trees with the same schema and layout the dashboard pages expect, so the data
+paths can be exercised at any scale without access to the real corpus.
+
+Usage:
+    python benchmarks/synthetic.py --pages 100000 --out /tmp/synth
+    python benchmarks/synthetic.py --pages 10000000 --out /data/synth --no-files
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+TOOLS = ['pymupdf', 'marker', 'mineru']
+CRITERIA = ['line_continuity', 'paragraph_integrity', 'content_sequencing',
+            'layout_separation', 'text_completeness']
+DISCIPLINES = ['archeo', 'archi', 'envir', 'hist', 'relig', 'socio']
+
+# Average number of pages per document in the real corpus
+MEAN_PAGES_PER_DOC = 12
+# Documents written per CSV chunk, keeps generation memory flat at 10M pages
+DOCS_PER_CHUNK = 50_000
+
+WORDS = ('the of and to in a is that for on as with by was this are from be '
+         'an which archaeological settlement religious urban environmental '
+         'historical social analysis landscape heritage community').split()
+
+# Smallest well-formed single page PDF, enough for the viewer's iframe
+MINIMAL_PDF = (
+    b"%PDF-1.4\n"
+    b"1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n"
+    b"%%EOF\n"
+)
+
+
+def score_columns():
+    """Return the per-tool score column names of the page-score CSV"""
+    cols = []
+    for tool in TOOLS:
+        cols.append(f'overall_score_{tool}')
+        cols.extend(f'{criterion}_score_{tool}' for criterion in CRITERIA)
+    return cols
+
+
+def filename_for(doc_id):
+    """Same normalisation the pages apply to pdf_id / id_gotriple"""
+    return 'extracted_' + str(doc_id).replace('/', '_').replace(':', '_').replace('.', '_')
+
+
+def make_documents(n_pages, seed=0):
+    """Build the document table: id, discipline and page count per document"""
+    rng = np.random.default_rng(seed)
+    n_docs = max(1, int(round(n_pages / MEAN_PAGES_PER_DOC)))
+
+    # Split n_pages into n_docs positive page counts around the corpus mean
+    weights = rng.gamma(shape=2.0, scale=1.0, size=n_docs)
+    page_counts = np.maximum(1, np.floor(weights / weights.sum() * n_pages)).astype(np.int64)
+    diff = n_pages - int(page_counts.sum())
+    if diff > 0:
+        np.add.at(page_counts, rng.integers(0, n_docs, size=diff), 1)
+    elif diff < 0:
+        # Trim the longest documents until the total matches exactly
+        order = np.argsort(page_counts)[::-1]
+        i = 0
+        while diff < 0:
+            idx = order[i % n_docs]
+            if page_counts[idx] > 1:
+                page_counts[idx] -= 1
+                diff += 1
+            i += 1
+
+    ids = np.array([f'oai:synthetic.org:{i:09d}' for i in range(n_docs)], dtype=object)
+    disciplines = rng.choice(DISCIPLINES, size=n_docs)
+    return pd.DataFrame({'pdf_id': ids, 'discipline': disciplines, 'page_count': page_counts})
+
+
+def make_page_scores(docs, seed=0):
+    """Yield page-score chunks (one row per page) for the given documents"""
+    rng = np.random.default_rng(seed + 1)
+    # Per tool quality offset so tools are distinguishable in the charts
+    tool_bias = {'pymupdf': -0.05, 'marker': 0.05, 'mineru': 0.0}
+
+    for start in range(0, len(docs), DOCS_PER_CHUNK):
+        chunk = docs.iloc[start:start + DOCS_PER_CHUNK]
+        counts = chunk['page_count'].to_numpy()
+        n = int(counts.sum())
+        # Page numbers restart at 1 for every document
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        page_num = np.arange(n) - offsets + 1
+
+        data = {
+            'pdf_id': np.repeat(chunk['pdf_id'].to_numpy(), counts),
+            'discipline': np.repeat(chunk['discipline'].to_numpy(), counts),
+            'page_num': page_num,
+        }
+        # Shared per page difficulty so scores correlate across tools/criteria
+        difficulty = rng.beta(5, 2, size=n)
+        for tool in TOOLS:
+            criteria = []
+            for criterion in CRITERIA:
+                noise = rng.normal(0, 0.1, size=n)
+                score = np.clip(difficulty + tool_bias[tool] + noise, 0, 1).round(2)
+                data[f'{criterion}_score_{tool}'] = score
+                criteria.append(score)
+            data[f'overall_score_{tool}'] = np.mean(criteria, axis=0).round(3)
+            data[f'word_count_{tool}'] = rng.poisson(350, size=n)
+
+        ordered = ['pdf_id', 'discipline', 'page_num']
+        for tool in TOOLS:
+            ordered.append(f'overall_score_{tool}')
+            ordered.extend(f'{criterion}_score_{tool}' for criterion in CRITERIA)
+            ordered.append(f'word_count_{tool}')
+        yield pd.DataFrame(data)[ordered]
+
+
+def make_metadata(docs, seed=0):
+    """Build a metadata frame with the OpenAlex pickle's columns"""
+    rng = np.random.default_rng(seed + 2)
+    n = len(docs)
+    title_words = rng.choice(WORDS, size=(n, 6))
+    return pd.DataFrame({
+        'id_openalex': [f'W{4000000000 + i}' for i in range(n)],
+        'title': [' '.join(words).capitalize() for words in title_words],
+        'lang': 'en',
+        'type': 'article',
+        'authors': [[f'Author {i % 997}', f'Author {(i * 7) % 991}'] for i in range(n)],
+        'primary_topic': rng.choice(['Archaeological Research', 'Urban Studies',
+                                     'Religious Studies', 'Environmental History'], size=n),
+        'referenced_works_count': rng.integers(0, 80, size=n),
+        'referenced_works': [[] for _ in range(n)],
+        'publication_date': pd.Timestamp('2015-01-01') + pd.to_timedelta(rng.integers(0, 3650, size=n), unit='D'),
+        'id_gotriple': docs['pdf_id'].to_numpy(),
+        'discipline': docs['discipline'].to_numpy(),
+        'pdf_page_count': docs['page_count'].to_numpy().astype(float),
+    })
+
+
+def write_files(docs, pdf_dir, markdown_dir, max_docs, seed=0):
+    """Write PDF and per-tool markdown files for the first ``max_docs`` documents"""
+    rng = np.random.default_rng(seed + 3)
+    for row in docs.head(max_docs).itertuples(index=False):
+        filename = filename_for(row.pdf_id)
+        pdf_path = pdf_dir / row.discipline / f"{filename}.pdf"
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        pdf_path.write_bytes(MINIMAL_PDF)
+
+        for tool in TOOLS:
+            md_path = markdown_dir / tool / row.discipline / f"{filename}_{tool}.md"
+            md_path.parent.mkdir(parents=True, exist_ok=True)
+            pages = []
+            for page in range(1, row.page_count + 1):
+                words = rng.choice(WORDS, size=rng.integers(150, 450))
+                pages.append(f"## Page {page}\n\n" + ' '.join(words))
+            md_path.write_text('\n\n'.join(pages), encoding='utf-8')
+
+
+def generate(out_dir, n_pages, seed=0, with_files=True, max_file_docs=200):
+    """Generate a complete synthetic dataset under ``out_dir``; return its paths"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        'page_scores_csv': out_dir / 'page_scores_full.csv',
+        'metadata_pkl': out_dir / 'metadata_openalex(silver).pkl',
+        'pdf_dir': out_dir / 'pdfs',
+        'markdown_dir': out_dir / 'extracted',
+    }
+
+    docs = make_documents(n_pages, seed)
+    for i, chunk in enumerate(make_page_scores(docs, seed)):
+        chunk.to_csv(paths['page_scores_csv'], mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    make_metadata(docs, seed).to_pickle(paths['metadata_pkl'])
+
+    if with_files:
+        write_files(docs, paths['pdf_dir'], paths['markdown_dir'], max_file_docs, seed)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark dataset")
+    parser.add_argument('--pages', type=int, default=10_000, help="Number of page rows (10k to 10M)")
+    parser.add_argument('--out', type=Path, required=True, help="Output directory")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-files', action='store_true', help="Skip the PDF/markdown trees")
+    parser.add_argument('--max-file-docs', type=int, default=200,
+                        help="Number of documents to write PDF/markdown files for")
+    args = parser.parse_args()
+
+    paths = generate(args.out, args.pages, args.seed, not args.no_files, args.max_file_docs)
+    for name, path in paths.items():
+        print(f"{name.upper()}={path}")
+
+
+if __name__ == '__main__':
+    main()
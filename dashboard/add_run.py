@@ -0,0 +1,54 @@
+"""Add a benchmark run to the run store, or list the stored runs.
+
+Each run is an immutable copy of a page-score CSV (see ``core/runs.py``).
+Point RUNS_DIR at the store to pick runs in the dashboard and compare them
+on the Run Comparison page.
+
+Usage:
+    python dashboard/add_run.py --csv data/page_scores_full.csv --name 2024-06-01
+    python dashboard/add_run.py --runs /data/runs --list
+"""
+import argparse
+import time
+from pathlib import Path
+
+from core import DataConfig, RunStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Add a benchmark run to the run store")
+    parser.add_argument('--runs', type=Path, help="Run store directory (default: RUNS_DIR)")
+    parser.add_argument('--csv', type=Path, help="Page-score CSV of the run (default: PAGE_SCORES_CSV)")
+    parser.add_argument('--name', help="Name of the new run (letters, digits, '.', '_' and '-')")
+    parser.add_argument('--list', action='store_true', help="List the stored runs and exit")
+    args = parser.parse_args()
+
+    config = DataConfig.from_env()
+    runs_dir = args.runs or config.runs_dir
+    if runs_dir is None:
+        parser.error("--runs or RUNS_DIR is required")
+    store = RunStore(runs_dir)
+
+    if args.list:
+        for run in store.runs:
+            print(f"{run['name']}\t{run['created']}\t{run['pages']:,} pages\t"
+                  f"{run['documents']:,} documents\t{run['source']}")
+        return
+
+    if not args.name:
+        parser.error("--name is required")
+    csv_path = args.csv or config.page_scores_csv
+    if not csv_path.exists():
+        parser.error(f"Page scores data file not found: {csv_path}")
+
+    start = time.perf_counter()
+    try:
+        run = store.add_run(args.name, csv_path)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Added run {run['name']} with {run['pages']:,} pages of {run['documents']:,} documents "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
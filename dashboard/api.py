@@ -0,0 +1,228 @@
+"""Read-only HTTP/JSON API over the benchmark results.
+
+Serves the same data layer as the dashboard (``core``), so the dataset is
+loaded once per process and reused by every request. Responses carry an ETag
+derived from the dataset version and the request, and conditional GETs
+(``If-None-Match``) are answered with 304 before any work is done.
+
+Endpoints (all GET):
+    /health
+    /pages                 page rows; filters: discipline, page_min, page_max,
+                           min_score, min_words, search, stat_col, stat_min,
+                           stat_max
+    /documents             document rows; filters: discipline, score_col,
+                           score_min, score_max, min_words, search, stat_col,
+                           stat_min, stat_max
+    /documents/<filename>  one document with its page rows
+    /disciplines           per-discipline counts and mean overall score per tool
+    /tools                 per-tool mean overall / criterion scores (filterable
+                           like /pages)
+
+List endpoints take ``offset``, ``limit`` (max 1000) and ``columns``
+(comma-separated snake_case names).
+
+Usage:
+    python dashboard/api.py --port 8502
+"""
+import argparse
+import hashlib
+import json
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from core import (
+    DataConfig,
+    DataLoadError,
+    FilterSpec,
+    attach_metadata,
+    cached_result,
+    dataset_version,
+    discipline_summary,
+    document_rows,
+    filter_bounds,
+    filtered_documents,
+    filtered_pages,
+    load_dataset,
+    metadata_columns,
+    raw_name,
+    tool_summary,
+)
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def to_records(df):
+    """JSON-ready records with snake_case keys (NaN -> null, dates as ISO strings)"""
+    df = df.rename(columns=raw_name)
+    return json.loads(df.to_json(orient='records', date_format='iso'))
+
+
+@lru_cache(maxsize=4)
+def _summaries(config, version):
+    # Unfiltered aggregates are computed once per dataset version
+    agg_df, page_df = load_dataset(config)
+    return to_records(discipline_summary(agg_df, page_df)), to_records(tool_summary(page_df))
+
+
+class BenchmarkAPI:
+    """Request routing and query execution, independent of the HTTP server"""
+
+    def __init__(self, config):
+        self.config = config
+
+    def version(self):
+        return dataset_version(self.config)
+
+    def etag(self, path, params):
+        canonical = path + '?' + '&'.join(f'{k}={v}' for k, v in sorted(params.items()))
+        digest = hashlib.sha1(f'{self.version()}|{canonical}'.encode('utf-8')).hexdigest()
+        return f'"{digest}"'
+
+    def handle(self, path, params):
+        """Return the JSON-serialisable body for ``path``; raises APIError"""
+        parts = [unquote(part) for part in path.strip('/').split('/') if part]
+        if parts == ['health']:
+            return {'status': 'ok', 'version': self.version()}
+        if parts == ['pages']:
+            return self.pages(params)
+        if parts == ['documents']:
+            return self.documents(params)
+        if len(parts) == 2 and parts[0] == 'documents':
+            return self.document(parts[1])
+        if parts == ['disciplines']:
+            return {'items': _summaries(self.config, self.version())[0]}
+        if parts == ['tools']:
+            return self.tools(params)
+        raise APIError(HTTPStatus.NOT_FOUND, f"Unknown endpoint: {path}")
+
+    def _spec(self, params):
+        try:
+            return FilterSpec.from_params(params)
+        except ValueError as e:
+            raise APIError(HTTPStatus.BAD_REQUEST, f"Invalid filter value: {e}")
+
+    def _resolve(self, spec, df):
+        """``spec`` with its score and statistic columns resolved to display names of ``df``"""
+        # Accept snake_case column names as well as display names
+        by_name = {raw_name(col): col for col in df.columns}
+        for field, kind in (('score_col', 'score'), ('stat_col', 'text statistic')):
+            name = getattr(spec, field)
+            if name and name not in df.columns:
+                if name not in by_name:
+                    raise APIError(HTTPStatus.BAD_REQUEST, f"Unknown {kind} column: {name}")
+                spec = FilterSpec(**{**spec.__dict__, field: by_name[name]})
+        return spec
+
+    def _page_of(self, df, params):
+        try:
+            offset = max(0, int(params.get('offset', 0)))
+            limit = min(MAX_LIMIT, max(1, int(params.get('limit', DEFAULT_LIMIT))))
+        except ValueError:
+            raise APIError(HTTPStatus.BAD_REQUEST, "offset and limit must be integers")
+
+        # Metadata is only looked up for the rows being returned
+        subset = df.iloc[offset:offset + limit]
+        if params.get('columns'):
+            available = df.columns.tolist() + metadata_columns(self.config)
+            by_name = {raw_name(col): col for col in available}
+            wanted = [name.strip() for name in params['columns'].split(',') if name.strip()]
+            unknown = [name for name in wanted if name not in by_name]
+            if unknown:
+                raise APIError(HTTPStatus.BAD_REQUEST, f"Unknown columns: {', '.join(unknown)}")
+            columns = [by_name[name] for name in wanted]
+            subset = attach_metadata(subset, self.config, columns)[columns]
+        else:
+            subset = attach_metadata(subset, self.config)
+        return {'total': len(df), 'offset': offset, 'limit': limit, 'items': to_records(subset)}
+
+    def pages(self, params):
+        _, page_df = filter_bounds(self.config)
+        spec = self._resolve(self._spec(params), page_df)
+        return self._page_of(filtered_pages(self.config, spec), params)
+
+    def documents(self, params):
+        agg_df, _ = filter_bounds(self.config)
+        spec = self._resolve(self._spec(params), agg_df)
+        agg_df, _ = filtered_documents(self.config, spec)
+        return self._page_of(agg_df, params)
+
+    def document(self, filename):
+        rows, pages = document_rows(self.config, filename)
+        if rows.empty:
+            raise APIError(HTTPStatus.NOT_FOUND, f"Unknown document: {filename}")
+        return {
+            'document': to_records(attach_metadata(rows.head(1), self.config))[0],
+            'pages': to_records(pages),
+        }
+
+    def tools(self, params):
+        spec = self._spec(params)
+        if spec == FilterSpec():
+            return {'items': _summaries(self.config, self.version())[1]}
+        _, page_df = filter_bounds(self.config)
+        spec = self._resolve(spec, page_df)
+        summary = cached_result('tool_summary', self.config, spec,
+                                lambda: tool_summary(filtered_pages(self.config, spec)))
+        return {'items': to_records(summary)}
+
+
+def make_handler(api):
+    class Handler(BaseHTTPRequestHandler):
+        server_version = 'BenchmarkAPI/1.0'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = dict(parse_qsl(url.query))
+            try:
+                etag = api.etag(url.path, params)
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(HTTPStatus.NOT_MODIFIED)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                status, body = HTTPStatus.OK, api.handle(url.path, params)
+            except APIError as e:
+                etag, status, body = None, e.status, {'error': str(e)}
+            except DataLoadError as e:
+                etag, status, body = None, HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(e)}
+
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            if etag:
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve benchmark results as JSON")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--no-preload', action='store_true', help="Load the dataset on the first request")
+    args = parser.parse_args()
+
+    api = BenchmarkAPI(DataConfig.from_env())
+    if not args.no_preload:
+        # In memory-budget mode this reads the store once, leaving the last partitions cached
+        filter_bounds(api.config)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(api))
+    print(f"Serving benchmark API on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
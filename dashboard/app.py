@@ -1,17 +1,16 @@
 import streamlit as st
-import pandas as pd
-import os
-from pathlib import Path
 
-# --- Global Path Configuration ---
-# Get the absolute path of the current script
-PROJECT_ROOT = Path(__file__).resolve().parent.parent
+from core import DataConfig, RunStore
 
-# Get paths from environment variables with fallbacks to defaults
-PDF_DIR_DEFAULT = os.getenv('PDF_DIR', None)
-MARKDOWN_DIR_DEFAULT = os.getenv('MARKDOWN_DIR', None)
-PAGE_SCORES_CSV_DEFAULT = os.getenv('PAGE_SCORES_CSV', PROJECT_ROOT / 'data' / 'page_scores_full.csv')
-METADATA_PKL_DEFAULT = os.getenv('METADATA_PKL', PROJECT_ROOT / 'data' / 'metadata_openalex(silver).pkl')
+# --- Global Path Configuration ---
+# Defaults come from PDF_DIR, MARKDOWN_DIR, PAGE_SCORES_CSV and METADATA_PKL
+DEFAULT_CONFIG = DataConfig.from_env()
+PDF_DIR_DEFAULT = str(DEFAULT_CONFIG.pdf_dir) if DEFAULT_CONFIG.pdf_dir else None
+MARKDOWN_DIR_DEFAULT = str(DEFAULT_CONFIG.markdown_dir) if DEFAULT_CONFIG.markdown_dir else None
+PAGE_SCORES_CSV_DEFAULT = str(DEFAULT_CONFIG.page_scores_csv)
+METADATA_PKL_DEFAULT = str(DEFAULT_CONFIG.metadata_pkl)
+RUNS_DIR_DEFAULT = str(DEFAULT_CONFIG.runs_dir) if DEFAULT_CONFIG.runs_dir else None
+TEXT_STATS_DIR_DEFAULT = str(DEFAULT_CONFIG.text_stats_dir) if DEFAULT_CONFIG.text_stats_dir else None
 
 # Initialize session state for paths if not already set
 # if 'overall_scores_csv' not in st.session_state:
@@ -24,12 +23,18 @@ if 'pdf_dir' not in st.session_state: # Renamed from pdf_path to pdf_dir for cla
     st.session_state.pdf_dir = PDF_DIR_DEFAULT
 if 'markdown_dir' not in st.session_state:
     st.session_state.markdown_dir = MARKDOWN_DIR_DEFAULT
+if 'runs_dir' not in st.session_state:
+    st.session_state.runs_dir = RUNS_DIR_DEFAULT
+if 'run' not in st.session_state:
+    st.session_state.run = DEFAULT_CONFIG.run
+if 'text_stats_dir' not in st.session_state:
+    st.session_state.text_stats_dir = TEXT_STATS_DIR_DEFAULT
 
 # Initialize other session state variables
 if 'selected_file' not in st.session_state:
     st.session_state.selected_file = None
-if 'selected_row_data' not in st.session_state:
-    st.session_state.selected_row_data = None
+if 'selected_discipline' not in st.session_state:
+    st.session_state.selected_discipline = None
 if 'selected_pdf_file' not in st.session_state:
     st.session_state.selected_pdf_file = None
 if 'selected_markdown_file' not in st.session_state:
@@ -159,6 +164,16 @@ if new_markdown_dir != st.session_state.markdown_dir:
     st.session_state.markdown_dir = new_markdown_dir
     st.success(f"Markdown directory path updated to: {new_markdown_dir}")
 
+# Text Statistics Directory Path
+new_text_stats_dir = st.text_input(
+    "Text Statistics Directory Path",
+    value=st.session_state.text_stats_dir or '',
+    help="Output of dashboard/text_stats.py. Adds per-page and per-document statistics of the extracted Markdown as filterable columns."
+)
+if new_text_stats_dir != (st.session_state.text_stats_dir or ''):
+    st.session_state.text_stats_dir = new_text_stats_dir or None
+    st.success(f"Text statistics directory path updated to: {new_text_stats_dir}")
+
 st.markdown("##### CSV and Pickle File Paths")
 
 # Overall Scores CSV Path
@@ -191,4 +206,33 @@ if new_metadata_pkl != st.session_state.metadata_pkl:
     st.session_state.metadata_pkl = new_metadata_pkl
     st.success(f"Metadata PKL path updated to: {new_metadata_pkl}")
 
+st.markdown("##### Benchmark Runs")
+
+# Runs Directory Path
+new_runs_dir = st.text_input(
+    "Runs Directory Path",
+    value=st.session_state.runs_dir or '',
+    help="Directory of benchmark runs added with dashboard/add_run.py. Selecting a run replaces the page scores CSV."
+)
+if new_runs_dir != (st.session_state.runs_dir or ''):
+    st.session_state.runs_dir = new_runs_dir or None
+    st.session_state.run = None
+    st.success(f"Runs directory path updated to: {new_runs_dir}")
+
+if RunStore.exists(st.session_state.runs_dir):
+    runs = {run['name']: run for run in RunStore(st.session_state.runs_dir).runs}
+    options = [None] + list(runs)
+    selected_run = st.selectbox(
+        "Benchmark Run",
+        options,
+        index=options.index(st.session_state.run) if st.session_state.run in options else 0,
+        format_func=lambda name: "Page scores CSV" if name is None else
+            f"{name} ({runs[name]['created']}, {runs[name]['pages']:,} pages)"
+    )
+    if selected_run != st.session_state.run:
+        st.session_state.run = selected_run
+        st.success(f"Showing {'the page scores CSV' if selected_run is None else f'benchmark run {selected_run}'}")
+elif st.session_state.runs_dir:
+    st.info("No benchmark runs found in this directory yet.")
+
 st.markdown("---") # Visual separator
\ No newline at end of file
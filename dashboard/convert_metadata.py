@@ -0,0 +1,39 @@
+"""Convert the OpenAlex metadata pickle into a compact metadata store.
+
+The store (see ``core/metadata.py``) is columnar and memory-mapped, so the
+dashboard, API and reports can read it without unpickling. Point
+METADATA_DIR at the output to use it.
+
+Usage:
+    python dashboard/convert_metadata.py --out /data/metadata
+    python dashboard/convert_metadata.py --pkl "data/metadata_openalex(silver).pkl" --out /data/metadata
+"""
+import argparse
+import time
+from pathlib import Path
+
+from core import DataConfig, MetadataStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the metadata pickle to a metadata store")
+    parser.add_argument('--pkl', type=Path, help="Metadata pickle (default: METADATA_PKL)")
+    parser.add_argument('--out', type=Path, help="Output directory (default: METADATA_DIR)")
+    args = parser.parse_args()
+
+    config = DataConfig.from_env()
+    pkl_path = args.pkl or config.metadata_pkl
+    out = args.out or config.metadata_dir
+    if out is None:
+        parser.error("--out or METADATA_DIR is required")
+    if not pkl_path.exists():
+        parser.error(f"Metadata file not found: {pkl_path}")
+
+    start = time.perf_counter()
+    store = MetadataStore.build(pkl_path, out)
+    kinds = ', '.join(f"{name} ({kind})" for name, kind in store.columns.items())
+    print(f"Wrote {store.rows:,} documents to {out} ({time.perf_counter() - start:.1f}s)\nColumns: {kinds}")
+
+
+if __name__ == '__main__':
+    main()
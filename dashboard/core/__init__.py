@@ -0,0 +1,95 @@
+"""Data layer of the benchmark dashboard.
+
+Plain pandas code with no Streamlit dependency, so it can be imported by the
+pages, scripts and benchmarks alike. Configuration is passed explicitly as a
+``DataConfig``; filter state as a ``FilterSpec``.
+"""
+from .aggregator import (
+    CRITERIA,
+    TOOLS,
+    default_display_columns,
+    discipline_scores,
+    discipline_summary,
+    document_pages,
+    page_number_scores,
+    paginate,
+    score_breakdown,
+    score_histogram,
+    text_statistic_scores,
+    tool_comparison,
+    tool_summary,
+)
+from .compare import COMPARISON_CRITERIA, bootstrap_differences, cached_comparison, compare_tools, tool_pairs
+from .config import DataConfig
+from .filters import (
+    TEXT_STATISTICS,
+    FilterSpec,
+    clamp_range,
+    default_score_column,
+    disciplines,
+    filter_documents,
+    filter_pages,
+    numeric_columns,
+    overall_score_columns,
+    page_column,
+    score_columns,
+    text_statistic_columns,
+    word_count_columns,
+)
+from .loader import (
+    DataLoadError,
+    MemoryBudgetError,
+    aggregate_documents,
+    dataset_version,
+    display_name,
+    load_dataset,
+    load_metadata,
+    load_page_scores,
+    load_pages,
+    memory_budget,
+    merge_metadata,
+    metadata_source,
+    normalize_doc_id,
+    page_source,
+    raw_name,
+    text_stats_source,
+)
+from .locator import EXTRACTION_TOOLS, FileLocator
+from .manifest import FileManifest, file_manifest
+from .metadata import (
+    MetadataStore,
+    attach_metadata,
+    document_metadata,
+    metadata_columns,
+    metadata_store,
+    metadata_table,
+)
+from .moments import VARIABLES, MomentTable, moment_table, variable_column
+from .paging import PagedDataset, PartitionCache, paged_dataset
+from .parallel import derived_dir, fresh_derived, refresh_derived, summarize_parallel
+from .prefetch import Prefetcher, load_markdown, load_pdf, pdf_base64, prefetch_document, prefetcher
+from .results import (
+    ResultCache,
+    cached_result,
+    document_rows,
+    filter_bounds,
+    filtered_documents,
+    filtered_pages,
+    result_cache,
+)
+from .runs import RunStore, run_deltas, run_store
+from .session import (
+    SessionCache,
+    clear_selection,
+    link_filters,
+    link_update,
+    select,
+    selected_row,
+    selection,
+    session_cache,
+)
+from .store import ColumnStore, Partition
+from .summary import SummaryAccumulator, summarize_store, summary_columns
+from .textstats import attach_text_statistics, build_text_stats, file_statistics, split_pages
+from .textview import TextDocument, markdown_document
+from .triage import TRIAGE_K, TriageIndex, triage_index
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from .metadata import attach_metadata
+
+# Tools and LLM-judge criteria as they appear in display column names
+TOOLS = ['Pymupdf', 'Marker', 'Mineru']
+CRITERIA = ['Line Continuity', 'Paragraph Integrity', 'Content Sequencing',
+            'Layout Separation', 'Text Completeness']
+
+
+def default_display_columns(available_cols, priority_cols, limit=8):
+    """Priority columns, then overall scores, then anything else up to ``limit``"""
+    default_cols = [col for col in priority_cols if col in available_cols]
+    for col in available_cols:
+        if 'Overall' in col and 'Score' in col and col not in default_cols:
+            default_cols.append(col)
+    remaining_cols = [col for col in available_cols if col not in default_cols]
+    while len(default_cols) < limit and remaining_cols:
+        default_cols.append(remaining_cols.pop(0))
+    return default_cols
+
+
+def paginate(df, columns, page_num, rows_per_page, config=None, manifest=None):
+    """Return (subset, start_idx, end_idx, total_pages) for a 1-based table page.
+
+    With ``config``, requested columns missing from ``df`` are looked up as
+    metadata for the visible rows only. With a ``FileManifest``, so are its
+    file availability columns.
+    """
+    total_rows = len(df)
+    total_pages = max(1, (total_rows - 1) // rows_per_page + 1)
+    page_num = min(max(1, page_num), total_pages)
+    start_idx = (page_num - 1) * rows_per_page
+    end_idx = min(start_idx + rows_per_page, total_rows)
+    # Slice rows before selecting columns so only the visible rows are copied
+    rows = df.iloc[start_idx:end_idx]
+    missing = [col for col in columns if col not in df.columns]
+    if manifest is not None and any(col in manifest.columns for col in missing):
+        availability = manifest.availability(rows)
+        rows = pd.concat([rows, availability[[col for col in manifest.columns if col in missing]]], axis=1)
+        missing = [col for col in missing if col not in rows.columns]
+    if missing and config is not None:
+        rows = attach_metadata(rows, config, missing)
+    subset = rows[[col for col in columns if col in rows.columns]].reset_index(drop=True)
+    return subset, start_idx, end_idx, total_pages
+
+
+def discipline_scores(df, score_col):
+    """Average ``score_col`` and row count per discipline"""
+    scores = df.groupby('Discipline')[score_col].agg(['mean', 'count']).reset_index()
+    scores.columns = ['Discipline', 'Average Score', 'Count']
+    return scores
+
+
+def score_histogram(df, columns, bins=20, value_range=(0.0, 1.0)):
+    """Counts of each column's values in ``bins`` equal bins over ``value_range``.
+
+    Returns Column, Bin Start, Bin End and Count, so a histogram can be drawn
+    from a few numbers instead of every value.
+    """
+    edges = np.linspace(value_range[0], value_range[1], bins + 1)
+    frames = []
+    for col in columns:
+        values = df[col].to_numpy(dtype=float)
+        counts, _ = np.histogram(values[~np.isnan(values)], bins=edges)
+        frames.append(pd.DataFrame({'Column': col, 'Bin Start': edges[:-1], 'Bin End': edges[1:], 'Count': counts}))
+    if not frames:
+        return pd.DataFrame(columns=['Column', 'Bin Start', 'Bin End', 'Count'])
+    return pd.concat(frames, ignore_index=True)
+
+
+def page_number_scores(df, page_col, score_col, min_count=5):
+    """Average ``score_col`` per page number, keeping page numbers with at least ``min_count`` rows"""
+    scores = df.groupby(page_col)[score_col].agg(['mean', 'count']).reset_index()
+    scores.columns = ['Page Number', 'Average Score', 'Count']
+    return scores[scores['Count'] >= min_count]
+
+
+def text_statistic_scores(df, statistic, bins=10):
+    """Mean overall score per quantile bin of a text statistic, per tool.
+
+    Returns Tool, Statistic (mean value in the bin), Average Score and Count;
+    rows without the statistic or the score are left out.
+    """
+    frames = []
+    for tool in TOOLS:
+        stat_col, score_col = f'{statistic} {tool}', f'Overall Score {tool}'
+        if stat_col not in df.columns or score_col not in df.columns:
+            continue
+        values = df[[stat_col, score_col]].dropna()
+        if values.empty:
+            continue
+        # Skewed statistics have many ties; duplicate bin edges are merged
+        binned = pd.qcut(values[stat_col], bins, duplicates='drop') if values[stat_col].nunique() > 1 \
+            else pd.Series(0, index=values.index)
+        scores = values.groupby(binned, observed=True).agg(
+            **{'Statistic': (stat_col, 'mean'), 'Average Score': (score_col, 'mean'), 'Count': (score_col, 'size')})
+        frames.append(scores.reset_index(drop=True).assign(Tool=tool))
+    if not frames:
+        return pd.DataFrame(columns=['Tool', 'Statistic', 'Average Score', 'Count'])
+    return pd.concat(frames, ignore_index=True)[['Tool', 'Statistic', 'Average Score', 'Count']]
+
+
+def discipline_summary(agg_df, page_df):
+    """Per discipline: document and page counts and the mean overall score of every tool"""
+    overall_cols = [f'Overall Score {tool}' for tool in TOOLS if f'Overall Score {tool}' in page_df.columns]
+    summary = page_df.groupby('Discipline')[overall_cols].mean()
+    summary.insert(0, 'Pages', page_df.groupby('Discipline').size())
+    summary.insert(0, 'Documents', agg_df.groupby('Discipline').size())
+    return summary.reset_index()
+
+
+def tool_summary(page_df):
+    """Per tool: mean of the overall score and every criterion, plus mean word count"""
+    rows = []
+    for tool in TOOLS:
+        row = {'Tool': tool}
+        for criterion in ['Overall'] + CRITERIA:
+            col = f'{criterion} Score {tool}'
+            if col in page_df.columns:
+                row[criterion] = page_df[col].mean()
+        if f'Word Count {tool}' in page_df.columns:
+            row['Word Count'] = page_df[f'Word Count {tool}'].mean()
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def document_pages(page_df, filename):
+    """Page-level rows of one document with page number, score and word count columns"""
+    doc_pages = page_df[page_df['Filename'] == filename]
+    page_num_col = next((col for col in doc_pages.columns
+                         if 'page' in col.lower() and ('num' in col.lower() or 'number' in col.lower())), None)
+    score_cols = [col for col in doc_pages.columns if 'score' in col.lower()]
+    word_count_col = next((col for col in doc_pages.columns if 'word' in col.lower() and 'count' in col.lower()), None)
+
+    display_cols = []
+    if page_num_col:
+        display_cols.append(page_num_col)
+    display_cols.extend(score_cols)
+    if word_count_col:
+        display_cols.append(word_count_col)
+    return doc_pages[display_cols], page_num_col, score_cols
+
+
+def _value(row_data, key, digits=None, as_int=False):
+    value = row_data.get(key)
+    if value is None or pd.isna(value):
+        return 'N/A'
+    if as_int:
+        return int(value)
+    return round(value, digits)
+
+
+def tool_comparison(row_data):
+    """Overall score, word count and perplexity per tool for one selected row"""
+    return pd.DataFrame([
+        {
+            'Tool': tool,
+            'Overall Score': _value(row_data, f'Overall Score {tool}', 3),
+            'Word Count': _value(row_data, f'Word Count {tool}', as_int=True),
+            'Perplexity': _value(row_data, f'Perplexity {tool}', 2),
+        }
+        for tool in TOOLS
+    ])
+
+
+def score_breakdown(row_data):
+    """Per-criterion scores per tool for one selected row"""
+    detailed_data = []
+    for tool in TOOLS:
+        tool_scores = {'Tool': tool}
+        for criterion in CRITERIA:
+            tool_scores[criterion] = _value(row_data, f'{criterion} Score {tool}', 3)
+        detailed_data.append(tool_scores)
+    return pd.DataFrame(detailed_data)
@@ -0,0 +1,191 @@
+"""Corpus-wide tool-vs-tool comparison with bootstrap confidence intervals.
+
+For every tool pair and criterion the paired score difference (tool A minus
+tool B on the same page or document) is summarised by its mean, the share of
+units where A wins, and percentile bootstrap intervals for both.
+
+The bootstrap is vectorised: all pairs and criteria are columns of one
+difference matrix ``D`` (units x K), and a Poisson-weight matrix ``W``
+(replicates x units) gives every replicate's weighted means as ``W @ D`` in a
+single BLAS call. For large slices an m-out-of-n bootstrap on ``max_units``
+units is used, with the spread rescaled by sqrt(m / n). The weight matrix is
+generated once and shared by every slice and call.
+
+Pages of one document are correlated, so at page level the resampled units are
+documents (clusters): each document's pages are summed first and share one
+weight, and a replicate's mean is its weighted page total over its weighted
+page count.
+"""
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from .aggregator import CRITERIA, TOOLS
+
+COMPARISON_CRITERIA = ['Overall'] + CRITERIA
+# Units resampled per slice; larger slices use an m-out-of-n bootstrap
+MAX_UNITS = 10_000
+
+
+def tool_pairs(tools=TOOLS):
+    return list(combinations(tools, 2))
+
+
+def _difference_matrix(df, pairs, criteria):
+    """(diffs, labels) with one column per (pair, criterion) present in ``df``"""
+    columns, labels = [], []
+    for tool_a, tool_b in pairs:
+        for criterion in criteria:
+            col_a, col_b = f'{criterion} Score {tool_a}', f'{criterion} Score {tool_b}'
+            if col_a in df.columns and col_b in df.columns:
+                columns.append(df[col_a].to_numpy(dtype=float) - df[col_b].to_numpy(dtype=float))
+                labels.append((tool_a, tool_b, criterion))
+    if not columns:
+        return np.empty((len(df), 0)), labels
+    return np.column_stack(columns), labels
+
+
+@lru_cache(maxsize=2)
+def poisson_weights(n_boot, max_units, seed):
+    """Shared (n_boot x max_units) Poisson(1) weights; slices use the leading columns"""
+    weights = np.random.default_rng(seed).poisson(1.0, size=(n_boot, max_units)).astype(np.float32)
+    weights.flags.writeable = False
+    return weights
+
+
+def _weighted_means(weights, values, valid):
+    """Per replicate means of each column of ``values`` ignoring invalid entries"""
+    totals = weights @ values.astype(np.float32)
+    counts = weights @ valid.astype(np.float32)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return totals / counts
+
+
+def _cluster_sums(clusters, *arrays):
+    """Per-cluster column sums of each (units x K) array; ``clusters`` are integer codes per unit"""
+    order = np.argsort(clusters, kind='stable')
+    starts = np.flatnonzero(np.diff(clusters[order], prepend=-1) != 0)
+    return [np.add.reduceat(array[order].astype(np.float64), starts, axis=0) for array in arrays]
+
+
+def _cluster_codes(df, keys=('Filename', 'Discipline')):
+    """Integer code per row of the document it belongs to, or None if ``df`` lacks the keys"""
+    if not all(key in df.columns for key in keys):
+        return None
+    codes = np.zeros(len(df), dtype=np.int64)
+    for key in keys:
+        key_codes, uniques = pd.factorize(df[key])
+        codes = codes * (len(uniques) + 1) + key_codes + 1
+    return pd.factorize(codes)[0]
+
+
+def bootstrap_differences(diffs, n_boot=1000, confidence=0.95, max_units=MAX_UNITS, seed=0, clusters=None):
+    """Bootstrap mean difference and win rate for each column of ``diffs``.
+
+    With ``clusters`` (an integer code per row, e.g. its document), whole
+    clusters are resampled instead of rows. Returns a dict of arrays (one
+    value per column): n, mean, mean_low, mean_high, win_rate, win_low,
+    win_high, tie_rate.
+    """
+    valid = ~np.isnan(diffs)
+    filled = np.where(valid, diffs, 0.0)
+    wins = (filled > 0) & valid
+    ties = (filled == 0) & valid
+    n = valid.sum(axis=0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=0) / n
+        win_rate = wins.sum(axis=0) / n
+        tie_rate = ties.sum(axis=0) / n
+
+    if clusters is not None:
+        # Resampled units are clusters: their summed differences, wins and valid counts
+        filled, wins, valid = _cluster_sums(np.asarray(clusters), filled, wins, valid)
+
+    rng = np.random.default_rng(seed)
+    n_units = len(filled)
+    scale = 1.0
+    if n_units > max_units:
+        # m-out-of-n: resample a random subset of units (clusters), then rescale the spread
+        subset = rng.choice(n_units, size=max_units, replace=False)
+        filled, wins, valid = filled[subset], wins[subset], valid[subset]
+        scale = np.sqrt(max_units / n_units)
+
+    # Mean differences and win indicators share one weight matrix
+    values = np.hstack([filled, wins])
+    valid_values = np.hstack([valid, valid])
+    weights = poisson_weights(n_boot, max_units, seed)[:, :len(filled)]
+    replicates = _weighted_means(weights, values, valid_values)
+
+    alpha = (1 - confidence) / 2
+    k = diffs.shape[1]
+    point = np.concatenate([mean, win_rate])
+    with np.errstate(invalid='ignore'):
+        q_low, q_high = np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+        center = np.nanmean(replicates, axis=0)
+    # Percentile interval around the full-sample estimate, rescaled for m-out-of-n
+    low = point - (center - q_low) * scale
+    high = point + (q_high - center) * scale
+    return {
+        'n': n, 'mean': mean, 'mean_low': low[:k], 'mean_high': high[:k],
+        'win_rate': win_rate, 'win_low': low[k:], 'win_high': high[k:], 'tie_rate': tie_rate,
+    }
+
+
+def compare_tools(df, by='Discipline', n_boot=1000, confidence=0.95, max_units=MAX_UNITS, seed=0,
+                  pairs=None, criteria=COMPARISON_CRITERIA):
+    """Paired comparison of every tool pair and criterion, overall and per ``by`` slice.
+
+    ``df`` is a page or document frame with display column names. Returns a tidy
+    frame with one row per (slice, Tool A, Tool B, Criterion). The bootstrap
+    resamples documents, so pages of one document are kept together.
+    """
+    pairs = pairs or tool_pairs()
+    clusters = _cluster_codes(df)
+    # Only the score columns (and the slicing key) are needed; avoids copying metadata per slice
+    needed = [f'{criterion} Score {tool}' for tool in dict.fromkeys(t for pair in pairs for t in pair) for criterion in criteria]
+    df = df[[col for col in [by] + needed if col and col in df.columns]]
+    diffs, labels = _difference_matrix(df, pairs, criteria)
+    if not labels or len(df) == 0:
+        return pd.DataFrame()
+
+    # Row positions of each slice into the shared difference matrix
+    slices = [('All', None)]
+    if by and by in df.columns:
+        slices += sorted(df.groupby(by, observed=True).indices.items())
+
+    frames = []
+    for name, rows in slices:
+        slice_diffs = diffs if rows is None else diffs[rows]
+        slice_clusters = None if clusters is None else clusters if rows is None else clusters[rows]
+        stats = bootstrap_differences(slice_diffs, n_boot, confidence, max_units, seed, slice_clusters)
+        frame = pd.DataFrame(labels, columns=['Tool A', 'Tool B', 'Criterion'])
+        frame.insert(0, by or 'Slice', name)
+        frame['N'] = stats['n']
+        frame['Mean Difference'] = stats['mean']
+        frame['CI Low'] = stats['mean_low']
+        frame['CI High'] = stats['mean_high']
+        frame['Win Rate A'] = stats['win_rate']
+        frame['Win Rate Low'] = stats['win_low']
+        frame['Win Rate High'] = stats['win_high']
+        frame['Tie Rate'] = stats['tie_rate']
+        # Significant when the interval excludes zero
+        frame['Significant'] = (frame['CI Low'] > 0) | (frame['CI High'] < 0)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def cached_comparison(config, spec, level='page', n_boot=1000, confidence=0.95, seed=0):
+    """compare_tools over the filtered dataset, cached with the filtered results per (dataset version, spec, options)"""
+    # core.results builds on this module (through core.moments)
+    from .results import cached_result, filtered_documents, filtered_pages
+
+    def compute():
+        if level == 'document':
+            df, _ = filtered_documents(config, spec)
+        else:
+            df = filtered_pages(config, spec)
+        return compare_tools(df, n_boot=n_boot, confidence=confidence, seed=seed)
+    return cached_result(('comparison', level, n_boot, confidence, seed), config, spec, compute)
@@ -0,0 +1,66 @@
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+# Repository root (dashboard/core/config.py -> project root)
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+PAGE_SCORES_CSV_DEFAULT = PROJECT_ROOT / 'data' / 'page_scores_full.csv'
+METADATA_PKL_DEFAULT = PROJECT_ROOT / 'data' / 'metadata_openalex(silver).pkl'
+
+PATH_FIELDS = ('page_scores_csv', 'metadata_pkl', 'pdf_dir', 'markdown_dir', 'store_dir', 'metadata_dir', 'runs_dir',
+               'text_stats_dir')
+# Non-path settings that can also come from session state
+STATE_FIELDS = PATH_FIELDS + ('run',)
+
+
+def _as_path(value):
+    return Path(value) if value not in (None, '') else None
+
+
+@dataclass(frozen=True)
+class DataConfig:
+    """Locations of the benchmark data; hashable so it can key caches"""
+    page_scores_csv: Path = PAGE_SCORES_CSV_DEFAULT
+    metadata_pkl: Path = METADATA_PKL_DEFAULT
+    pdf_dir: Path = None
+    markdown_dir: Path = None
+    # Optional columnar copy of the page scores (see core.store)
+    store_dir: Path = None
+    # Optional compact copy of the metadata pickle (see core.metadata)
+    metadata_dir: Path = None
+    # Optional store of benchmark runs (see core.runs); ``run`` selects one instead of the CSV
+    runs_dir: Path = None
+    run: str = None
+    # Optional text statistics of the extracted markdown (see core.textstats)
+    text_stats_dir: Path = None
+    # Optional cap in MB on the page data held in memory; pages in from the column store (see core.paging)
+    memory_budget_mb: int = None
+
+    def __post_init__(self):
+        # Normalise str inputs (env vars, text inputs) to Path
+        for field in PATH_FIELDS:
+            object.__setattr__(self, field, _as_path(getattr(self, field)))
+
+    @classmethod
+    def from_env(cls):
+        """Build the configuration from PDF_DIR, MARKDOWN_DIR, PAGE_SCORES_CSV, METADATA_PKL, STORE_DIR, METADATA_DIR, RUNS_DIR, RUN, TEXT_STATS_DIR and MEMORY_BUDGET_MB"""
+        return cls(
+            page_scores_csv=os.getenv('PAGE_SCORES_CSV', PAGE_SCORES_CSV_DEFAULT),
+            metadata_pkl=os.getenv('METADATA_PKL', METADATA_PKL_DEFAULT),
+            pdf_dir=os.getenv('PDF_DIR', None),
+            markdown_dir=os.getenv('MARKDOWN_DIR', None),
+            store_dir=os.getenv('STORE_DIR', None),
+            metadata_dir=os.getenv('METADATA_DIR', None),
+            runs_dir=os.getenv('RUNS_DIR', None),
+            run=os.getenv('RUN', None) or None,
+            text_stats_dir=os.getenv('TEXT_STATS_DIR', None),
+            memory_budget_mb=int(os.getenv('MEMORY_BUDGET_MB') or 0) or None,
+        )
+
+    @classmethod
+    def from_state(cls, state):
+        """Build the configuration from a mapping such as st.session_state, falling back to the environment"""
+        config = cls.from_env()
+        overrides = {key: state[key] for key in STATE_FIELDS if key in state}
+        return replace(config, **overrides)
@@ -0,0 +1,223 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+# Display names of the per-tool text statistics (columns '<statistic> <Tool>')
+TEXT_STATISTICS = ['Text Lines', 'Text Words', 'Text Chars', 'Hyphen Break Rate', 'Repeated Edge Lines',
+                   'Non Ascii Ratio']
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    """Sidebar filter state; ``None`` / empty values mean "no filter"""
+    discipline: str = None
+    score_col: str = None
+    score_range: tuple = None
+    min_score: float = None
+    page_range: tuple = None
+    min_words: int = 0
+    search: str = ''
+    # Range filter on a text-statistic column (see core.textstats)
+    stat_col: str = None
+    stat_range: tuple = None
+
+    @classmethod
+    def from_params(cls, params):
+        """Build a spec from flat string parameters (HTTP query, CLI).
+
+        Recognised keys: discipline, score_col, score_min, score_max, min_score,
+        page_min, page_max, min_words, search, stat_col, stat_min, stat_max. Raises ValueError on bad numbers.
+        """
+        def number(key, cast=float, default=None):
+            value = params.get(key)
+            return cast(value) if value not in (None, '') else default
+
+        score_range = None
+        if params.get('score_col'):
+            score_range = (number('score_min', default=float('-inf')), number('score_max', default=float('inf')))
+        page_range = None
+        if params.get('page_min') or params.get('page_max'):
+            page_range = (number('page_min', int, 0), number('page_max', int, 2 ** 31))
+        stat_range = None
+        if params.get('stat_col'):
+            stat_range = (number('stat_min', default=float('-inf')), number('stat_max', default=float('inf')))
+        return cls(
+            discipline=params.get('discipline') or None,
+            score_col=params.get('score_col') or None,
+            score_range=score_range,
+            min_score=number('min_score'),
+            page_range=page_range,
+            min_words=number('min_words', int, 0),
+            search=params.get('search') or '',
+            stat_col=params.get('stat_col') or None,
+            stat_range=stat_range,
+        )
+
+    def to_params(self):
+        """Flat string parameters that ``from_params`` turns back into this spec.
+
+        Only active filters are included, so the result is short enough for a
+        URL query string.
+        """
+        def number(value):
+            # repr round-trips floats exactly
+            return repr(float(value)) if isinstance(value, float) else str(value)
+
+        spec = self.canonical()
+        params = {}
+        if spec.discipline:
+            params['discipline'] = spec.discipline
+        for name, col, value_range in (('score', spec.score_col, spec.score_range),
+                                       ('stat', spec.stat_col, spec.stat_range)):
+            if col:
+                params[f'{name}_col'] = col
+                low, high = value_range
+                if low != float('-inf'):
+                    params[f'{name}_min'] = number(low)
+                if high != float('inf'):
+                    params[f'{name}_max'] = number(high)
+        if spec.min_score is not None:
+            params['min_score'] = number(spec.min_score)
+        if spec.page_range is not None:
+            params['page_min'], params['page_max'] = (str(page) for page in spec.page_range)
+        if spec.min_words > 0:
+            params['min_words'] = str(spec.min_words)
+        if spec.search:
+            params['search'] = spec.search
+        return params
+
+    def canonical(self):
+        """The equivalent spec with no-op values normalised, for use as a cache key"""
+        def value_range(col, bounds):
+            if not col or bounds is None:
+                return None, None
+            return col, (float(bounds[0]), float(bounds[1]))
+
+        score_col, score_range = value_range(self.score_col, self.score_range)
+        stat_col, stat_range = value_range(self.stat_col, self.stat_range)
+        return replace(
+            self,
+            discipline=self.discipline if self.discipline not in (None, '', 'All') else None,
+            score_col=score_col,
+            score_range=score_range,
+            min_score=float(self.min_score) if self.min_score is not None else None,
+            page_range=tuple(int(page) for page in self.page_range) if self.page_range is not None else None,
+            min_words=int(self.min_words or 0),
+            search=self.search or '',
+            stat_col=stat_col,
+            stat_range=stat_range,
+        )
+
+
+def clamp_range(value_range, low, high):
+    """``value_range`` limited to [low, high], or (low, high) when it is None or outside"""
+    if value_range is None or value_range[1] < low or value_range[0] > high or value_range[0] > value_range[1]:
+        return low, high
+    return max(value_range[0], low), min(value_range[1], high)
+
+
+def numeric_columns(df):
+    return df.select_dtypes(include=[np.number]).columns.tolist()
+
+
+def score_columns(df):
+    """Numeric columns holding a score"""
+    return [col for col in numeric_columns(df) if 'Score' in col or 'score' in col.lower()]
+
+
+def overall_score_columns(df):
+    return [col for col in score_columns(df) if 'Overall' in col or 'overall' in col.lower()]
+
+
+def word_count_columns(df):
+    return [col for col in numeric_columns(df) if 'Word Count' in col or 'word count' in col.lower()]
+
+
+def text_statistic_columns(df):
+    """Numeric columns holding a text statistic of the extracted markdown"""
+    prefixes = tuple(f'{name} ' for name in TEXT_STATISTICS)
+    return [col for col in numeric_columns(df) if col.startswith(prefixes)]
+
+
+def page_column(df):
+    """Name of the page number column, if any"""
+    if 'Page Number' in df.columns:
+        return 'Page Number'
+    if 'Page Num' in df.columns:
+        return 'Page Num'
+    return None
+
+
+def default_score_column(score_cols):
+    """The PyMuPDF overall score if present, else the first score column"""
+    return next((col for col in score_cols if 'pymupdf' in col.lower() and 'overall' in col.lower()),
+                score_cols[0] if score_cols else None)
+
+
+def disciplines(df):
+    if 'Discipline' not in df.columns:
+        return []
+    return sorted(df['Discipline'].dropna().unique().tolist())
+
+
+def _mask(df, spec, page_level):
+    """Boolean mask for ``spec`` over ``df``, or None when nothing is filtered"""
+    mask = np.ones(len(df), dtype=bool)
+    filtered = False
+
+    if spec.discipline and spec.discipline != 'All' and 'Discipline' in df.columns:
+        mask &= (df['Discipline'] == spec.discipline).to_numpy()
+        filtered = True
+
+    if page_level and spec.page_range is not None:
+        page_col = page_column(df)
+        if page_col:
+            values = df[page_col]
+            mask &= ((values >= spec.page_range[0]) & (values <= spec.page_range[1])).to_numpy()
+            filtered = True
+
+    if spec.score_col and spec.score_range is not None and spec.score_col in df.columns:
+        values = df[spec.score_col]
+        mask &= ((values >= spec.score_range[0]) & (values <= spec.score_range[1])).to_numpy()
+        filtered = True
+
+    if spec.stat_col and spec.stat_range is not None and spec.stat_col in df.columns:
+        # Pages or documents without statistics (NaN) never match
+        values = df[spec.stat_col]
+        mask &= ((values >= spec.stat_range[0]) & (values <= spec.stat_range[1])).to_numpy()
+        filtered = True
+
+    if spec.min_score is not None:
+        # Keep rows where any overall score reaches the threshold
+        overall_cols = overall_score_columns(df)
+        if overall_cols:
+            mask &= (df[overall_cols].to_numpy() >= spec.min_score).any(axis=1)
+            filtered = True
+
+    if spec.min_words > 0:
+        wc_cols = word_count_columns(df)
+        if wc_cols:
+            mask &= (df[wc_cols].to_numpy() >= spec.min_words).any(axis=1)
+            filtered = True
+
+    if spec.search and 'Filename' in df.columns:
+        mask &= df['Filename'].str.contains(spec.search, case=False, na=False, regex=False).to_numpy()
+        filtered = True
+
+    return mask if filtered else None
+
+
+def filter_pages(page_df, spec):
+    """Apply ``spec`` to a page-level frame"""
+    mask = _mask(page_df, spec, page_level=True)
+    return page_df if mask is None else page_df[mask]
+
+
+def filter_documents(agg_df, page_df, spec):
+    """Apply ``spec`` to the document frame and restrict pages to the kept documents"""
+    mask = _mask(agg_df, spec, page_level=False)
+    if mask is None:
+        return agg_df, page_df
+    agg_df = agg_df[mask]
+    page_df = page_df[page_df['Filename'].isin(agg_df['Filename'])]
+    return agg_df, page_df
@@ -0,0 +1,223 @@
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .filters import FilterSpec
+
+# Keys identifying a document; page-level columns that are never aggregated
+DOC_KEYS = ['Filename', 'Discipline']
+PAGE_KEYS = ['Page Num', 'Page Number']
+
+# Number of dataset versions (config + file state) kept in memory per process
+DATASET_CACHE_SIZE = 2
+
+_load_lock = threading.Lock()
+
+
+class DataLoadError(Exception):
+    """Raised when the benchmark data cannot be loaded"""
+
+
+class MemoryBudgetError(DataLoadError):
+    """Raised when the data a query needs does not fit in the configured memory budget"""
+
+
+def normalize_doc_id(ids):
+    """Map pdf_id / id_gotriple values to the 'extracted_...' filename used on disk"""
+    if isinstance(ids, pd.Series):
+        return 'extracted_' + ids.astype(str).str.replace(r'[/:.]', '_', regex=True)
+    return 'extracted_' + str(ids).replace('/', '_').replace(':', '_').replace('.', '_')
+
+
+def display_name(column):
+    """Turn a raw snake_case column name into the title-cased display name"""
+    return column.replace('_', ' ').title()
+
+
+def raw_name(column):
+    """Inverse of display_name for the benchmark's snake_case columns"""
+    return column.lower().replace(' ', '_')
+
+
+def load_page_scores(config):
+    """Read the page-score CSV (or the selected benchmark run) and make sure it has a 'filename' column"""
+    if config.run:
+        # core.runs builds on core.store, which imports this module
+        from .runs import RunStore
+        return RunStore(config.runs_dir).read_pages(config.run)
+    df = pd.read_csv(config.page_scores_csv)
+    if 'filename' not in df.columns:
+        if 'pdf_id' not in df.columns:
+            raise DataLoadError("'filename' column missing and cannot be derived (no 'pdf_id' column present).")
+        df['filename'] = normalize_doc_id(df['pdf_id'])
+    return df
+
+
+def load_metadata(config):
+    """Read the OpenAlex metadata pickle and add the 'filename' merge key"""
+    metadata = pd.read_pickle(config.metadata_pkl)
+    metadata['filename'] = normalize_doc_id(metadata['id_gotriple'])
+    return metadata
+
+
+def metadata_source(config):
+    """File identifying the metadata: the metadata store's manifest if one is built, else the pickle"""
+    if config.metadata_dir is not None and (config.metadata_dir / 'manifest.json').exists():
+        return config.metadata_dir / 'manifest.json'
+    return config.metadata_pkl
+
+
+def memory_budget(config):
+    """Bytes of page data a process may hold in memory-budget mode, or None to load everything.
+
+    Benchmark runs are always loaded whole.
+    """
+    if not config.memory_budget_mb or config.run:
+        return None
+    return config.memory_budget_mb * 1024 ** 2
+
+
+def page_source(config):
+    """File identifying the page scores: the selected run's manifest, the column store's in memory-budget mode, else the CSV"""
+    if config.run:
+        return Path(config.runs_dir or '') / 'runs' / config.run / 'manifest.json'
+    if memory_budget(config):
+        return Path(config.store_dir or '') / 'manifest.json'
+    return config.page_scores_csv
+
+
+def text_stats_source(config):
+    """Manifest identifying the text statistics (see core.textstats), or None if none are built"""
+    if config.text_stats_dir is None:
+        return None
+    manifest = config.text_stats_dir / 'pages' / 'manifest.json'
+    return manifest if manifest.exists() else None
+
+
+def check_paths(config):
+    """Raise DataLoadError listing every missing input file"""
+    error_messages = []
+    if config.run and config.runs_dir is None:
+        error_messages.append(f"Benchmark run '{config.run}' selected but no runs directory is configured")
+    elif not page_source(config).exists():
+        if config.run:
+            error_messages.append(f"Benchmark run not found: {config.run} (in {config.runs_dir})")
+        elif memory_budget(config):
+            error_messages.append(f"A memory budget is set but no column store is built (STORE_DIR: {config.store_dir})")
+        else:
+            error_messages.append(f"Page scores data file not found: {config.page_scores_csv}")
+    if not metadata_source(config).exists():
+        error_messages.append(f"Metadata file not found: {config.metadata_pkl}")
+    if error_messages:
+        raise DataLoadError("\n".join(error_messages))
+
+
+def merge_metadata(page_scores, metadata):
+    """Left-join metadata onto page scores and switch to display column names"""
+    df = page_scores.merge(metadata, on=['filename', 'discipline'], how='left')
+    df.columns = [display_name(col) for col in df.columns]
+    return df
+
+
+def load_pages(config):
+    """Load page scores merged with metadata, with display column names"""
+    check_paths(config)
+    return merge_metadata(load_page_scores(config), load_metadata(config))
+
+
+def aggregate_documents(page_df):
+    """Aggregate a page frame to one row per document: numeric means, first value otherwise"""
+    cols_to_agg = [col for col in page_df.columns if col not in DOC_KEYS + PAGE_KEYS]
+    numeric_cols = page_df[cols_to_agg].select_dtypes(include=[np.number]).columns.tolist()
+    non_numeric_cols = page_df[cols_to_agg].select_dtypes(exclude=[np.number]).columns.tolist()
+
+    # Column-store partitions hold the keys as categoricals; only observed pairs are groups
+    grouped = page_df.groupby(DOC_KEYS, sort=True, observed=True)
+    agg_df = grouped[numeric_cols].mean()
+    if non_numeric_cols:
+        # Metadata is constant within a document, so the first page carries it;
+        # this avoids a per-group 'first' over every object column
+        agg_df = agg_df.join(grouped[non_numeric_cols].first())
+    agg_df = agg_df.reset_index()
+    return agg_df[DOC_KEYS + [col for col in cols_to_agg if col in agg_df.columns]]
+
+
+def _derived_documents(config, page_df):
+    """``aggregate_documents(page_df)`` as precomputed by refresh.py across a process pool, or None.
+
+    Used when ``store_dir`` holds a store built from the current page-score CSV
+    whose derived data is up to date.
+    """
+    # core.store and core.parallel build on this module
+    from .parallel import fresh_derived
+    from .store import ColumnStore
+    if config.run or not ColumnStore.exists(config.store_dir):
+        return None
+    store = ColumnStore(config.store_dir)
+    csv_path = Path(config.page_scores_csv)
+    stat = csv_path.stat()
+    if (Path(store.manifest['source']).resolve() != csv_path.resolve()
+            or store.version != f"{stat.st_size}-{stat.st_mtime_ns}"):
+        return None
+    derived = fresh_derived(store)
+    if derived is None:
+        return None
+    documents = ColumnStore(derived / 'documents')
+    agg_df = pd.concat([documents.read(p) for p in documents.partitions], ignore_index=True)
+    # Same columns, dtypes and order as aggregating the pages
+    expected = aggregate_documents(page_df.iloc[:0])
+    if set(agg_df.columns) != set(expected.columns):
+        return None
+    agg_df = agg_df[expected.columns.tolist()].astype(expected.dtypes.to_dict())
+    return agg_df.sort_values(DOC_KEYS, ignore_index=True)
+
+
+def dataset_version(config):
+    """Identify the current state of the input files (size and mtime)"""
+    check_paths(config)
+    parts = []
+    for path in (page_source(config), metadata_source(config), text_stats_source(config)):
+        if path is None:
+            continue
+        stat = path.stat()
+        parts.append(f"{stat.st_size}-{stat.st_mtime_ns}")
+    return ':'.join(parts)
+
+
+@lru_cache(maxsize=DATASET_CACHE_SIZE)
+def _load_dataset(config, version):
+    page_df = load_page_scores(config)
+    page_df.columns = [display_name(col) for col in page_df.columns]
+    agg_df = _derived_documents(config, page_df)
+    if agg_df is None:
+        agg_df = aggregate_documents(page_df)
+    if text_stats_source(config) is not None:
+        # core.textstats builds on core.store, which imports this module
+        from .textstats import attach_text_statistics
+        agg_df, page_df = attach_text_statistics(agg_df, page_df, config.text_stats_dir)
+    return agg_df, page_df
+
+
+def load_dataset(config):
+    """Return (agg_df, page_df) for ``config``, cached per process until the files change.
+
+    The frames hold the page-score columns only; metadata columns are looked
+    up on demand with ``metadata.attach_metadata``. They are shared between callers and
+    must not be modified in place. In memory-budget mode they are assembled from the
+    column store, and ``MemoryBudgetError`` is raised if they would not fit.
+    """
+    version = dataset_version(config)
+    if memory_budget(config):
+        # core.results builds on this module
+        from .results import filtered_documents
+        try:
+            return filtered_documents(config, FilterSpec())
+        except MemoryBudgetError:
+            raise MemoryBudgetError(
+                f"This view needs the whole dataset, which does not fit in the memory budget "
+                f"({config.memory_budget_mb} MB)") from None
+    with _load_lock:
+        return _load_dataset(config, version)
@@ -0,0 +1,59 @@
+import base64
+from pathlib import Path
+
+# Extraction tools as they appear in the markdown directory layout
+EXTRACTION_TOOLS = ['marker', 'pymupdf', 'mineru']
+
+
+class FileLocator:
+    """Resolve and read PDFs and extracted markdown for a document.
+
+    Layout: ``<pdf_dir>/<discipline>/<filename>.pdf`` and
+    ``<markdown_dir>/<tool>/<discipline>/<filename>_<tool>.md``.
+    With a ready ``FileManifest`` (see ``manifest.py``) existence checks are
+    answered from memory instead of the file system.
+    """
+
+    def __init__(self, pdf_dir=None, markdown_dir=None, manifest=None):
+        self.pdf_dir = Path(pdf_dir) if pdf_dir else None
+        self.markdown_dir = Path(markdown_dir) if markdown_dir else None
+        self.manifest = manifest
+
+    @classmethod
+    def from_config(cls, config, manifest=None):
+        return cls(config.pdf_dir, config.markdown_dir, manifest)
+
+    def _exists(self, path, kind, filename, discipline):
+        if self.manifest is not None and self.manifest.ready:
+            return self.manifest.has(kind, filename, discipline)
+        return path.exists()
+
+    def pdf_path(self, filename, discipline):
+        if self.pdf_dir is None:
+            return None
+        return self.pdf_dir / discipline / f"{filename}.pdf"
+
+    def markdown_path(self, filename, tool, discipline):
+        if self.markdown_dir is None:
+            return None
+        return self.markdown_dir / tool / discipline / f"{filename}_{tool}.md"
+
+    def find_pdf(self, filename, discipline):
+        """Path of the document's PDF, or None if it does not exist"""
+        pdf_path = self.pdf_path(filename, discipline)
+        if pdf_path is not None and self._exists(pdf_path, 'pdf', filename, discipline):
+            return pdf_path
+        return None
+
+    def read_markdown(self, filename, tool, discipline):
+        """Markdown extracted by ``tool``, or None if it does not exist"""
+        md_path = self.markdown_path(filename, tool, discipline)
+        if md_path is None or not self._exists(md_path, tool, filename, discipline):
+            return None
+        with open(md_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    @staticmethod
+    def pdf_base64(pdf_path):
+        with open(pdf_path, "rb") as f:
+            return base64.b64encode(f.read()).decode('utf-8')
@@ -0,0 +1,282 @@
+"""In-memory index of the PDF and markdown files on disk.
+
+``FileManifest`` walks ``<pdf_dir>/<discipline>/`` and
+``<markdown_dir>/<tool>/<discipline>/`` once in a background thread, recording
+the size and mtime of every file, then keeps the index current from
+``watchdog`` file-system events. Lookups and availability checks are then
+dict and set operations instead of ``stat`` calls on (possibly network)
+storage during a rerun. Events that invalidate whole subtrees (a directory
+deleted or moved) queue a rescan on the same background thread, so scans never
+run on the observer thread or concurrently.
+
+Until the first scan has finished ``ready`` is False and callers should fall
+back to the file system. On mounts without inotify support (NFS, SMB) pass
+``polling=True`` to use watchdog's polling observer instead.
+"""
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+
+from .locator import EXTRACTION_TOOLS
+
+PDF = 'pdf'
+# Manifests kept by file_manifest; each holds an observer and a scanner thread
+MAX_MANIFESTS = 4
+
+
+def _walk(root, depth):
+    """Yield (relative parts, stat) of the files exactly ``depth`` levels below ``root``"""
+    def walk(path, parts):
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        for entry in entries:
+            if len(parts) + 1 < depth:
+                if entry.is_dir(follow_symlinks=True):
+                    yield from walk(entry.path, parts + (entry.name,))
+            elif entry.is_file(follow_symlinks=True):
+                yield parts + (entry.name,), entry.stat()
+    yield from walk(root, ())
+
+
+class FileManifest:
+    """Sizes and mtimes of the PDF and markdown files, kept current in the background"""
+
+    def __init__(self, pdf_dir=None, markdown_dir=None, tools=EXTRACTION_TOOLS, polling=False):
+        self.pdf_dir = Path(pdf_dir) if pdf_dir else None
+        self.markdown_dir = Path(markdown_dir) if markdown_dir else None
+        self.tools = list(tools)
+        self.polling = polling
+        # kind ('pdf' or a tool) -> discipline -> filename -> (size, mtime_ns)
+        self.entries = {kind: {} for kind in [PDF] + self.tools}
+        # Bumped on every change, so derived tables can be cached against it
+        self.generation = 0
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = None
+        self._observer = None
+        # Scans run one at a time; rescan() requests are coalesced into the next one
+        self._scan_lock = threading.Lock()
+        self._scan_requested = threading.Event()
+        self._stopped = threading.Event()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def _key(self, path):
+        """(kind, discipline, filename) for a file path under either root, or None"""
+        path = Path(path)
+        for root, depth in ((self.pdf_dir, 2), (self.markdown_dir, 3)):
+            if root is None:
+                continue
+            try:
+                parts = path.relative_to(root).parts
+            except ValueError:
+                continue
+            if len(parts) == depth:
+                return self._parse(parts)
+        return None
+
+    def _parse(self, parts):
+        if len(parts) == 2:
+            discipline, name = parts
+            if name.endswith('.pdf'):
+                return PDF, discipline, name[:-len('.pdf')]
+        else:
+            tool, discipline, name = parts
+            suffix = f'_{tool}.md'
+            if tool in self.entries and name.endswith(suffix):
+                return tool, discipline, name[:-len(suffix)]
+        return None
+
+    def _apply(self, key, stat):
+        kind, discipline, filename = key
+        files = self.entries[kind].setdefault(discipline, {})
+        if stat is None:
+            files.pop(filename, None)
+        else:
+            files[filename] = (stat.st_size, stat.st_mtime_ns)
+
+    def _set(self, path, stat=None):
+        """Record a created/modified (``stat`` given) or deleted file"""
+        key = self._key(path)
+        if key is None:
+            return
+        with self._lock:
+            if self._pending is not None:
+                # A scan is running and will replace the entries; replay this after it
+                self._pending.append((key, stat))
+            self._apply(key, stat)
+            self.generation += 1
+
+    def scan(self):
+        """Walk both trees and replace the index"""
+        with self._scan_lock:
+            self._scan()
+
+    def _scan(self):
+        with self._lock:
+            self._pending = []
+        entries = {kind: {} for kind in self.entries}
+        for root, depth in ((self.pdf_dir, 2), (self.markdown_dir, 3)):
+            if root is None or not root.is_dir():
+                continue
+            for parts, stat in _walk(root, depth):
+                key = self._parse(parts)
+                if key is not None:
+                    kind, discipline, filename = key
+                    entries[kind].setdefault(discipline, {})[filename] = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            self.entries = entries
+            for key, stat in self._pending:
+                self._apply(key, stat)
+            self._pending = None
+            self.generation += 1
+        self._ready.set()
+
+    def rescan(self):
+        """Queue a full scan on the background scanner thread"""
+        self._scan_requested.set()
+
+    def _scan_loop(self):
+        while True:
+            self._scan_requested.wait()
+            if self._stopped.is_set():
+                return
+            # Requests made during this scan trigger one more afterwards
+            self._scan_requested.clear()
+            self.scan()
+
+    def start(self):
+        """Start watching for changes, then scan in a background thread; returns self"""
+        roots = [root for root in (self.pdf_dir, self.markdown_dir) if root is not None and root.is_dir()]
+        if roots:
+            # Watch before scanning so no change between the two is missed
+            self._observer = (PollingObserver if self.polling else Observer)()
+            handler = _ManifestHandler(self)
+            for root in roots:
+                self._observer.schedule(handler, str(root), recursive=True)
+            self._observer.daemon = True
+            self._observer.start()
+        self.rescan()
+        threading.Thread(target=self._scan_loop, name='file-manifest-scan', daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop the observer; the scanner thread exits after any scan in progress"""
+        self._stopped.set()
+        self._scan_requested.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def stat(self, kind, filename, discipline):
+        """(size, mtime_ns) of a PDF (kind 'pdf') or a tool's markdown, or None if absent"""
+        return self.entries[kind].get(discipline, {}).get(filename)
+
+    def has(self, kind, filename, discipline):
+        return filename in self.entries[kind].get(discipline, {})
+
+    @property
+    def columns(self):
+        """Names of the availability columns: 'Has PDF' and 'Has <Tool>' per extraction tool"""
+        return ['Has PDF' if kind == PDF else f'Has {kind.title()}' for kind in self.entries]
+
+    def availability(self, df):
+        """Boolean frame of ``columns`` aligned with ``df`` (Filename and Discipline columns)"""
+        if not len(df):
+            return pd.DataFrame({name: np.zeros(0, dtype=bool) for name in self.columns}, index=df.index)
+        # Look each (filename, discipline) pair up once; page frames repeat them many times.
+        # A filename can be listed under several disciplines, so both are part of the key
+        filename_codes, filenames = pd.factorize(df['Filename'])
+        discipline_codes, disciplines = pd.factorize(df['Discipline'])
+        pair_codes = filename_codes.astype(np.int64) * len(disciplines) + discipline_codes
+        pair_codes[(filename_codes < 0) | (discipline_codes < 0)] = -1
+        codes, pairs = pd.factorize(pair_codes)
+        known = pairs >= 0
+        # Plain lists: iterating Arrow-backed strings element by element is slow
+        keys = list(zip(np.asarray(filenames, dtype=object)[pairs[known] // max(len(disciplines), 1)].tolist(),
+                        np.asarray(disciplines, dtype=object)[pairs[known] % max(len(disciplines), 1)].tolist()))
+        columns = {}
+        for name, by_discipline in zip(self.columns, self.entries.values()):
+            # Rows with a missing filename or discipline stay False
+            found = np.zeros(len(pairs), dtype=bool)
+            found[known] = np.fromiter((filename in by_discipline.get(discipline, ()) for filename, discipline in keys),
+                                       dtype=bool, count=len(keys))
+            columns[name] = found[codes]
+        return pd.DataFrame(columns, index=df.index)
+
+    def complete(self, df):
+        """Rows of ``df`` whose PDF and every tool's markdown are present"""
+        return df[self.availability(df).all(axis=1).to_numpy()]
+
+
+class _ManifestHandler(FileSystemEventHandler):
+    def __init__(self, manifest):
+        self.manifest = manifest
+
+    def _update(self, path):
+        try:
+            self.manifest._set(path, os.stat(path))
+        except OSError:
+            self.manifest._set(path)
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._update(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._update(event.src_path)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self.manifest._set(event.src_path)
+        else:
+            # A removed directory takes its files with it; rebuild from disk
+            self.manifest.rescan()
+
+    def on_moved(self, event):
+        if event.is_directory:
+            self.manifest.rescan()
+            return
+        self.manifest._set(event.src_path)
+        self._update(event.dest_path)
+
+
+# (pdf_dir, markdown_dir, polling) -> started FileManifest, least recently used first
+_manifests = OrderedDict()
+_manifests_lock = threading.Lock()
+
+
+def file_manifest(config, polling=False):
+    """Process-wide FileManifest for the config's PDF and markdown directories, started on first use.
+
+    At most ``MAX_MANIFESTS`` are kept; the least recently used is stopped when another starts.
+    """
+    key = (config.pdf_dir, config.markdown_dir, polling)
+    with _manifests_lock:
+        if key in _manifests:
+            _manifests.move_to_end(key)
+            return _manifests[key]
+        manifest = _manifests[key] = FileManifest(config.pdf_dir, config.markdown_dir, polling=polling).start()
+        evicted = []
+        while len(_manifests) > MAX_MANIFESTS:
+            evicted.append(_manifests.popitem(last=False)[1])
+    for old in evicted:
+        old.stop()
+    return manifest
@@ -0,0 +1,323 @@
+"""Document metadata: the OpenAlex pickle or its compact columnar copy.
+
+``MetadataStore.build`` converts the pickle once into a directory that never
+needs unpickling::
+
+    <root>/manifest.json
+    <root>/<column>.npy                         numeric and datetime columns
+    <root>/<column>.codes.npy + .dict.json      low-cardinality strings (dictionary-encoded)
+    <root>/<column>.offsets.npy + .bytes        other strings (UTF-8, Arrow-style offsets)
+    <root>/<column>.valid.npy                   ... and their null mask
+    <root>/<column>.offsets.npy + .codes.npy
+                    + .dict.json                lists of strings (authors, ...), dictionary-encoded
+
+Rows are sorted by the normalized document ID (``filename``), so one
+document is found by binary search without reading any other column. Arrays
+are memory-mapped, so opening the store and reading a few rows copies
+nothing but those rows.
+
+The functions at the bottom serve metadata to the rest of the data layer from
+the store when ``DataConfig.metadata_dir`` holds one, else from the pickle.
+"""
+import json
+import shutil
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .loader import (
+    DATASET_CACHE_SIZE,
+    DOC_KEYS,
+    dataset_version,
+    display_name,
+    load_metadata,
+    normalize_doc_id,
+    raw_name,
+)
+from .store import MANIFEST
+
+KEY = 'filename'
+# Strings with at most this share of distinct values are dictionary-encoded
+CATEGORY_RATIO = 0.5
+
+
+def _is_list_column(values):
+    sample = values.dropna().head(100)
+    return len(sample) > 0 and all(isinstance(v, (list, tuple, np.ndarray)) for v in sample)
+
+
+def _write_strings(root, name, values):
+    """Variable-length strings as one UTF-8 buffer plus int64 offsets"""
+    valid = values.notna().to_numpy()
+    encoded = [str(v).encode('utf-8') if ok else b'' for v, ok in zip(values.tolist(), valid)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    (root / f"{name}.bytes").write_bytes(b''.join(encoded))
+    np.save(root / f"{name}.offsets.npy", offsets)
+    np.save(root / f"{name}.valid.npy", valid)
+
+
+def _write_column(root, name, values):
+    """Write one column and return its kind"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        np.save(root / f"{name}.npy", values.to_numpy(dtype='datetime64[ns]').view(np.int64))
+        return 'datetime'
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        np.save(root / f"{name}.npy", values.to_numpy())
+        return 'numeric'
+    if _is_list_column(values):
+        lists = [list(v) if isinstance(v, (list, tuple, np.ndarray)) else [] for v in values.tolist()]
+        flat = pd.Series([str(item) for items in lists for item in items], dtype=object)
+        codes, uniques = pd.factorize(flat)
+        offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum([len(items) for items in lists], out=offsets[1:])
+        np.save(root / f"{name}.offsets.npy", offsets)
+        np.save(root / f"{name}.codes.npy", codes.astype(np.int32))
+        (root / f"{name}.dict.json").write_text(json.dumps([str(v) for v in uniques]))
+        return 'list'
+    if name != KEY and values.nunique() <= CATEGORY_RATIO * len(values):
+        codes, uniques = pd.factorize(values, use_na_sentinel=True)
+        np.save(root / f"{name}.codes.npy", codes.astype(np.int32))
+        (root / f"{name}.dict.json").write_text(json.dumps([str(v) for v in uniques]))
+        return 'category'
+    _write_strings(root, name, values)
+    return 'text'
+
+
+class MetadataStore:
+    """Read access to a metadata directory built by ``MetadataStore.build``"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        manifest_path = self.root / MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Metadata store manifest not found: {manifest_path}")
+        self.manifest = json.loads(manifest_path.read_text())
+        # Raw snake_case column name -> 'numeric' | 'datetime' | 'category' | 'text' | 'list'
+        self.columns = self.manifest['columns']
+        self.rows = self.manifest['rows']
+        self._arrays = {}
+        self._key_index = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    @classmethod
+    def exists(cls, root):
+        return root is not None and (Path(root) / MANIFEST).exists()
+
+    @classmethod
+    def build(cls, pkl_path, root, version=None):
+        """Convert the metadata pickle at ``pkl_path`` into a store at ``root``.
+
+        This is the only step that unpickles; run it on trusted input.
+        """
+        pkl_path, root = Path(pkl_path), Path(root)
+        metadata = pd.read_pickle(pkl_path)
+        metadata[KEY] = normalize_doc_id(metadata['id_gotriple'])
+        metadata = (metadata.drop_duplicates([KEY, 'discipline'])
+                    .sort_values([KEY, 'discipline'], kind='stable')
+                    .reset_index(drop=True))
+
+        if root.exists():
+            shutil.rmtree(root)
+        root.mkdir(parents=True)
+        columns = {name: _write_column(root, name, metadata[name]) for name in metadata.columns}
+        if version is None:
+            stat = pkl_path.stat()
+            version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        manifest = {'version': version, 'source': str(pkl_path), 'rows': len(metadata), 'columns': columns}
+        (root / MANIFEST).write_text(json.dumps(manifest, indent=1))
+        return cls(root)
+
+    def _array(self, filename):
+        """Memory-mapped array (``.npy``) or byte buffer, opened once per store"""
+        if filename not in self._arrays:
+            path = self.root / filename
+            if filename.endswith('.json'):
+                self._arrays[filename] = json.loads(path.read_text())
+                return self._arrays[filename]
+            if filename.endswith('.bytes'):
+                array = np.memmap(path, dtype=np.uint8, mode='r') if path.stat().st_size else np.empty(0, np.uint8)
+            else:
+                array = np.load(path, mmap_mode='r')
+            # A plain ndarray view of the mapping: still zero-copy, without memmap's per-slice overhead
+            self._arrays[filename] = array.view(np.ndarray)
+        return self._arrays[filename]
+
+    def _string(self, name, row):
+        offsets = self._array(f"{name}.offsets.npy")
+        return bytes(self._array(f"{name}.bytes")[offsets[row]:offsets[row + 1]]).decode('utf-8')
+
+    def _value(self, name, row):
+        kind = self.columns[name]
+        if kind == 'numeric':
+            return self._array(f"{name}.npy")[row].item()
+        if kind == 'datetime':
+            value = self._array(f"{name}.npy")[row]
+            return pd.NaT if value == np.iinfo(np.int64).min else pd.Timestamp(int(value))
+        if kind == 'category':
+            code = self._array(f"{name}.codes.npy")[row]
+            return self._array(f"{name}.dict.json")[code] if code >= 0 else None
+        if kind == 'list':
+            offsets = self._array(f"{name}.offsets.npy")
+            categories = self._array(f"{name}.dict.json")
+            return [categories[code] for code in self._array(f"{name}.codes.npy")[offsets[row]:offsets[row + 1]]]
+        return self._string(name, row) if self._array(f"{name}.valid.npy")[row] else None
+
+    def _decode(self, name, kind, rows):
+        """Python values of a text or list column for ``rows``"""
+        offsets = self._array(f"{name}.offsets.npy")
+        starts, ends = offsets[rows].tolist(), offsets[rows + 1].tolist()
+        if kind == 'list':
+            codes = self._array(f"{name}.codes.npy")
+            categories = np.array(self._array(f"{name}.dict.json"), dtype=object)
+            return [categories[codes[start:end]].tolist() for start, end in zip(starts, ends)]
+        # Decode straight from the mapped buffer, one slice per row
+        buffer = memoryview(self._array(f"{name}.bytes"))
+        valid = self._array(f"{name}.valid.npy")[rows]
+        return [str(buffer[start:end], 'utf-8') if ok else None for start, end, ok in zip(starts, ends, valid)]
+
+    def find(self, filename, discipline=None):
+        """Row of a document by binary search on the sorted key column, or -1"""
+        lo, hi = 0, self.rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string(KEY, mid) < filename:
+                lo = mid + 1
+            else:
+                hi = mid
+        while lo < self.rows and self._string(KEY, lo) == filename:
+            if discipline is None or self._value('discipline', lo) == discipline:
+                return lo
+            lo += 1
+        return -1
+
+    def get(self, filename, discipline=None, columns=None):
+        """One document's metadata as {display name: value}, or None"""
+        row = self.find(filename, discipline)
+        if row < 0:
+            return None
+        names = [raw_name(col) for col in columns] if columns else list(self.columns)
+        return {display_name(name): self._value(name, row) for name in names if name in self.columns}
+
+    def positions(self, filenames, disciplines):
+        """Rows for many (filename, discipline) pairs (-1 where missing)"""
+        with self._lock:
+            if self._key_index is None:
+                # Built once per store; bulk joins then cost one hash lookup per row
+                keys = self.take([KEY, 'discipline'], np.arange(self.rows))
+                self._key_index = pd.MultiIndex.from_arrays([keys[display_name(KEY)].astype(object),
+                                                             keys['Discipline'].astype(object)])
+        return self._key_index.get_indexer(pd.MultiIndex.from_arrays([filenames, disciplines]))
+
+    def take(self, columns, rows):
+        """Frame of ``columns`` (raw or display names) for row positions ``rows`` (-1 gives nulls)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        missing = rows < 0
+        safe = np.where(missing, 0, rows)
+        data = {}
+        for col in columns:
+            name = raw_name(col)
+            kind = self.columns[name]
+            if kind == 'numeric':
+                values = pd.Series(self._array(f"{name}.npy")[safe]).where(~missing)
+            elif kind == 'datetime':
+                values = pd.Series(self._array(f"{name}.npy")[safe].view('datetime64[ns]')).where(~missing)
+            elif kind == 'category':
+                codes = np.where(missing, -1, self._array(f"{name}.codes.npy")[safe])
+                values = pd.Categorical.from_codes(codes, self._array(f"{name}.dict.json"))
+            else:
+                # Decode each distinct row once; page frames repeat documents many times
+                unique, inverse = np.unique(safe, return_inverse=True)
+                decoded = np.empty(len(unique) + 1, dtype=object)
+                for i, value in enumerate(self._decode(name, kind, unique)):
+                    decoded[i] = value
+                values = decoded[np.where(missing, len(unique), inverse)]
+            data[display_name(name)] = values
+        return pd.DataFrame(data)
+
+
+_metadata_lock = threading.Lock()
+
+
+@lru_cache(maxsize=DATASET_CACHE_SIZE)
+def _metadata_store(root, version):
+    return MetadataStore(root)
+
+
+@lru_cache(maxsize=DATASET_CACHE_SIZE)
+def _metadata_table(config, version):
+    store = metadata_store(config)
+    if store is not None:
+        # Decoded once per store version; single rows are read from the store instead
+        return store.take(list(store.columns), np.arange(store.rows)).set_index(DOC_KEYS)
+    metadata = load_metadata(config)
+    metadata.columns = [display_name(col) for col in metadata.columns]
+    return metadata.drop_duplicates(DOC_KEYS).set_index(DOC_KEYS)
+
+
+def metadata_store(config):
+    """MetadataStore for ``config.metadata_dir`` if one has been built there, else None"""
+    if not MetadataStore.exists(config.metadata_dir):
+        return None
+    return _metadata_store(config.metadata_dir, dataset_version(config))
+
+
+def metadata_table(config):
+    """All metadata indexed by (Filename, Discipline), loaded on first use and cached like load_dataset"""
+    version = dataset_version(config)
+    with _metadata_lock:
+        return _metadata_table(config, version)
+
+
+def metadata_columns(config):
+    """Display names of the metadata columns available to attach_metadata"""
+    store = metadata_store(config)
+    if store is not None:
+        return [display_name(name) for name in store.columns if display_name(name) not in DOC_KEYS]
+    return metadata_table(config).columns.tolist()
+
+
+def attach_metadata(df, config, columns=None):
+    """``df`` with metadata ``columns`` (default: all) joined on (Filename, Discipline).
+
+    Meant for the rows actually shown or exported; the cached frames from
+    load_dataset never carry metadata.
+    """
+    store = metadata_store(config)
+    available = metadata_columns(config)
+    columns = available if columns is None else columns
+    columns = [col for col in columns if col in available and col not in df.columns]
+    if not columns:
+        return df
+    if store is not None:
+        rows = store.positions(df['Filename'].to_numpy(dtype=object), df['Discipline'].to_numpy(dtype=object))
+        looked_up = store.take(columns, rows).set_axis(df.index)
+    else:
+        keys = pd.MultiIndex.from_frame(df[DOC_KEYS])
+        looked_up = metadata_table(config)[columns].reindex(keys).set_axis(df.index)
+    return pd.concat([df, looked_up], axis=1)
+
+
+def document_metadata(config, filename, discipline=None, columns=None):
+    """One document's metadata as {display name: value}, or None if unknown.
+
+    With a metadata store this reads only that document's row.
+    """
+    store = metadata_store(config)
+    if store is not None:
+        return store.get(filename, discipline, columns)
+    table = metadata_table(config)
+    rows = table.xs(filename, level='Filename', drop_level=False) if filename in table.index.get_level_values(0) else table.iloc[:0]
+    if discipline is not None:
+        rows = rows[rows.index.get_level_values('Discipline') == discipline]
+    if rows.empty:
+        return None
+    row = rows.iloc[0]
+    return {col: row[col] for col in (columns or table.columns) if col in row.index}
@@ -0,0 +1,186 @@
+"""Correlation and regression analytics from sufficient statistics.
+
+A ``MomentTable`` keeps, for every (discipline, page number) cell and tool,
+the number of pages, the sums of the analysed variables and the sums of their
+pairwise products. These add up, so the statistics of any discipline and
+page-range filter are the sum over its cells. That makes correlation matrices
+and regression lines O(cells) instead of a pass over the pages. Tables are
+built per partition and merged, the same way for a whole dataset, the
+partitions of a column store (see ``parallel.refresh_derived``) and each
+benchmark run at ingest (see ``runs.RunStore.add_run``).
+
+Pages with a missing value among a tool's variables are left out of that
+tool's statistics.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .aggregator import TOOLS
+from .compare import COMPARISON_CRITERIA
+from .loader import dataset_version, load_dataset, memory_budget
+from .store import ColumnStore
+
+VARIABLES = COMPARISON_CRITERIA + ['Word Count', 'Page Num']
+MOMENTS = 'moments.npz'
+
+
+def variable_column(variable, tool):
+    """Display column of an analysed variable for ``tool``"""
+    if variable == 'Page Num':
+        return 'Page Num'
+    if variable == 'Word Count':
+        return f'Word Count {tool}'
+    return f'{variable} Score {tool}'
+
+
+class MomentTable:
+    """Counts, sums and cross-products of the analysed variables per (discipline, page) cell and tool"""
+
+    def __init__(self, disciplines, pages, n, sums, cross, tools=TOOLS, variables=VARIABLES):
+        self.disciplines = np.asarray(disciplines, dtype=object)  # per cell
+        self.pages = np.asarray(pages, dtype=np.int64)            # per cell
+        self.n = n            # (cells, tools)
+        self.sums = sums      # (cells, tools, variables)
+        self.cross = cross    # (cells, tools, variables, variables)
+        self.tools = list(tools)
+        self.variables = list(variables)
+
+    def __len__(self):
+        return len(self.pages)
+
+    @classmethod
+    def empty(cls, tools=TOOLS, variables=VARIABLES):
+        t, k = len(tools), len(variables)
+        return cls([], [], np.zeros((0, t)), np.zeros((0, t, k)), np.zeros((0, t, k, k)), tools, variables)
+
+    @classmethod
+    def from_frame(cls, df, tools=TOOLS, variables=VARIABLES):
+        """Statistics of a page frame with display column names"""
+        if df.empty:
+            return cls.empty(tools, variables)
+        disc_codes, disc_names = pd.factorize(df['Discipline'], sort=True)
+        pages = df['Page Num'].fillna(-1).to_numpy(dtype=np.int64) if 'Page Num' in df.columns \
+            else np.zeros(len(df), dtype=np.int64)
+        page_codes, page_values = pd.factorize(pages, sort=True)
+        cells, cell_ids = pd.factorize(disc_codes.astype(np.int64) * len(page_values) + page_codes, sort=True)
+
+        m, t, k = len(cell_ids), len(tools), len(variables)
+        n, sums, cross = np.zeros((m, t)), np.zeros((m, t, k)), np.zeros((m, t, k, k))
+        for ti, tool in enumerate(tools):
+            columns = [variable_column(variable, tool) for variable in variables]
+            if not all(col in df.columns for col in columns):
+                continue
+            values = np.column_stack([df[col].to_numpy(dtype=float) for col in columns])
+            valid = ~np.isnan(values).any(axis=1)
+            # Rows sorted by cell, so each cell's cross-products are one matrix product
+            order = np.flatnonzero(valid)[np.argsort(cells[valid], kind='stable')]
+            values = values[order]
+            bounds = np.searchsorted(cells[order], np.arange(m + 1))
+            n[:, ti] = np.diff(bounds)
+            for cell in np.flatnonzero(n[:, ti]):
+                block = values[bounds[cell]:bounds[cell + 1]]
+                sums[cell, ti] = block.sum(axis=0)
+                cross[cell, ti] = block.T @ block
+        return cls(np.asarray(disc_names, dtype=object)[cell_ids // len(page_values)],
+                   np.asarray(page_values)[cell_ids % len(page_values)], n, sums, cross, tools, variables)
+
+    def merge(self, other):
+        """A new table with the statistics of both; cells present in both are added up"""
+        keys = pd.MultiIndex.from_arrays([np.concatenate([self.disciplines, other.disciplines]),
+                                          np.concatenate([self.pages, other.pages])])
+        codes, uniques = pd.factorize(keys, sort=True)
+        merged = []
+        for name in ('n', 'sums', 'cross'):
+            values = np.concatenate([getattr(self, name), getattr(other, name)])
+            total = np.zeros((len(uniques),) + values.shape[1:])
+            np.add.at(total, codes, values)
+            merged.append(total)
+        return MomentTable(uniques.get_level_values(0), uniques.get_level_values(1), *merged,
+                           self.tools, self.variables)
+
+    def save(self, path):
+        np.savez(path, disciplines=self.disciplines.astype(str), pages=self.pages, n=self.n,
+                 sums=self.sums, cross=self.cross, tools=np.array(self.tools), variables=np.array(self.variables))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['disciplines'].astype(object), data['pages'], data['n'], data['sums'],
+                       data['cross'], data['tools'].tolist(), data['variables'].tolist())
+
+    def select(self, discipline=None, page_range=None):
+        """(n, sums, cross) summed over the cells matching the filter, per tool"""
+        mask = np.ones(len(self), dtype=bool)
+        if discipline and discipline != 'All':
+            mask &= self.disciplines == discipline
+        if page_range:
+            mask &= (self.pages >= page_range[0]) & (self.pages <= page_range[1])
+        return self.n[mask].sum(axis=0), self.sums[mask].sum(axis=0), self.cross[mask].sum(axis=0)
+
+    @staticmethod
+    def _covariance(n, sums, cross):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / n
+            return means, (cross - n * np.outer(means, means)) / (n - 1)
+
+    def correlation(self, tool, discipline=None, page_range=None):
+        """Pearson correlation matrix of the variables for ``tool``, as a labelled frame"""
+        n, sums, cross = self.select(discipline, page_range)
+        ti = self.tools.index(tool)
+        _, cov = self._covariance(n[ti], sums[ti], cross[ti])
+        sd = np.sqrt(np.diag(cov))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = cov / np.outer(sd, sd)
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.variables, columns=self.variables)
+
+    def regression(self, x, y, discipline=None, page_range=None):
+        """Least-squares line of ``y`` on ``x`` per tool: N, Slope, Intercept, R, Mean X and SD X"""
+        n, sums, cross = self.select(discipline, page_range)
+        i, j = self.variables.index(x), self.variables.index(y)
+        rows = []
+        for ti, tool in enumerate(self.tools):
+            means, cov = self._covariance(n[ti], sums[ti], cross[ti])
+            with np.errstate(invalid='ignore', divide='ignore'):
+                slope = cov[i, j] / cov[i, i]
+                r = cov[i, j] / np.sqrt(cov[i, i] * cov[j, j])
+            rows.append({
+                'Tool': tool, 'N': int(n[ti]), 'Slope': slope, 'Intercept': means[j] - slope * means[i],
+                'R': r, 'Mean X': means[i], 'SD X': np.sqrt(cov[i, i]),
+            })
+        return pd.DataFrame(rows)
+
+
+def table_from_store(store):
+    """MomentTable of a ColumnStore, built partition by partition"""
+    table = MomentTable.empty()
+    for partition in store.partitions:
+        table = table.merge(MomentTable.from_frame(store.read(partition)))
+    return table
+
+
+@lru_cache(maxsize=2)
+def _moment_table(config, version):
+    if config.run:
+        # Runs store their table at ingest
+        path = Path(config.runs_dir) / 'runs' / config.run / 'index' / MOMENTS
+        if path.exists():
+            return MomentTable.load(path)
+    if memory_budget(config):
+        # core.parallel builds on this module
+        from .parallel import fresh_derived
+        store = ColumnStore(config.store_dir)
+        derived = fresh_derived(store)
+        if derived is not None:
+            return MomentTable.load(derived / MOMENTS)
+        # Tables merge, so the store is read one partition at a time
+        return table_from_store(store)
+    _, page_df = load_dataset(config)
+    return MomentTable.from_frame(page_df)
+
+
+def moment_table(config):
+    """MomentTable of ``load_dataset(config)``'s pages, built once per dataset version"""
+    return _moment_table(config, dataset_version(config))
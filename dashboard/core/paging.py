@@ -0,0 +1,280 @@
+"""Memory-budgeted access to the page scores, for replicas with a memory limit.
+
+With ``memory_budget_mb`` set (``MEMORY_BUDGET_MB``), the data layer does not
+load the whole dataset. It reads the column store (``store_dir``, see
+``core.store``) one partition at a time. Each loaded partition (its pages,
+their per-document aggregates and text statistics) is kept in a
+``PartitionCache``, an LRU bounded in bytes. A partition's cost is estimated
+from the store's files before it is read, and the least recently used
+partitions are evicted to make room. A partition estimated to be larger than
+the cache is not read at all; ``MemoryBudgetError`` asks for a store with
+smaller partitions. Filters are applied partition by partition, and only the
+matching rows are concatenated.
+
+Half of the budget holds partitions, the other half query results: the
+dataset's own ``ResultCache`` takes the place of the process-wide one. A query
+whose result would not fit, such as every page of a corpus larger than
+memory, raises ``MemoryBudgetError`` instead of loading it, and the views ask
+for narrower filters. As the corpus grows, queries page in
+more partitions and get slower, but memory stays within the budget.
+"""
+import json
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .filters import FilterSpec, filter_documents, filter_pages, page_column
+from .loader import DOC_KEYS, MemoryBudgetError, aggregate_documents, dataset_version, memory_budget, text_stats_source
+from .parallel import fresh_derived
+from .store import ColumnStore
+
+# In-memory size of a string category relative to its bytes in the store's .dict.json
+CATEGORY_OVERHEAD = 3
+
+
+def frame_bytes(df):
+    """Memory held by a frame, including its strings"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class PartitionCache:
+    """Thread-safe LRU of loaded partitions, bounded in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        # key -> (value, bytes), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def _evict(self, room):
+        """Drop least recently used entries until ``room`` more bytes fit"""
+        while self._entries and self._bytes + room > self.max_bytes:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def get(self, key, cost, load):
+        """Cached frames of ``key``, else ``load()``'s after making about ``cost`` bytes of room.
+
+        Raises ``MemoryBudgetError`` without loading if ``cost`` exceeds the whole cache.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            if cost > self.max_bytes:
+                raise MemoryBudgetError(
+                    f"A partition of the column store needs about {cost // 1024 ** 2} MB, more than the "
+                    f"{self.max_bytes // 1024 ** 2} MB the memory budget leaves for partitions. "
+                    "Rebuild the store with smaller partitions (refresh.py --chunk-rows) or raise the budget.")
+            # Evict before reading, so resident data stays within the budget while the partition loads
+            self._evict(cost)
+        value = load()
+        size = sum(frame_bytes(frame) for frame in value)
+        # Larger than estimated and than the whole budget: returned but not kept
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._evict(size)
+            self._entries[key] = (value, size)
+            self._bytes += size
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def _bounds(df):
+    """Two rows per discipline: the minimum and the maximum of every numeric column"""
+    numeric = df.select_dtypes(include=[np.number]).columns.tolist()
+    grouped = df.groupby('Discipline', observed=True)[numeric]
+    return pd.concat([grouped.min(), grouped.max()]).reset_index()
+
+
+class PagedDataset:
+    """Documents and pages of a column store, read partition by partition within ``max_bytes``"""
+
+    def __init__(self, store, max_bytes, text_stats_dir=None):
+        # core.results builds on this module
+        from .results import ResultCache
+        self.store = store
+        self.max_bytes = max_bytes
+        self.text_stats_dir = text_stats_dir
+        # Per-document aggregates precomputed by refresh.py, when they match the store
+        derived = fresh_derived(store)
+        self.documents_store = ColumnStore(derived / 'documents') if derived is not None else None
+        # Page partition name -> the matching documents partition (with its own row count)
+        self._document_partitions = {p.name: p for p in self.documents_store.partitions} \
+            if self.documents_store is not None else {}
+        self.cache = PartitionCache(max_bytes // 2)
+        self.results = ResultCache(max_bytes=max_bytes // 2)
+        # Partition -> estimated (documents, pages) bytes, and the filenames it lists.
+        # The dataset is replaced when the store changes, so both are per store version
+        self._estimates = {}
+        self._filenames = {}
+        self._bounds = None
+        self._text_columns = {}
+        if text_stats_dir is not None:
+            for level in ('documents', 'pages'):
+                kinds = ColumnStore(text_stats_dir / level).columns.values()
+                self._text_columns[level] = sum(kind == 'numeric' for kind in kinds)
+
+    def estimate(self, partition):
+        """Approximate (documents, pages) bytes of a partition once loaded, from the store's files alone"""
+        if partition not in self._estimates:
+            part_dir = self.store.root / partition.name
+            row_bytes = sum(self.store.column_bytes(name) for name in self.store.columns)
+            strings = sum((part_dir / f"{name}.dict.json").stat().st_size
+                          for name, kind in self.store.columns.items()
+                          if kind == 'category' and (part_dir / f"{name}.dict.json").exists())
+            documents = len(self.filenames(partition))
+            # Documents keep the means of the numeric columns and the first value of the others
+            self._estimates[partition] = (
+                documents * (row_bytes + 8 * self._text_columns.get('documents', 0)) + strings * CATEGORY_OVERHEAD,
+                partition.rows * (row_bytes + 8 * self._text_columns.get('pages', 0)) + strings * CATEGORY_OVERHEAD,
+            )
+        return self._estimates[partition]
+
+    def filenames(self, partition):
+        """Filenames of the documents in a partition, from its dictionary; read once"""
+        names = self._filenames.get(partition)
+        if names is None:
+            path = self.store.root / partition.name / 'filename.dict.json'
+            names = self._filenames[partition] = frozenset(json.loads(path.read_text()))
+        return names
+
+    def _load(self, partition):
+        page_df = self.store.read(partition)
+        if partition.name in self._document_partitions:
+            agg_df = self.documents_store.read(self._document_partitions[partition.name])
+            agg_df = agg_df[DOC_KEYS + [col for col in agg_df.columns if col not in DOC_KEYS]]
+        else:
+            agg_df = aggregate_documents(page_df)
+        if self.text_stats_dir is not None:
+            # core.textstats builds on core.store, like this module
+            from .textstats import attach_text_statistics
+            agg_df, page_df = attach_text_statistics(agg_df, page_df, self.text_stats_dir, [partition.discipline])
+        return agg_df, page_df
+
+    def partition(self, partition):
+        """(agg_df, page_df) of one partition, from the cache or the store"""
+        return self.cache.get((partition.name,), sum(self.estimate(partition)),
+                              lambda: self._load(partition))
+
+    def _select(self, spec, level):
+        """Partitions ``spec`` can match; raises if its result surely exceeds the budget"""
+        discipline = spec.discipline if spec.discipline and spec.discipline != 'All' else None
+        partitions = self.store.select([discipline] if discipline else None)
+        # Without row filters every row of the selected partitions is in the result
+        if spec.canonical() == FilterSpec(discipline=discipline):
+            estimates = [self.estimate(partition) for partition in partitions]
+            needed = sum(pages if level == 'pages' else documents + pages for documents, pages in estimates)
+            if needed > self.results.max_bytes:
+                raise self._too_big()
+        return partitions
+
+    def _too_big(self):
+        return MemoryBudgetError(
+            f"The selected rows do not fit in the memory budget ({self.max_bytes // 1024 ** 2} MB). "
+            "Select a discipline or narrow the filters.")
+
+    def _concat(self, frames, level):
+        if frames:
+            return pd.concat(frames, ignore_index=True)
+        if not self.store.partitions:
+            return pd.DataFrame()
+        # An empty result keeps the columns, like a filtered frame
+        return self.partition(self.store.partitions[0])[level].iloc[:0]
+
+    def pages(self, spec=FilterSpec()):
+        """``filter_pages`` over every partition; raises ``MemoryBudgetError`` if the result does not fit"""
+        frames, size = [], 0
+        for partition in self._select(spec, 'pages'):
+            _, page_df = self.partition(partition)
+            matched = filter_pages(page_df, spec)
+            size += frame_bytes(matched)
+            if size > self.results.max_bytes:
+                raise self._too_big()
+            frames.append(matched)
+        return self._concat(frames, 1)
+
+    def documents(self, spec=FilterSpec()):
+        """``filter_documents`` over every partition; raises ``MemoryBudgetError`` if the result does not fit"""
+        agg_frames, page_frames, size = [], [], 0
+        for partition in self._select(spec, 'documents'):
+            agg_df, page_df = filter_documents(*self.partition(partition), spec)
+            size += frame_bytes(agg_df) + frame_bytes(page_df)
+            if size > self.results.max_bytes:
+                raise self._too_big()
+            agg_frames.append(agg_df)
+            page_frames.append(page_df)
+        return self._concat(agg_frames, 0), self._concat(page_frames, 1)
+
+    def row(self, filename, discipline, page=None):
+        """Scores of a page (or, without ``page``, a document) as a dict, or None; reads the discipline's partitions only"""
+        for partition in self.store.select([discipline]):
+            agg_df, page_df = self.partition(partition)
+            page_col = page_column(page_df)
+            if page is not None and page_col:
+                df = page_df
+                mask = (page_df['Filename'] == filename).to_numpy() & (page_df[page_col] == page).to_numpy()
+            else:
+                df = agg_df
+                mask = (agg_df['Filename'] == filename).to_numpy()
+            positions = np.flatnonzero(mask)
+            if len(positions):
+                return df.iloc[positions[0]].to_dict()
+        return None
+
+    def document(self, filename):
+        """(agg_df, page_df) rows of one document, reading only the partitions that list it"""
+        agg_frames, page_frames = [], []
+        for partition in self.store.partitions:
+            if filename not in self.filenames(partition):
+                continue
+            agg_df, page_df = self.partition(partition)
+            agg_frames.append(agg_df[agg_df['Filename'] == filename])
+            page_frames.append(page_df[page_df['Filename'] == filename])
+        return self._concat(agg_frames, 0), self._concat(page_frames, 1)
+
+    def bounds(self):
+        """(agg_df, page_df) holding the minimum and maximum of every numeric column per discipline.
+
+        Enough to build the filter widgets from; computed once, one partition at a time.
+        """
+        if self._bounds is None:
+            parts = [tuple(_bounds(df) for df in self.partition(partition)) for partition in self.store.partitions]
+            if not parts:
+                return pd.DataFrame(), pd.DataFrame()
+            self._bounds = tuple(_bounds(pd.concat(frames, ignore_index=True)) for frames in zip(*parts))
+        return self._bounds
+
+
+# A single version is kept, so a rebuilt store does not double the memory held
+@lru_cache(maxsize=1)
+def _paged_dataset(config, version):
+    text_stats_dir = config.text_stats_dir if text_stats_source(config) is not None else None
+    return PagedDataset(ColumnStore(config.store_dir), memory_budget(config), text_stats_dir)
+
+
+def paged_dataset(config):
+    """PagedDataset of ``config``'s column store, replaced when the store changes"""
+    return _paged_dataset(config, dataset_version(config))
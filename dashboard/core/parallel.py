@@ -0,0 +1,109 @@
+"""Process-pool refresh of the data derived from a column store.
+
+Each worker gets only the store path and one partition, reads that partition
+itself and returns small partial results; document aggregates are written by
+the worker straight into ``<store>/derived/documents``. The parent merges the
+partials, so refresh time scales with the number of cores.
+
+Derived layout::
+
+    <store>/derived/documents/      column store of per-document aggregates, one partition per store partition
+    <store>/derived/moments.npz     correlation statistics per (discipline, page) cell
+    <store>/derived/version.json    store version the data was derived from
+
+In memory-budget mode (see ``core.paging``) the documents replace aggregating
+each partition's pages, and the moments the criteria analytics pass over the store.
+``load_dataset`` also reads the documents instead of aggregating the pages when
+the store was built from the page-score CSV it loads.
+"""
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .loader import aggregate_documents, raw_name
+from .moments import MOMENTS, MomentTable
+from .store import ColumnStore, Partition, write_manifest, write_partition
+from .summary import SummaryAccumulator, summary_columns
+
+DERIVED = 'derived'
+
+
+def derived_dir(store_root):
+    return Path(store_root) / DERIVED
+
+
+def fresh_derived(store):
+    """Derived directory of ``store`` if it was built from the store's current version, else None"""
+    out = derived_dir(store.root)
+    version = out / 'version.json'
+    if version.exists() and json.loads(version.read_text()).get('version') == store.version:
+        return out
+    return None
+
+
+def _partition_task(store_root, partition):
+    """Worker: derive everything for one partition"""
+    store = ColumnStore(store_root)
+    frame = store.read(partition)
+
+    documents = aggregate_documents(frame)
+    documents = documents.drop(columns='Discipline').rename(columns=raw_name)
+    doc_partition = Partition(partition.discipline, partition.part, len(documents))
+    doc_columns = write_partition(derived_dir(store_root) / 'documents', doc_partition, documents)
+    return doc_partition, doc_columns, MomentTable.from_frame(frame)
+
+
+def _summary_task(store_root, partition, max_bytes):
+    """Worker: SummaryAccumulator over one partition, read in slices within ``max_bytes``"""
+    store = ColumnStore(store_root)
+    accumulator = SummaryAccumulator()
+    columns = summary_columns(store.columns)
+    for rows in store.slices(partition, store.slice_rows(partition, columns, max_bytes)):
+        accumulator.add(store.read(partition, columns, rows))
+    return accumulator
+
+
+def _map_partitions(fn, store, partitions, workers, *args):
+    """Yield fn(store_root, partition, *args) per partition, in a process pool if workers > 1"""
+    if workers == 1:
+        for partition in partitions:
+            yield fn(str(store.root), partition, *args)
+        return
+    n = len(partitions)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(fn, [str(store.root)] * n, partitions, *[[arg] * n for arg in args])
+
+
+def summarize_parallel(store, workers=None, disciplines=None, max_bytes=None):
+    """Like summarize_store, with partitions spread over a process pool"""
+    workers = workers or os.cpu_count() or 1
+    per_worker = max_bytes // workers if max_bytes else None
+    accumulator = SummaryAccumulator()
+    for partial in _map_partitions(_summary_task, store, store.select(disciplines), workers, per_worker):
+        accumulator.merge(partial)
+    return accumulator
+
+
+def refresh_derived(store_root, workers=None):
+    """Rebuild derived data for the store at ``store_root``"""
+    store = ColumnStore(store_root)
+    out = derived_dir(store_root)
+    workers = workers or os.cpu_count() or 1
+    if out.exists():
+        shutil.rmtree(out)
+    out.mkdir(parents=True)
+
+    doc_partitions, doc_columns = [], {}
+    moments = MomentTable.empty()
+
+    for doc_partition, columns, part_moments in _map_partitions(_partition_task, store, store.partitions, workers):
+        doc_partitions.append(doc_partition)
+        doc_columns.update(columns)
+        moments = moments.merge(part_moments)
+
+    write_manifest(out / 'documents', doc_partitions, doc_columns, store.version, store.root)
+    moments.save(out / MOMENTS)
+    # Written last: readers only trust derived data whose version matches the store
+    (out / 'version.json').write_text(json.dumps({'version': store.version}))
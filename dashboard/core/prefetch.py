@@ -0,0 +1,120 @@
+"""Background loading of a selected document's files.
+
+Selecting a row on a results page calls ``prefetch_document``, which starts
+reading the PDF and every tool's markdown on a small thread pool. The files
+are read concurrently, which hides the latency of network volumes, and land in
+the shared caches (``pdf_base64`` here, ``textview.markdown_document``). When
+the viewer opens, ``load_pdf`` and ``load_markdown`` take the cached result,
+or wait for a load that is still running instead of starting it again.
+"""
+import base64
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from .locator import EXTRACTION_TOOLS, FileLocator
+from .manifest import file_manifest
+from .textview import markdown_document
+
+PREFETCH_WORKERS = 4
+# Encoded PDFs kept per process; a few selections' worth
+PDF_CACHE_SIZE = 8
+
+
+@lru_cache(maxsize=PDF_CACHE_SIZE)
+def _pdf_base64(path, size, mtime_ns):
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read()).decode('utf-8')
+
+
+def pdf_base64(locator, filename, discipline):
+    """Cached base64 encoding of the document's PDF, or None if it does not exist"""
+    path = locator.find_pdf(filename, discipline)
+    if path is None:
+        return None
+    manifest = locator.manifest
+    if manifest is not None and manifest.ready:
+        stat = manifest.stat('pdf', filename, discipline)
+        if stat is None:
+            return None
+        size, mtime_ns = stat
+    else:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+    return _pdf_base64(str(path), size, mtime_ns)
+
+
+class Prefetcher:
+    """Thread pool that runs each load at most once at a time"""
+
+    def __init__(self, workers=PREFETCH_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        # key -> Future of the load in progress
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _done(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def submit(self, key, fn, *args):
+        """Start ``fn(*args)`` in the background unless a load of ``key`` is already running"""
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._pool.submit(fn, *args)
+            self._pending[key] = future
+        # Outside the lock: a finished future runs the callback right away
+        future.add_done_callback(lambda f: self._done(key, f))
+        return future
+
+    def run(self, key, fn, *args):
+        """Result of ``fn(*args)``, waiting for a background load of ``key`` if one is running"""
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            return future.result()
+        return fn(*args)
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+
+# Process-wide, shared by every session
+prefetcher = Prefetcher()
+
+
+def _key(kind, locator, filename, discipline):
+    return kind, str(locator.pdf_dir), str(locator.markdown_dir), filename, discipline
+
+
+def prefetch_document(config, filename, discipline, tools=EXTRACTION_TOOLS):
+    """Start loading the PDF and each tool's markdown of a document; returns the futures"""
+    if config.pdf_dir is None and config.markdown_dir is None:
+        return []
+    locator = FileLocator.from_config(config, file_manifest(config))
+    filename, discipline = str(filename), str(discipline)
+    futures = [prefetcher.submit(_key('pdf', locator, filename, discipline), pdf_base64,
+                                 locator, filename, discipline)]
+    for tool in tools:
+        futures.append(prefetcher.submit(_key(tool, locator, filename, discipline), markdown_document,
+                                         locator, filename, tool, discipline))
+    return futures
+
+
+def load_pdf(locator, filename, discipline):
+    """``pdf_base64``, taking over a prefetch in progress"""
+    return prefetcher.run(_key('pdf', locator, filename, discipline), pdf_base64, locator, filename, discipline)
+
+
+def load_markdown(locator, filename, tool, discipline):
+    """``markdown_document``, taking over a prefetch in progress"""
+    return prefetcher.run(_key(tool, locator, filename, discipline), markdown_document,
+                          locator, filename, tool, discipline)
@@ -0,0 +1,141 @@
+"""Filtered results shared by every session and API request of a process.
+
+Results are keyed by what they depend on: the dataset (config and version),
+the canonical ``FilterSpec`` and a name for the kind of result. Two users
+looking at the same filters, for example through a shared link, get the same
+cached frames, counts and chart aggregates. The cache is an LRU bounded both
+in entries and in the approximate bytes of the frames it holds.
+
+In memory-budget mode (see ``core.paging``) the same functions answer from
+the column store, partition by partition, and results are cached within the budget.
+"""
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from .filters import FilterSpec, filter_documents, filter_pages
+from .loader import dataset_version, load_dataset, memory_budget
+from .paging import frame_bytes, paged_dataset
+
+RESULT_CACHE_ENTRIES = 64
+RESULT_CACHE_BYTES = 512 * 1024 ** 2
+
+
+def _nbytes(value):
+    """Approximate memory held by a cached value, strings included; frames dominate"""
+    if isinstance(value, pd.DataFrame):
+        return frame_bytes(value)
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+class ResultCache:
+    """Thread-safe LRU bounded in entries and bytes"""
+
+    def __init__(self, max_entries=RESULT_CACHE_ENTRIES, max_bytes=RESULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (value, bytes), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key, compute):
+        """Cached value of ``key``, computing (and storing) it if missing"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+        value = compute()
+        size = _nbytes(value)
+        # A result bigger than the whole budget is returned but not kept
+        if size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Process-wide, shared by every session and request
+result_cache = ResultCache()
+
+
+def cached_result(name, config, spec, compute):
+    """``compute()`` cached per (name, dataset version, canonical spec).
+
+    ``name`` identifies the kind of result and anything else it depends on,
+    e.g. ``('page_metrics', files_key)``.
+    """
+    key = (name, config, dataset_version(config), spec.canonical())
+    if memory_budget(config):
+        # Counted in the memory budget instead of the process-wide cache
+        return paged_dataset(config).results.get(key, compute)
+    return result_cache.get(key, compute)
+
+
+def filtered_pages(config, spec):
+    """``filter_pages`` of the dataset's pages, cached; the unfiltered frame is returned as is.
+
+    Like ``load_dataset``'s frames, the result is shared and must not be modified in place.
+    """
+    if memory_budget(config):
+        return cached_result('pages', config, spec, lambda: paged_dataset(config).pages(spec))
+    _, page_df = load_dataset(config)
+    if spec.canonical() == FilterSpec():
+        return page_df
+    return cached_result('pages', config, spec, lambda: filter_pages(page_df, spec))
+
+
+def filtered_documents(config, spec):
+    """``filter_documents`` of the dataset, cached; the unfiltered frames are returned as is"""
+    if memory_budget(config):
+        return cached_result('documents', config, spec, lambda: paged_dataset(config).documents(spec))
+    agg_df, page_df = load_dataset(config)
+    if spec.canonical() == FilterSpec():
+        return agg_df, page_df
+    return cached_result('documents', config, spec, lambda: filter_documents(agg_df, page_df, spec))
+
+
+def filter_bounds(config):
+    """(agg_df, page_df) to build filter widgets and resolve column names from.
+
+    The dataset itself, or in memory-budget mode the minimum and maximum of
+    every numeric column per discipline, so drawing the filters never needs every row.
+    """
+    if memory_budget(config):
+        return paged_dataset(config).bounds()
+    return load_dataset(config)
+
+
+def document_rows(config, filename):
+    """(agg_df, page_df) rows of one document"""
+    if memory_budget(config):
+        return paged_dataset(config).document(filename)
+    agg_df, page_df = load_dataset(config)
+    return agg_df[agg_df['Filename'] == filename], page_df[page_df['Filename'] == filename]
@@ -0,0 +1,335 @@
+"""Versioned store of benchmark runs, for comparing one run with another.
+
+Layout::
+
+    <root>/runs.json                            registry of the runs, oldest first
+    <root>/.lock                                held while a run is added, across processes
+    <root>/documents.json                       shared document dictionary: [[filename, discipline], ...]
+    <root>/runs/<name>/                         the run's page scores as a ColumnStore (see core.store)
+    <root>/runs/<name>/<partition>/doc.npy      int32 code of each row's document in documents.json
+    <root>/runs/<name>/index/pages.npy          sorted (doc << 32 | page) key of every numbered page
+    <root>/runs/<name>/index/page_rows.npy      ... and its row in the run (partitions in order)
+    <root>/runs/<name>/index/docs.npy           sorted codes of the run's documents
+    <root>/runs/<name>/index/<column>.npy       per-document mean of each numeric column, aligned with docs.npy
+    <root>/runs/<name>/index/moments.npz        correlation statistics of the run (see core.moments)
+
+A run is written once and never modified; it only becomes visible when its
+registry entry is written. Runs are added one at a time, under a file lock
+that also holds between processes, so concurrent ingests never assign the same
+code to two documents. Document codes are shared by every run (new
+documents are appended to the dictionary), so two runs are joined on integer
+keys with a binary search over their sorted indexes, reading only the
+compared columns, instead of loading both runs and merging on strings.
+Filenames are the same keys the metadata store uses, so every run shares
+one metadata store.
+"""
+import fcntl
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .loader import DataLoadError, display_name
+from .moments import MOMENTS, table_from_store
+from .store import CHUNK_ROWS, ColumnStore, write_manifest
+
+REGISTRY = 'runs.json'
+DOCUMENTS = 'documents.json'
+LOCK = '.lock'
+RUN_NAME = re.compile(r'^[\w.-]+$')
+PAGE_COLUMN = 'page_num'
+# Identifying columns, never compared
+KEY_COLUMNS = ('pdf_id', 'filename', 'discipline', 'doc', PAGE_COLUMN)
+# Page numbers must fit in the low 32 bits of a page key
+MAX_PAGE = 2 ** 32 - 1
+
+
+def _write_json(path, data):
+    """Replace ``path`` atomically so readers never see a partial file"""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(json.dumps(data))
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked(root):
+    """Hold an exclusive lock on the run store, between threads and processes alike"""
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _numbered(page):
+    """Mask of the page numbers usable in a page key: whole, non-negative and not missing"""
+    with np.errstate(invalid='ignore'):
+        return np.isfinite(page) & (page >= 0) & (page <= MAX_PAGE) & (page == np.floor(page))
+
+
+def _match(keys, other_keys):
+    """Positions (i, j) with keys[i] == other_keys[j]; both arrays sorted and unique"""
+    if not len(keys) or not len(other_keys):
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    j = np.searchsorted(other_keys, keys)
+    j[j == len(other_keys)] = 0
+    found = other_keys[j] == keys
+    return np.flatnonzero(found), j[found]
+
+
+class RunStore:
+    """Benchmark runs stored as immutable column stores sharing one document dictionary"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        registry = self.root / REGISTRY
+        self.runs = json.loads(registry.read_text())['runs'] if registry.exists() else []
+
+    @classmethod
+    def exists(cls, root):
+        return root is not None and (Path(root) / REGISTRY).exists()
+
+    @property
+    def names(self):
+        return [run['name'] for run in self.runs]
+
+    def run(self, name):
+        """Registry entry of a run"""
+        for run in self.runs:
+            if run['name'] == name:
+                return run
+        raise KeyError(f"Unknown benchmark run: {name}")
+
+    def run_dir(self, name):
+        return self.root / 'runs' / name
+
+    def store(self, name):
+        self.run(name)
+        return ColumnStore(self.run_dir(name))
+
+    def documents(self):
+        """Shared [filename, discipline] pairs; a document's code is its position"""
+        path = self.root / DOCUMENTS
+        return json.loads(path.read_text()) if path.exists() else []
+
+    def add_run(self, name, csv_path, chunk_rows=CHUNK_ROWS):
+        """Ingest the page-score CSV at ``csv_path`` as a new run named ``name``"""
+        if not RUN_NAME.match(name):
+            raise ValueError(f"Run names may only contain letters, digits, '.', '_' and '-': {name!r}")
+        csv_path = Path(csv_path)
+        with _locked(self.root):
+            if name in RunStore(self.root).names:
+                raise ValueError(f"Benchmark run already exists: {name}")
+            run_dir = self.run_dir(name)
+            # A leftover directory without a registry entry is an interrupted ingest
+            shutil.rmtree(run_dir, ignore_errors=True)
+            store = ColumnStore.build(csv_path, run_dir, chunk_rows)
+            if PAGE_COLUMN not in store.columns:
+                shutil.rmtree(run_dir)
+                raise DataLoadError(f"'{PAGE_COLUMN}' column missing from {csv_path}")
+
+            documents = self.documents()
+            codes = {tuple(key): code for code, key in enumerate(documents)}
+            numeric = [col for col, kind in store.columns.items()
+                       if kind == 'numeric' and col not in KEY_COLUMNS]
+            docs_per_row, pages = [], []
+            for partition in store.partitions:
+                filenames = store.read_column(partition, 'filename')
+                # Map the partition's dictionary onto the shared one, then every row through it
+                mapping = np.array([codes.setdefault((filename, partition.discipline), len(codes))
+                                    for filename in filenames.categories.tolist()], dtype=np.int32)
+                doc = mapping[filenames.codes]
+                np.save(run_dir / partition.name / 'doc.npy', doc)
+                docs_per_row.append(doc.astype(np.int64))
+                pages.append(store.read_column(partition, PAGE_COLUMN).astype(float))
+
+            index_dir = run_dir / 'index'
+            index_dir.mkdir()
+            doc = np.concatenate(docs_per_row) if docs_per_row else np.empty(0, np.int64)
+            page = np.concatenate(pages) if pages else np.empty(0)
+            # Pages without a usable number (missing, fractional) cannot be joined per page;
+            # they are left out of the page index but still count for their document
+            numbered = np.flatnonzero(_numbered(page))
+            keys = (doc[numbered] << 32) | page[numbered].astype(np.int64)
+            order = np.argsort(keys, kind='stable')
+            np.save(index_dir / 'pages.npy', keys[order])
+            np.save(index_dir / 'page_rows.npy', numbered[order].astype(np.int64))
+
+            # Per-document means, so document deltas never touch the page rows
+            docs = np.unique(doc)
+            positions = np.searchsorted(docs, doc)
+            for col in numeric:
+                values = np.concatenate([store.read_column(p, col) for p in store.partitions]).astype(float)
+                valid = ~np.isnan(values)
+                totals = np.bincount(positions[valid], weights=values[valid], minlength=len(docs))
+                counts = np.bincount(positions[valid], minlength=len(docs))
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    np.save(index_dir / f'{col}.npy', totals / counts)
+            np.save(index_dir / 'docs.npy', docs.astype(np.int32))
+            np.save(index_dir / 'doc_pages.npy', np.bincount(positions, minlength=len(docs)).astype(np.int32))
+            table_from_store(store).save(index_dir / MOMENTS)
+
+            write_manifest(run_dir, store.partitions, {**store.columns, 'doc': 'numeric'}, store.version, csv_path)
+            if len(codes) > len(documents):
+                _write_json(self.root / DOCUMENTS, [list(key) for key in codes])
+            # Registering the run last publishes it
+            header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+            self.runs = RunStore(self.root).runs + [{
+                'name': name,
+                'source': str(csv_path),
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'version': store.version,
+                'pages': int(len(doc)),
+                'unnumbered_pages': int(len(doc) - len(numbered)),
+                'documents': int(len(docs)),
+                'columns': header + [col for col in ('filename',) if col not in header],
+            }]
+            _write_json(self.root / REGISTRY, {'runs': self.runs})
+        return self.run(name)
+
+    def _concat(self, store, name):
+        """One column of a run across its partitions, in row order"""
+        return np.concatenate([store.read_column(p, name) for p in store.partitions])
+
+    def _row_groups(self, store, rows):
+        """(partition, positions in ``rows``, rows within the partition) of each partition holding any of ``rows``"""
+        offsets = np.cumsum([0] + [p.rows for p in store.partitions])
+        parts = np.searchsorted(offsets, rows, side='right') - 1
+        order = np.argsort(parts, kind='stable')
+        bounds = np.searchsorted(parts[order], np.arange(len(store.partitions) + 1))
+        return [(store.partitions[k], order[start:end], rows[order[start:end]] - offsets[k])
+                for k, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])) if end > start]
+
+    def _take(self, store, groups, n, name):
+        """Values of a numeric column at the rows grouped by ``_row_groups``, reading only their partitions"""
+        values = np.empty(n, dtype=float)
+        for partition, positions, local in groups:
+            values[positions] = store.read_column(partition, name)[local]
+        return values
+
+    def read_pages(self, name):
+        """A run's page scores as a frame with raw column names, like ``load_page_scores``"""
+        run = self.run(name)
+        store = self.store(name)
+        documents = self.documents()
+        doc = self._concat(store, 'doc') if store.partitions else np.empty(0, np.int32)
+        data = {}
+        for col in run['columns']:
+            # A filename can appear under several disciplines, so the pairs are indexed as
+            # object arrays rather than used as (unique) categories
+            if col == 'filename':
+                data[col] = np.array([d[0] for d in documents], dtype=object)[doc]
+            elif col == 'discipline':
+                data[col] = np.array([d[1] for d in documents], dtype=object)[doc]
+            elif store.columns.get(col) == 'numeric':
+                data[col] = self._concat(store, col)
+            elif col in store.columns:
+                # Missing values stay missing instead of becoming 'nan'
+                data[col] = pd.concat([pd.Series(store.read_column(p, col)) for p in store.partitions],
+                                      ignore_index=True).astype(object)
+        return pd.DataFrame(data)
+
+    def compared_columns(self, name):
+        """Numeric columns of a run that deltas can be computed for (raw names)"""
+        kinds = self.store(name).columns
+        return [col for col in self.run(name)['columns'] if kinds.get(col) == 'numeric' and col not in KEY_COLUMNS]
+
+    def _common_columns(self, base, other):
+        shared = set(self.compared_columns(other))
+        return [col for col in self.compared_columns(base) if col in shared]
+
+    def _keys_frame(self, doc, page=None):
+        documents = np.array(self.documents(), dtype=object).reshape(-1, 2)
+        data = {'Filename': documents[doc, 0], 'Discipline': documents[doc, 1]}
+        if page is not None:
+            data['Page Num'] = page
+        return pd.DataFrame(data)
+
+    def _delta_columns(self, frame, base, other, columns, base_values, other_values):
+        for col in columns:
+            label = display_name(col)
+            a, b = base_values(col), other_values(col)
+            frame[f'{label} ({base})'] = a
+            frame[f'{label} ({other})'] = b
+            frame[f'{label} Delta'] = b - a
+        return frame
+
+    def page_deltas(self, base, other, columns=None):
+        """Per-page ``other - base`` for pages scored in both runs.
+
+        Returns (frame, counts); counts has the number of matched pages and of
+        pages only in either run. Pages without a page number are not compared.
+        """
+        columns = columns or self._common_columns(base, other)
+        index = {}
+        for name in (base, other):
+            index_dir = self.run_dir(name) / 'index'
+            index[name] = (np.load(index_dir / 'pages.npy'), np.load(index_dir / 'page_rows.npy'))
+        (base_keys, base_rows), (other_keys, other_rows) = index[base], index[other]
+        i, j = _match(base_keys, other_keys)
+        keys = base_keys[i]
+        rows = {base: base_rows[i], other: other_rows[j]}
+        stores = {name: self.store(name) for name in (base, other)}
+
+        groups = {name: self._row_groups(stores[name], rows[name]) for name in (base, other)}
+
+        def values(name):
+            return lambda col: self._take(stores[name], groups[name], len(keys), col)
+
+        frame = self._keys_frame((keys >> 32).astype(np.int64), (keys & 0xFFFFFFFF).astype(np.int64))
+        frame = self._delta_columns(frame, base, other, columns, values(base), values(other))
+        counts = {'matched': len(keys), 'only_base': len(base_keys) - len(keys),
+                  'only_other': len(other_keys) - len(keys)}
+        return frame, counts
+
+    def document_deltas(self, base, other, columns=None):
+        """Per-document ``other - base`` of the page means, for documents in both runs"""
+        columns = columns or self._common_columns(base, other)
+        index_dirs = {name: self.run_dir(name) / 'index' for name in (base, other)}
+        base_docs = np.load(index_dirs[base] / 'docs.npy')
+        other_docs = np.load(index_dirs[other] / 'docs.npy')
+        i, j = _match(base_docs, other_docs)
+        positions = {base: i, other: j}
+
+        def values(name):
+            return lambda col: np.load(index_dirs[name] / f'{col}.npy', mmap_mode='r')[positions[name]]
+
+        frame = self._keys_frame(base_docs[i].astype(np.int64))
+        frame[f'Pages ({base})'] = np.load(index_dirs[base] / 'doc_pages.npy')[i]
+        frame[f'Pages ({other})'] = np.load(index_dirs[other] / 'doc_pages.npy')[j]
+        frame = self._delta_columns(frame, base, other, columns, values(base), values(other))
+        counts = {'matched': len(i), 'only_base': len(base_docs) - len(i),
+                  'only_other': len(other_docs) - len(i)}
+        return frame, counts
+
+
+def run_store(config):
+    """RunStore for the config's runs directory (re-read, so new runs show up)"""
+    return RunStore(config.runs_dir)
+
+
+@lru_cache(maxsize=8)
+def _run_deltas(root, base, other, level, columns, versions):
+    store = RunStore(root)
+    if level == 'document':
+        return store.document_deltas(base, other, list(columns) or None)
+    return store.page_deltas(base, other, list(columns) or None)
+
+
+def run_deltas(config, base, other, level='page', columns=()):
+    """(frame, counts) of ``other - base`` per page or document, cached per pair of runs.
+
+    The frame is shared between callers and must not be modified in place.
+    """
+    store = run_store(config)
+    versions = (store.run(base)['created'], store.run(other)['created'])
+    return _run_deltas(store.root, base, other, level, tuple(columns), versions)
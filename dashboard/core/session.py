@@ -0,0 +1,211 @@
+"""Keeping per-session memory small.
+
+Session state only holds the IDs of the selected document: filename,
+discipline and, for a page, its number. The selected row is looked up in the
+shared dataset on demand with ``selected_row``. Anything else a session
+caches goes in a ``SessionCache``, which keeps a few entries per session and
+drops a session's entries once it has been idle for ``IDLE_SECONDS`` or has
+ended. Once started, a background thread runs the eviction every
+``EVICT_INTERVAL_SECONDS``, so the entries of sessions that never rerun are freed too.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .filters import FilterSpec, page_column
+from .loader import DOC_KEYS, dataset_version, load_dataset, memory_budget
+from .paging import paged_dataset
+
+SELECTION_KEYS = ('selected_file', 'selected_discipline', 'selected_page')
+# Entries kept per session, sessions kept per process, and idle time before eviction
+SESSION_CACHE_ENTRIES = 8
+MAX_SESSIONS = 256
+IDLE_SECONDS = 30 * 60
+EVICT_INTERVAL_SECONDS = 60
+
+
+def select(state, filename, discipline, page=None):
+    """Store the selected document (or page) in ``state`` as IDs only"""
+    try:
+        page = int(page)
+    except (TypeError, ValueError):
+        # Missing page numbers ('N/A', NaN) select the document
+        page = None
+    state['selected_file'] = str(filename)
+    state['selected_discipline'] = str(discipline)
+    state['selected_page'] = page
+
+
+def clear_selection(state):
+    for key in SELECTION_KEYS:
+        state[key] = None
+
+
+def selection(state):
+    """(filename, discipline, page) of the current selection, or None"""
+    if not state.get('selected_file'):
+        return None
+    return state['selected_file'], state.get('selected_discipline'), state.get('selected_page')
+
+
+def link_filters(state, params, view):
+    """FilterSpec the ``view``'s filter widgets start from, read from a link's query ``params``.
+
+    A link is read when the page is opened with it (or the URL is edited), and
+    kept as the widgets' defaults afterwards: defaults that followed the URL on
+    every rerun would change the widgets' identity and reset them. Raises
+    ValueError for invalid parameters, which are then ignored.
+    """
+    params = dict(params)
+    if params != state.get(f'{view}_link_written'):
+        state[f'{view}_link'] = params
+        try:
+            return FilterSpec.from_params(params)
+        except ValueError:
+            state[f'{view}_link'] = {}
+            raise
+    return FilterSpec.from_params(state.get(f'{view}_link', {}))
+
+
+def link_update(state, params, spec, view):
+    """Query parameters encoding ``spec``, or None if ``params`` already match"""
+    link = spec.to_params()
+    state[f'{view}_link_written'] = link
+    return None if dict(params) == link else link
+
+
+@lru_cache(maxsize=4)
+def _row_index(config, version, level):
+    agg_df, page_df = load_dataset(config)
+    df = page_df if level == 'page' else agg_df
+    keys = DOC_KEYS + ([page_column(df)] if level == 'page' else [])
+    return pd.MultiIndex.from_frame(df[keys])
+
+
+def selected_row(config, filename, discipline, page=None):
+    """Scores of a page (or, without ``page``, a document) from the shared dataset as a dict, or None"""
+    if memory_budget(config):
+        return paged_dataset(config).row(filename, discipline, page)
+    agg_df, page_df = load_dataset(config)
+    level = 'page' if page is not None and page_column(page_df) else 'document'
+    df = page_df if level == 'page' else agg_df
+    key = (filename, discipline) + ((page,) if level == 'page' else ())
+    try:
+        position = _row_index(config, dataset_version(config), level).get_loc(key)
+    except KeyError:
+        return None
+    # Duplicate keys give a slice or a mask; the first match is the row
+    if isinstance(position, slice):
+        position = position.start
+    elif not isinstance(position, (int, np.integer)):
+        position = int(np.flatnonzero(position)[0])
+    return df.iloc[position].to_dict()
+
+
+class SessionCache:
+    """Small per-session LRU caches that are dropped when their session goes idle"""
+
+    def __init__(self, max_entries=SESSION_CACHE_ENTRIES, max_sessions=MAX_SESSIONS,
+                 idle_seconds=IDLE_SECONDS, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        # session_id -> [last_seen, OrderedDict of entries], least recently seen first
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        # Set by start(): reports whether a session is still connected
+        self.is_active = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _touch(self, session_id, now):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = [now, OrderedDict()]
+        session[0] = now
+        self._sessions.move_to_end(session_id)
+        return session[1]
+
+    def _evict(self, now):
+        """Drop idle sessions, then the least recently seen ones beyond ``max_sessions``"""
+        while self._sessions:
+            session_id, (last_seen, _) = next(iter(self._sessions.items()))
+            if now - last_seen <= self.idle_seconds and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    def get(self, session_id, key, compute):
+        """Cached value of ``key`` for the session, computing (and storing) it if missing"""
+        now = self.clock()
+        with self._lock:
+            entries = self._touch(session_id, now)
+            self._evict(now)
+            if key in entries:
+                entries.move_to_end(key)
+                return entries[key]
+        value = compute()
+        with self._lock:
+            entries = self._touch(session_id, now)
+            entries[key] = value
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            self._evict(now)
+        return value
+
+    def drop(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_idle(self):
+        """Drop sessions that ended or were idle for longer than ``idle_seconds``; returns how many were dropped"""
+        with self._lock:
+            before = len(self._sessions)
+            session_ids = list(self._sessions)
+        # Outside the lock: is_active may take the server's own locks
+        ended = [] if self.is_active is None else [sid for sid in session_ids if not self.is_active(sid)]
+        with self._lock:
+            for session_id in ended:
+                self._sessions.pop(session_id, None)
+            self._evict(self.clock())
+            return max(before - len(self._sessions), 0)
+
+    def _evict_loop(self, interval):
+        while not self._stopped.wait(interval):
+            self.evict_idle()
+
+    def start(self, is_active=None, interval=EVICT_INTERVAL_SECONDS):
+        """Run ``evict_idle`` every ``interval`` seconds in a background thread; returns self.
+
+        ``is_active(session_id)`` tells whether a session is still connected, so
+        the entries of closed sessions go on the next pass. Only the first call
+        starts the thread; later calls are no-ops.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self.is_active = is_active
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._evict_loop, args=(interval,),
+                                            name='session-cache-evict', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the eviction thread"""
+        self._stopped.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+
+# Process-wide, shared by every page
+session_cache = SessionCache()
@@ -0,0 +1,292 @@
+"""Columnar, partitioned on-disk copy of the page-score CSV.
+
+Layout::
+
+    <root>/manifest.json
+    <root>/<discipline>/part-00000/<column>.npy          numeric columns
+    <root>/<discipline>/part-00000/<column>.codes.npy    string columns (int32 codes)
+    <root>/<discipline>/part-00000/<column>.dict.json    ... and their dictionary
+
+Every column is a plain ``.npy`` file, so partitions can be memory-mapped and
+only the requested columns are ever read. A column's kind is fixed by the first
+CSV chunk that has values in it, and later chunks are cast to it. A document's
+pages are kept in one partition, so the CSV must list them contiguously;
+``build`` raises ``DataLoadError`` otherwise.
+"""
+import json
+import shutil
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .loader import DataLoadError, display_name, normalize_doc_id
+
+MANIFEST = 'manifest.json'
+# CSV rows parsed per ingest chunk; bounds memory while building the store
+CHUNK_ROWS = 1_000_000
+
+
+@dataclass(frozen=True)
+class Partition:
+    discipline: str
+    part: int
+    rows: int
+
+    @property
+    def name(self):
+        return f"{self.discipline}/part-{self.part:05d}"
+
+
+def _column_kind(values):
+    return 'numeric' if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values) else 'category'
+
+
+def _write_column(part_dir, name, values):
+    """Write one column; strings are dictionary-encoded"""
+    if _column_kind(values) == 'numeric':
+        np.save(part_dir / f"{name}.npy", values.to_numpy())
+        return 'numeric'
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    np.save(part_dir / f"{name}.codes.npy", codes.astype(np.int32))
+    (part_dir / f"{name}.dict.json").write_text(json.dumps([str(v) for v in uniques]))
+    return 'category'
+
+
+def write_partition(root, partition, frame):
+    """Write ``frame`` (raw column names, no discipline column) as one partition.
+
+    Returns {column: kind} for the manifest.
+    """
+    part_dir = Path(root) / partition.name
+    part_dir.mkdir(parents=True, exist_ok=True)
+    return {name: _write_column(part_dir, name, frame[name]) for name in frame.columns}
+
+
+def write_manifest(root, partitions, columns, version, source):
+    """Write the manifest that makes a directory of partitions readable as a store"""
+    columns = {**columns, 'discipline': 'category'}
+    manifest = {
+        'version': version,
+        'source': str(source),
+        'columns': columns,
+        'partitions': [p.__dict__ for p in partitions],
+    }
+    (Path(root) / MANIFEST).write_text(json.dumps(manifest, indent=1))
+
+
+def _write_missing(part_dir, name, rows, kind):
+    """Write a column without any values in this partition as ``kind``"""
+    if kind == 'numeric':
+        np.save(part_dir / f"{name}.npy", np.full(rows, np.nan))
+    else:
+        np.save(part_dir / f"{name}.codes.npy", np.full(rows, -1, dtype=np.int32))
+        (part_dir / f"{name}.dict.json").write_text('[]')
+
+
+def _cast(chunk, kinds):
+    """Cast ``chunk``'s columns to ``kinds``, fixing the kind of columns that have values for the first time.
+
+    Columns still without any value (kind None) are left as they are.
+    """
+    for name in chunk.columns:
+        values = chunk[name]
+        if kinds.get(name) is None:
+            if values.isna().all():
+                kinds[name] = None
+                continue
+            # Text so far; a column whose first values are all numbers is numeric
+            numbers = pd.to_numeric(values, errors='coerce')
+            kinds[name] = 'numeric' if not (numbers.isna() & values.notna()).any() else 'category'
+        if kinds[name] == 'numeric' and _column_kind(values) != 'numeric':
+            numbers = pd.to_numeric(values, errors='coerce')
+            bad = numbers.isna() & values.notna()
+            if bad.any():
+                raise DataLoadError(f"Column '{name}' is numeric in earlier rows but holds "
+                                    f"{values[bad].iloc[0]!r} in a later chunk.")
+            chunk[name] = numbers
+        elif kinds[name] == 'category' and _column_kind(values) != 'category':
+            chunk[name] = values.astype(object).where(values.notna())
+    return chunk
+
+
+def _check_contiguous(frame, seen):
+    """Raise unless every (pdf_id, discipline) in ``frame`` is listed in one run of rows not seen before"""
+    pdf_codes, _ = pd.factorize(frame['pdf_id'])
+    discipline_codes, disciplines = pd.factorize(frame['discipline'])
+    codes = pdf_codes.astype(np.int64) * max(len(disciplines), 1) + discipline_codes
+    starts = np.flatnonzero(np.diff(codes, prepend=-2) != 0)
+    keys = list(zip(frame['pdf_id'].to_numpy()[starts].tolist(), frame['discipline'].to_numpy()[starts].tolist()))
+    repeated = [key for key, count in Counter(keys).items() if count > 1] or [key for key in keys if key in seen]
+    if repeated:
+        pdf_id, discipline = repeated[0]
+        raise DataLoadError(f"The rows of document {pdf_id!r} ({discipline}) are not contiguous in the CSV. "
+                            "List each document's rows together, e.g. sorted by pdf_id.")
+    seen.update(keys)
+
+
+def _split_on_documents(chunk, carry):
+    """Prepend carried rows and hold back the trailing document for the next chunk"""
+    if carry is not None:
+        chunk = pd.concat([carry, chunk], ignore_index=True)
+    last_id = chunk['pdf_id'].iloc[-1]
+    tail = chunk['pdf_id'].to_numpy() == last_id
+    # Only the contiguous run at the end belongs to the trailing document
+    start = len(chunk) - np.argmin(tail[::-1]) if not tail.all() else 0
+    if start == 0:
+        return chunk, None
+    return chunk.iloc[:start], chunk.iloc[start:]
+
+
+class ColumnStore:
+    """Read access to a store directory built by ``ColumnStore.build``"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        manifest_path = self.root / MANIFEST
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Column store manifest not found: {manifest_path}")
+        self.manifest = json.loads(manifest_path.read_text())
+        self.partitions = [Partition(**p) for p in self.manifest['partitions']]
+        # Raw snake_case column name -> 'numeric' | 'category'
+        self.columns = self.manifest['columns']
+
+    @property
+    def version(self):
+        return self.manifest['version']
+
+    @property
+    def rows(self):
+        return sum(p.rows for p in self.partitions)
+
+    @classmethod
+    def exists(cls, root):
+        return root is not None and (Path(root) / MANIFEST).exists()
+
+    @classmethod
+    def build(cls, csv_path, root, chunk_rows=CHUNK_ROWS, version=None):
+        """Convert the page-score CSV at ``csv_path`` into a store at ``root``"""
+        csv_path, root = Path(csv_path), Path(root)
+        if root.exists():
+            shutil.rmtree(root)
+        root.mkdir(parents=True)
+
+        partitions, counters = [], {}
+        # Column -> kind, fixed by the first chunk with values in it
+        kinds = {}
+        # Column without values so far -> the partitions written without it
+        missing = {}
+        seen = set()
+        carry = None
+
+        def flush(frame):
+            # Carried rows were cast with an earlier chunk, possibly before a column's kind was known
+            frame = _cast(frame, kinds)
+            _check_contiguous(frame, seen)
+            for discipline, group in frame.groupby('discipline', sort=True):
+                part = counters.get(discipline, 0)
+                counters[discipline] = part + 1
+                partition = Partition(str(discipline), part, len(group))
+                undecided = [name for name in group.columns if kinds.get(name) is None and name != 'discipline']
+                for name in undecided:
+                    missing.setdefault(name, []).append(partition)
+                write_partition(root, partition, group.drop(columns=['discipline'] + undecided))
+                partitions.append(partition)
+
+        # Text columns are read as text in every chunk, so values that look like numbers stay as written
+        sample = pd.read_csv(csv_path, nrows=chunk_rows)
+        text = {name: str for name in sample.columns
+                if sample[name].isna().all() or _column_kind(sample[name]) == 'category'}
+        del sample
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows, dtype=text):
+            if 'filename' not in chunk.columns:
+                chunk['filename'] = normalize_doc_id(chunk['pdf_id'])
+            chunk = _cast(chunk, kinds)
+            # Partitions written before a column had values get it now, in its kind
+            for name in [name for name in missing if kinds.get(name) is not None]:
+                for partition in missing.pop(name):
+                    _write_missing(root / partition.name, name, partition.rows, kinds[name])
+            chunk, carry = _split_on_documents(chunk, carry)
+            flush(chunk)
+        if carry is not None:
+            flush(carry)
+        # Columns that never had a value are stored as missing numbers
+        for name, written in missing.items():
+            for partition in written:
+                _write_missing(root / partition.name, name, partition.rows, 'numeric')
+        columns = {name: kind or 'numeric' for name, kind in kinds.items() if name != 'discipline'}
+
+        if version is None:
+            stat = csv_path.stat()
+            version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        write_manifest(root, partitions, columns, version, csv_path)
+        return cls(root)
+
+    def select(self, disciplines=None):
+        """Partitions, optionally restricted to some disciplines"""
+        if not disciplines:
+            return list(self.partitions)
+        return [p for p in self.partitions if p.discipline in disciplines]
+
+    def read_column(self, partition, name, mmap=True):
+        """One column of one partition as a numpy array or Categorical"""
+        part_dir = self.root / partition.name
+        if name == 'discipline':
+            return pd.Categorical.from_codes(np.zeros(partition.rows, dtype=np.int8), [partition.discipline])
+        if self.columns[name] == 'numeric':
+            return np.load(part_dir / f"{name}.npy", mmap_mode='r' if mmap else None)
+        codes = np.load(part_dir / f"{name}.codes.npy", mmap_mode='r' if mmap else None)
+        categories = json.loads((part_dir / f"{name}.dict.json").read_text())
+        return pd.Categorical.from_codes(codes, categories)
+
+    def read(self, partition, columns=None, rows=None):
+        """Columns of one partition as a frame with display column names.
+
+        ``rows`` is an optional slice for reading a partition in pieces.
+        """
+        names = columns or list(self.columns)
+        data = {}
+        for name in names:
+            values = self.read_column(partition, name)
+            if rows is not None:
+                values = values[rows]
+            data[display_name(name)] = values
+        return pd.DataFrame(data)
+
+    def column_bytes(self, name):
+        """Approximate in-memory size of one value of a column"""
+        return 8 if self.columns.get(name) == 'numeric' else 4
+
+    def slices(self, partition, step):
+        """Row slices of about ``step`` rows that never split a document"""
+        if step >= partition.rows:
+            yield None
+            return
+        codes = np.load(self.root / partition.name / 'filename.codes.npy', mmap_mode='r')
+        # Row indices where a new document starts
+        boundaries = np.flatnonzero(np.diff(codes) != 0) + 1
+        start = 0
+        while start < partition.rows:
+            end = start + step
+            if end < partition.rows:
+                # Move the cut forward to the next document start
+                idx = np.searchsorted(boundaries, end)
+                end = int(boundaries[idx]) if idx < len(boundaries) else partition.rows
+            yield slice(start, min(end, partition.rows))
+            start = end
+
+    def slice_rows(self, partition, columns, max_bytes=None):
+        """Rows of ``columns`` that fit in ``max_bytes`` (the whole partition if unbounded)"""
+        if not max_bytes:
+            return partition.rows
+        row_bytes = sum(self.column_bytes(name) for name in columns) or 1
+        return max(1, min(partition.rows, max_bytes // row_bytes))
+
+    def iter_frames(self, columns=None, disciplines=None, max_bytes=None):
+        """Yield (partition, frame) for each partition, in row slices within ``max_bytes``"""
+        names = columns or list(self.columns)
+        for partition in self.select(disciplines):
+            for rows in self.slices(partition, self.slice_rows(partition, names, max_bytes)):
+                yield partition, self.read(partition, names, rows)
@@ -0,0 +1,139 @@
+"""Streaming benchmark summaries.
+
+``SummaryAccumulator`` consumes page frames one partition at a time and keeps
+only per-group sums and counts, so the full report (per discipline, per tool,
+per page number, per criterion) is computed in one pass with memory bounded by
+the largest partition rather than the dataset.
+"""
+import numpy as np
+import pandas as pd
+
+from .aggregator import CRITERIA, TOOLS
+
+HISTOGRAM_BINS = np.linspace(0.0, 1.0, 21)
+
+
+def _add(total, part):
+    return part if total is None else total.add(part, fill_value=0)
+
+
+def summary_columns(available):
+    """Raw store columns the accumulator needs, restricted to ``available``"""
+    wanted = ['filename', 'discipline', 'page_num']
+    for tool in TOOLS:
+        key = tool.lower()
+        wanted.append(f'overall_score_{key}')
+        wanted.extend(f"{criterion.lower().replace(' ', '_')}_score_{key}" for criterion in CRITERIA)
+        wanted.append(f'word_count_{key}')
+    return [col for col in wanted if col in available]
+
+
+class SummaryAccumulator:
+    """Mergeable sums/counts over page frames with display column names"""
+
+    def __init__(self):
+        self.page_sums = None      # Discipline x score/word-count column
+        self.page_counts = None
+        self.doc_sums = None       # Discipline x overall score column (document means)
+        self.doc_counts = None
+        self.pages_per_discipline = None
+        self.page_num_sums = None  # Page number x overall score column
+        self.page_num_counts = None
+        self.histograms = {}
+
+    @staticmethod
+    def value_columns(frame):
+        return [col for col in frame.columns if 'Score' in col or 'Word Count' in col]
+
+    def add(self, frame):
+        """Fold one page frame into the running statistics"""
+        if frame.empty:
+            return self
+        value_cols = self.value_columns(frame)
+        overall_cols = [col for col in value_cols if col.startswith('Overall Score')]
+
+        by_discipline = frame.groupby('Discipline', observed=True)
+        self.page_sums = _add(self.page_sums, by_discipline[value_cols].sum())
+        self.page_counts = _add(self.page_counts, by_discipline[value_cols].count())
+        self.pages_per_discipline = _add(self.pages_per_discipline, by_discipline.size())
+
+        # Documents never span partitions, so per-partition document means are final
+        doc_means = frame.groupby(['Discipline', 'Filename'], observed=True)[overall_cols].mean()
+        by_doc_discipline = doc_means.groupby(level='Discipline', observed=True)
+        self.doc_sums = _add(self.doc_sums, by_doc_discipline.sum())
+        self.doc_counts = _add(self.doc_counts, by_doc_discipline.count())
+
+        if 'Page Num' in frame.columns:
+            by_page = frame.groupby('Page Num')[overall_cols]
+            self.page_num_sums = _add(self.page_num_sums, by_page.sum())
+            self.page_num_counts = _add(self.page_num_counts, by_page.count())
+
+        for col in overall_cols:
+            values = np.asarray(frame[col], dtype=float)
+            counts, _ = np.histogram(values[~np.isnan(values)], bins=HISTOGRAM_BINS)
+            self.histograms[col] = self.histograms.get(col, 0) + counts
+        return self
+
+    def merge(self, other):
+        """Combine with another accumulator (e.g. from a worker process)"""
+        for name in ('page_sums', 'page_counts', 'doc_sums', 'doc_counts', 'pages_per_discipline',
+                     'page_num_sums', 'page_num_counts'):
+            theirs = getattr(other, name)
+            if theirs is not None:
+                setattr(self, name, _add(getattr(self, name), theirs))
+        for col, counts in other.histograms.items():
+            self.histograms[col] = self.histograms.get(col, 0) + counts
+        return self
+
+    def result(self, min_page_count=5):
+        """Summary tables as a dict of DataFrames"""
+        if self.page_sums is None:
+            return {}
+        page_means = self.page_sums / self.page_counts
+        overall_cols = [col for col in page_means.columns if col.startswith('Overall Score')]
+
+        by_discipline = page_means[overall_cols].copy()
+        by_discipline.insert(0, 'Pages', self.pages_per_discipline.astype(int))
+        by_discipline.insert(0, 'Documents', self.doc_counts[overall_cols[0]].astype(int))
+        doc_means = (self.doc_sums / self.doc_counts).add_prefix('Document ')
+        by_discipline = by_discipline.join(doc_means).reset_index()
+
+        totals = self.page_sums.sum() / self.page_counts.sum()
+        tools, criteria = [], []
+        for tool in TOOLS:
+            row = {'Tool': tool}
+            for criterion in ['Overall'] + CRITERIA:
+                col = f'{criterion} Score {tool}'
+                if col in totals.index:
+                    row[criterion] = totals[col]
+                    for discipline, value in page_means[col].items():
+                        criteria.append({'Discipline': discipline, 'Tool': tool,
+                                         'Criterion': criterion, 'Average Score': value})
+            if f'Word Count {tool}' in totals.index:
+                row['Word Count'] = totals[f'Word Count {tool}']
+            tools.append(row)
+
+        tables = {
+            'disciplines': by_discipline,
+            'tools': pd.DataFrame(tools),
+            'criteria': pd.DataFrame(criteria),
+            'histograms': pd.DataFrame({
+                'Bin Start': HISTOGRAM_BINS[:-1], 'Bin End': HISTOGRAM_BINS[1:],
+                **{col: counts for col, counts in self.histograms.items()},
+            }),
+        }
+        if self.page_num_sums is not None:
+            page_numbers = self.page_num_sums / self.page_num_counts
+            page_numbers.insert(0, 'Count', self.page_num_counts[overall_cols[0]].astype(int))
+            page_numbers = page_numbers[page_numbers['Count'] >= min_page_count]
+            tables['page_numbers'] = page_numbers.rename_axis('Page Number').reset_index()
+        return tables
+
+
+def summarize_store(store, disciplines=None, max_bytes=None):
+    """Stream every partition of ``store`` through a SummaryAccumulator"""
+    accumulator = SummaryAccumulator()
+    columns = summary_columns(store.columns)
+    for _, frame in store.iter_frames(columns, disciplines=disciplines, max_bytes=max_bytes):
+        accumulator.add(frame)
+    return accumulator
@@ -0,0 +1,241 @@
+"""Text statistics of the extracted markdown, computed once at ingest.
+
+``build_text_stats`` walks ``<markdown_dir>/<tool>/<discipline>/*.md`` with a
+process pool, splits every file into pages and writes two column stores, one
+discipline partition at a time as the workers' results arrive:
+
+    <out>/pages/       one row per (filename, discipline, page_num)
+    <out>/documents/   one row per (filename, discipline)
+
+Each has one column per statistic and tool (``<statistic>_<tool>``), in the
+same wide layout as the page-score CSV. With ``text_stats_dir`` configured,
+``load_dataset`` joins them onto its page and document frames, so they can be
+filtered and charted next to the scores without reading files at view time.
+
+Pages are recognised by ``## Page N`` headings, form feeds or Marker's
+``{N}------`` separators. A file without any of them is a single page 1.
+"""
+import os
+import re
+import shutil
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from .filters import TEXT_STATISTICS
+from .loader import raw_name
+from .locator import EXTRACTION_TOOLS
+from .store import ColumnStore, Partition, write_manifest, write_partition
+
+STATISTICS = [raw_name(name) for name in TEXT_STATISTICS]
+# Files per worker task
+BATCH_FILES = 256
+# Tasks submitted ahead of the one being written, per worker
+TASKS_AHEAD = 2
+# Lines at the top and bottom of a page checked for running headers and footers
+EDGE_LINES = 2
+# The two stores and the keys of their rows
+LEVELS = (('pages', ['filename', 'page_num']), ('documents', ['filename']))
+
+PAGE_MARKER = re.compile(r'^(?:## Page (\d+)|\{(\d+)\}-{3,})[ \t]*$|\f', re.MULTILINE)
+HYPHEN_BREAK = re.compile(r'\w-[ \t]*\n[ \t]*[a-z]')
+DIGITS = re.compile(r'\d+')
+
+
+def split_pages(text):
+    """[(page_num, text)] of a markdown file; 1-based page numbers, each listed once"""
+    pages, positions, number, start = [], {}, 1, 0
+
+    def add(number, page):
+        if number in positions:
+            # A repeated page number (the same heading twice) continues that page
+            i = positions[number]
+            pages[i] = (number, pages[i][1] + '\n' + page)
+        else:
+            positions[number] = len(pages)
+            pages.append((number, page))
+
+    last = None
+    for match in PAGE_MARKER.finditer(text):
+        if text[start:match.start()].strip():
+            add(number, text[start:match.start()])
+            last = number
+        if match.group(1):
+            number = int(match.group(1))
+        elif match.group(2):
+            # Marker numbers its separators from 0
+            number = int(match.group(2)) + 1
+        else:
+            number = (last if last is not None else number) + 1
+        start = match.end()
+    if text[start:].strip() or not pages:
+        add(number, text[start:])
+    return pages
+
+
+def _edge_lines(lines):
+    """Normalised first and last lines of a page, the candidates for headers and footers"""
+    edges = lines[:EDGE_LINES] + lines[max(EDGE_LINES, len(lines) - EDGE_LINES):]
+    # Page numbers inside running headers differ from page to page
+    normalised = {DIGITS.sub('#', ' '.join(line.lower().split())) for line in edges}
+    return {line for line in normalised if len(line.strip('# ')) >= 3}
+
+
+def file_statistics(text):
+    """(page rows, document row) of statistics for one markdown file"""
+    pages = []
+    for number, page in split_pages(text):
+        lines = [line for line in page.split('\n') if line.strip()]
+        ascii_chars = len(page.encode('ascii', 'ignore'))
+        pages.append({
+            'page_num': number,
+            'lines': lines,
+            'text_lines': len(lines),
+            'text_words': len(page.split()),
+            'text_chars': len(page),
+            'hyphen_breaks': len(HYPHEN_BREAK.findall(page)),
+            'non_ascii': len(page) - ascii_chars,
+        })
+
+    # Edge lines seen on more than one page are running headers or footers
+    edges = [_edge_lines(page.pop('lines')) for page in pages]
+    counts = Counter(line for page_edges in edges for line in page_edges)
+    for page, page_edges in zip(pages, edges):
+        page['repeated_edge_lines'] = sum(counts[line] > 1 for line in page_edges)
+
+    totals = {key: sum(page[key] for page in pages)
+              for key in ('text_lines', 'text_words', 'text_chars', 'hyphen_breaks', 'non_ascii', 'repeated_edge_lines')}
+    for row in pages + [totals]:
+        # Rates are recomputed from the totals for the document, not averaged over pages
+        row['hyphen_break_rate'] = row.pop('hyphen_breaks') / row['text_lines'] if row['text_lines'] else 0.0
+        row['non_ascii_ratio'] = row.pop('non_ascii') / row['text_chars'] if row['text_chars'] else 0.0
+    return pages, totals
+
+
+def _batch_task(paths, tool, discipline):
+    """Worker: statistics of a batch of one tool's files in one discipline"""
+    suffix = f'_{tool}.md'
+    page_rows, doc_rows = [], []
+    for path in paths:
+        filename = os.path.basename(path)[:-len(suffix)]
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages, document = file_statistics(f.read())
+        except OSError:
+            continue
+        page_rows.extend({'filename': filename, **page} for page in pages)
+        doc_rows.append({'filename': filename, **document})
+    # Frames travel back to the parent as columns rather than one dict per row
+    return tool, discipline, pd.DataFrame(page_rows), pd.DataFrame(doc_rows)
+
+
+def _tasks(markdown_dir, tools):
+    """(paths, tool, discipline) batches, grouped by discipline"""
+    tool_dirs = [Path(markdown_dir) / tool for tool in tools if (Path(markdown_dir) / tool).is_dir()]
+    disciplines = sorted({p.name for tool_dir in tool_dirs for p in tool_dir.iterdir() if p.is_dir()})
+    for discipline in disciplines:
+        for tool_dir in tool_dirs:
+            tool = tool_dir.name
+            paths = sorted(str(p) for p in (tool_dir / discipline).glob(f'*_{tool}.md'))
+            for start in range(0, len(paths), BATCH_FILES):
+                yield paths[start:start + BATCH_FILES], tool, discipline
+
+
+def _wide(frames, keys, tools):
+    """Outer-join per-tool frames on ``keys``, one ``<statistic>_<tool>`` column per statistic and tool"""
+    wide = None
+    for tool, frame in frames.items():
+        # One row per key, so the outer join cannot multiply rows
+        frame = frame.drop_duplicates(keys).set_index(keys)[STATISTICS].add_suffix(f'_{tool}')
+        wide = frame if wide is None else wide.join(frame, how='outer')
+    # Every partition has every column, even for tools without files in the discipline
+    columns = [f'{name}_{tool}' for tool in tools for name in STATISTICS]
+    return wide.reindex(columns=columns).astype(float).sort_index().reset_index()
+
+
+def _ordered_results(pool, tasks, limit):
+    """``_batch_task`` results in task order, with at most ``limit`` tasks submitted but not yet consumed"""
+    pending = deque()
+    for task in tasks:
+        pending.append(pool.submit(_batch_task, *task))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_discipline(out, discipline, batches, tools, written):
+    """Write one discipline's partition of both stores from its per-tool (page frames, document frames)"""
+    for level, (name, keys) in enumerate(LEVELS):
+        frames = {tool: pd.concat(parts[level], ignore_index=True) for tool, parts in batches.items()}
+        frames = {tool: frame for tool, frame in frames.items() if len(frame)}
+        if not frames:
+            continue
+        frame = _wide(frames, keys, tools)
+        partition = Partition(discipline, 0, len(frame))
+        partitions, columns = written[name]
+        columns.update(write_partition(out / name, partition, frame))
+        partitions.append(partition)
+
+
+def build_text_stats(markdown_dir, out, tools=EXTRACTION_TOOLS, workers=None):
+    """Compute the statistics of every markdown file and write the pages and documents stores"""
+    out = Path(out)
+    workers = workers or os.cpu_count() or 1
+    tasks = list(_tasks(markdown_dir, tools))
+    for name, _ in LEVELS:
+        if (out / name).exists():
+            shutil.rmtree(out / name)
+    # Store name -> (partitions, {column: kind}) written so far
+    written = {name: ([], {}) for name, _ in LEVELS}
+    discipline, batches = None, {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results come in task order, so a discipline is complete once the next one starts and
+        # is written then. The parent holds one discipline's statistics plus the results of at
+        # most TASKS_AHEAD tasks per worker that finished while it was writing
+        for tool, task_discipline, page_frame, doc_frame in _ordered_results(pool, tasks, TASKS_AHEAD * workers):
+            if task_discipline != discipline:
+                if discipline is not None:
+                    _write_discipline(out, discipline, batches, tools, written)
+                discipline, batches = task_discipline, {}
+            parts = batches.setdefault(tool, ([], []))
+            parts[0].append(page_frame)
+            parts[1].append(doc_frame)
+    if discipline is not None:
+        _write_discipline(out, discipline, batches, tools, written)
+
+    version = str(max((os.stat(path).st_mtime_ns for paths, _, _ in tasks for path in paths), default=0))
+    for name, _ in LEVELS:
+        partitions, columns = written[name]
+        (out / name).mkdir(parents=True, exist_ok=True)
+        write_manifest(out / name, partitions, columns, version, markdown_dir)
+    return sum(len(paths) for paths, _, _ in tasks)
+
+
+def _read(root, disciplines=None):
+    """A text-statistics store as one frame with display column names"""
+    store = ColumnStore(root)
+    frames = [store.read(partition) for partition in store.select(disciplines)]
+    if not frames:
+        return pd.DataFrame()
+    frame = pd.concat(frames, ignore_index=True)
+    for col in ('Filename', 'Discipline'):
+        frame[col] = frame[col].astype(str)
+    return frame
+
+
+def attach_text_statistics(agg_df, page_df, root, disciplines=None):
+    """(agg_df, page_df) with the statistics of the store at ``root`` joined on, optionally of some disciplines only"""
+    root = Path(root)
+    pages, documents = _read(root / 'pages', disciplines), _read(root / 'documents', disciplines)
+    if not pages.empty and 'Page Num' in page_df.columns:
+        keys = ['Filename', 'Discipline', 'Page Num']
+        pages['Page Num'] = pages['Page Num'].astype(page_df['Page Num'].dtype)
+        # Each page has one row of statistics, so the join never adds rows
+        page_df = page_df.merge(pages, on=keys, how='left', validate='many_to_one')
+    if not documents.empty:
+        agg_df = agg_df.merge(documents, on=['Filename', 'Discipline'], how='left', validate='many_to_one')
+    return agg_df, page_df
+
@@ -0,0 +1,93 @@
+"""Chunked, HTML-escaped views of large extracted-markdown files.
+
+A ``TextDocument`` reads a file once, computes its line, word and character
+counts, and splits it at line breaks into chunks of about ``CHUNK_CHARS``
+characters. The viewer sends one chunk per rerun instead of the whole file.
+Documents are cached per (path, size, mtime), so the stats and chunk bounds
+are computed once per version of a file.
+"""
+import html
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+CHUNK_CHARS = 64 * 1024
+TEXT_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class TextStats:
+    lines: int
+    words: int
+    chars: int
+
+
+def _chunk_bounds(text, chunk_chars):
+    """(start, end) offsets of consecutive chunks, cut after a newline where possible"""
+    bounds = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_chars, len(text))
+        if end < len(text):
+            newline = text.rfind('\n', start, end)
+            # A single line longer than a chunk is cut mid-line
+            end = newline + 1 if newline >= start else end
+        bounds.append((start, end))
+        start = end
+    return bounds or [(0, 0)]
+
+
+class TextDocument:
+    """A text file split into line-aligned chunks, with its stats"""
+
+    def __init__(self, text, chunk_chars=CHUNK_CHARS):
+        self.text = text
+        self.stats = TextStats(lines=text.count('\n') + 1, words=len(text.split()), chars=len(text))
+        self.bounds = _chunk_bounds(text, chunk_chars)
+        # 1-based number of the first line of each chunk
+        self.first_lines = [1]
+        for start, end in self.bounds[:-1]:
+            self.first_lines.append(self.first_lines[-1] + text.count('\n', start, end))
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def chunk(self, i):
+        start, end = self.bounds[i]
+        return self.text[start:end]
+
+    def chunk_lines(self, i):
+        """(first, last) line numbers covered by chunk ``i``"""
+        last = self.first_lines[i + 1] - 1 if i + 1 < len(self) else self.stats.lines
+        return self.first_lines[i], max(self.first_lines[i], last)
+
+    def escaped_lines(self, i):
+        """Lines of chunk ``i``, HTML-escaped"""
+        return html.escape(self.chunk(i).removesuffix('\n')).split('\n')
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_document(path, size, mtime_ns):
+    with open(path, 'r', encoding='utf-8') as f:
+        return TextDocument(f.read())
+
+
+def markdown_document(locator, filename, tool, discipline):
+    """Cached TextDocument of a tool's markdown, or None if it does not exist"""
+    path = locator.markdown_path(filename, tool, discipline)
+    if path is None:
+        return None
+    manifest = locator.manifest
+    if manifest is not None and manifest.ready:
+        stat = manifest.stat(tool, filename, discipline)
+        if stat is None:
+            return None
+        size, mtime_ns = stat
+    else:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+    return _text_document(str(Path(path)), size, mtime_ns)
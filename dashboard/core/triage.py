@@ -0,0 +1,117 @@
+"""Precomputed top-k lists for triaging extraction failures.
+
+For every (discipline, tool, criterion) the index keeps the row positions of
+the k lowest and k highest scoring pages, and for every tool pair the pages
+with the largest score disagreement in either direction. Positions index into
+the page frame the index was built from (``load_dataset``'s ``page_df``), so a
+list is a few hundred int32s and looking one up is a dict access.
+"""
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .aggregator import TOOLS
+from .compare import COMPARISON_CRITERIA, _difference_matrix, tool_pairs
+from .loader import dataset_version, load_dataset
+
+TRIAGE_K = 200
+ALL = 'All'
+
+
+def _extremes(values, k):
+    """Positions of the k smallest and k largest non-NaN values, each sorted from the extreme inwards"""
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) > k:
+        # argpartition is O(n); only the k survivors are sorted
+        low = valid[np.argpartition(values[valid], k)[:k]]
+        high = valid[np.argpartition(values[valid], -k)[-k:]]
+    else:
+        low = high = valid
+    low = low[np.argsort(values[low], kind='stable')]
+    high = high[np.argsort(-values[high], kind='stable')]
+    return low.astype(np.int32), high.astype(np.int32)
+
+
+class TriageIndex:
+    """Lowest/highest page positions per (discipline, tool, criterion) and per tool pair"""
+
+    def __init__(self, scores, disagreements, k):
+        self.scores = scores                # (discipline, tool, criterion) -> (low, high)
+        self.disagreements = disagreements  # (discipline, tool_a, tool_b, criterion) -> (b_wins, a_wins)
+        self.k = k
+
+    @classmethod
+    def build(cls, page_df, k=TRIAGE_K, tools=TOOLS, criteria=COMPARISON_CRITERIA):
+        """Index ``page_df`` (display column names); positions are row positions in it"""
+        score_labels = [(tool, criterion) for tool in tools for criterion in criteria
+                        if f'{criterion} Score {tool}' in page_df.columns]
+        diffs, diff_labels = _difference_matrix(page_df, tool_pairs(tools), criteria)
+        # One column-major float32 matrix, rows grouped by discipline so every slice is a contiguous view
+        matrix = np.empty((len(page_df), len(score_labels) + len(diff_labels)), dtype=np.float32, order='F')
+        for j, (tool, criterion) in enumerate(score_labels):
+            matrix[:, j] = page_df[f'{criterion} Score {tool}'].to_numpy(dtype=float)
+        matrix[:, len(score_labels):] = diffs
+
+        labels = score_labels + diff_labels
+        order = np.arange(len(page_df), dtype=np.int32)
+        slices = [(ALL, 0, len(page_df))]
+        if 'Discipline' in page_df.columns:
+            codes, names = pd.factorize(page_df['Discipline'], sort=True)
+            order = np.argsort(codes, kind='stable').astype(np.int32)
+            matrix = np.asfortranarray(matrix[order])
+            bounds = np.searchsorted(codes[order], np.arange(len(names) + 1))
+            slices = [(name, bounds[i], bounds[i + 1]) for i, name in enumerate(names)]
+
+        lists = {}
+        for discipline, start, stop in slices:
+            for j, label in enumerate(labels):
+                low, high = _extremes(matrix[start:stop, j], k)
+                lists[(discipline,) + label] = (low + start, high + start)
+        if len(slices) > 1:
+            # The overall extremes are among the per-discipline ones
+            for j, label in enumerate(labels):
+                candidates = [lists[(discipline,) + label] for discipline, _, _ in slices]
+                rows = np.concatenate([np.concatenate(pair) for pair in candidates])
+                low, high = _extremes(matrix[rows, j], k)
+                lists[(ALL,) + label] = (rows[low], rows[high])
+        elif len(slices) == 1 and slices[0][0] != ALL:
+            # A single discipline's lists are the overall ones
+            for label in labels:
+                lists[(ALL,) + label] = lists[(slices[0][0],) + label]
+
+        scores, disagreements = {}, {}
+        for key, (low, high) in lists.items():
+            target = scores if len(key) == 3 else disagreements
+            target[key] = (order[low], order[high])
+        return cls(scores, disagreements, k)
+
+    def worst(self, tool, criterion='Overall', discipline=ALL, k=None):
+        return self.scores.get((discipline, tool, criterion), (np.empty(0, np.int32),) * 2)[0][:k]
+
+    def best(self, tool, criterion='Overall', discipline=ALL, k=None):
+        return self.scores.get((discipline, tool, criterion), (np.empty(0, np.int32),) * 2)[1][:k]
+
+    def disagreement(self, high_tool, low_tool, criterion='Overall', discipline=ALL, k=None):
+        """Pages where ``high_tool`` beats ``low_tool`` by the widest margin"""
+        if (discipline, high_tool, low_tool, criterion) in self.disagreements:
+            return self.disagreements[(discipline, high_tool, low_tool, criterion)][1][:k]
+        if (discipline, low_tool, high_tool, criterion) in self.disagreements:
+            return self.disagreements[(discipline, low_tool, high_tool, criterion)][0][:k]
+        return np.empty(0, np.int32)
+
+    @property
+    def nbytes(self):
+        lists = list(self.scores.values()) + list(self.disagreements.values())
+        return sum(low.nbytes + high.nbytes for low, high in lists)
+
+
+@lru_cache(maxsize=2)
+def _triage_index(config, version, k):
+    _, page_df = load_dataset(config)
+    return TriageIndex.build(page_df, k)
+
+
+def triage_index(config, k=TRIAGE_K):
+    """TriageIndex over ``load_dataset(config)``'s page frame, built once per dataset version"""
+    return _triage_index(config, dataset_version(config), k)
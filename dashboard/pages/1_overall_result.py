@@ -1,75 +1,58 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from pathlib import Path
-import plotly.express as px
 import plotly.graph_objects as go
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import (
+    DataConfig,
+    DataLoadError,
+    MemoryBudgetError,
+    FilterSpec,
+    attach_metadata,
+    cached_result,
+    clamp_range,
+    dataset_version,
+    default_display_columns,
+    default_score_column,
+    disciplines,
+    document_pages,
+    file_manifest,
+    filter_bounds,
+    filtered_documents,
+    link_filters,
+    link_update,
+    metadata_columns,
+    paginate,
+    prefetch_document,
+    score_columns,
+    select,
+    session_cache,
+    text_statistic_columns,
+    word_count_columns,
+)
 
 # Page title
 st.set_page_config(page_title="📊 PDF Extraction Benchmark Results", layout="wide")
 
-@st.cache_data
+config = DataConfig.from_state(st.session_state)
+
+# Frees the table pages cached for closed sessions (and idle ones) in the background
+if Runtime.exists():
+    session_cache.start(is_active=Runtime.instance().is_active_session)
+
 def load_data():
     """Load both page-level and aggregated evaluation results data"""
     try:
-        # Load the page-level evaluation data
-        page_scores_path = Path(st.session_state.page_scores_csv)
-        metadata_path = Path(st.session_state.metadata_pkl)
-
-        if page_scores_path.exists() and metadata_path.exists():
-            # Load page-level data
-            page_df = pd.read_csv(page_scores_path)
-            metadata = pd.read_pickle(metadata_path)
-            
-            # Prepare metadata filename
-            metadata['filename'] = metadata['id_gotriple'].apply(lambda x: 'extracted_'+ x.replace('/', '_').replace(':', '_').replace('.', '_'))
-            
-            if 'filename' not in page_df.columns:
-                if 'pdf_id' in page_df.columns:
-                    page_df['filename'] = page_df['pdf_id'].apply(lambda x: 'extracted_' + str(x).replace('/', '_').replace(':', '_').replace('.', '_'))
-                else:
-                    st.error("'filename' column missing and cannot be derived (no 'pdf_id' and 'filename' column present).")
-                    # return pd.DataFrame(), pd.DataFrame()
-            
-            # Merge data using both filename and discipline as keys
-            page_df = page_df.merge(metadata, on=['filename', 'discipline'], how='left')
-            
-            # Create aggregated version
-            agg_dict = {}
-            cols_to_agg = [col for col in page_df.columns if col not in ['filename', 'discipline', 'page_num', 'page_number']]
-            
-            # For numeric columns, calculate mean
-            numeric_cols = page_df[cols_to_agg].select_dtypes(include=[np.number]).columns.tolist()
-            for col in numeric_cols:
-                agg_dict[col] = 'mean'
-            
-            # For non-numeric columns, take the first value
-            non_numeric_cols = page_df[cols_to_agg].select_dtypes(exclude=[np.number]).columns.tolist()
-            for col in non_numeric_cols:
-                agg_dict[col] = 'first'
-            
-            # Create aggregated dataframe
-            agg_df = page_df.groupby(['filename', 'discipline']).agg(agg_dict).reset_index()
-            
-            # Clean up column names for better display
-            agg_df.columns = [col.replace('_', ' ').title() for col in agg_df.columns]
-            page_df.columns = [col.replace('_', ' ').title() for col in page_df.columns]
-            
-            return agg_df, page_df
-        else:
-            error_messages = []
-            if not page_scores_path.exists():
-                error_messages.append(f"Page scores data file not found: {page_scores_path}")
-            if not metadata_path.exists():
-                error_messages.append(f"Metadata file not found: {metadata_path}")
-            st.error("\n".join(error_messages))
-            return pd.DataFrame(), pd.DataFrame()
+        # With a memory budget, only each discipline's bounds; the rows come with the filters below
+        return filter_bounds(config)
+    except DataLoadError as e:
+        st.error(str(e))
     except KeyError as e:
         st.error(f"KeyError occurred: {e}")
-        return pd.DataFrame(), pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame(), pd.DataFrame()
+    return pd.DataFrame(), pd.DataFrame()
 
 # Load data
 agg_df, page_df = load_data()
@@ -78,72 +61,142 @@ if agg_df.empty:
     st.warning("No data available to display.")
     st.stop()
 
+# Filters start from the link's query parameters, so a filtered view can be shared
+try:
+    shared = link_filters(st.session_state, st.query_params.to_dict(), 'documents')
+except ValueError as e:
+    st.warning(f"Ignoring invalid filter parameters in the link: {e}")
+    shared = FilterSpec()
+
 # Sidebar filters
 st.sidebar.header("🔍 Filters")
 
 # Discipline filter
+selected_discipline = None
 if 'Discipline' in agg_df.columns:
-    disciplines = ['All'] + sorted(agg_df['Discipline'].unique().tolist())
-    selected_discipline = st.sidebar.selectbox("Select Discipline:", disciplines)
-    if selected_discipline != 'All':
-        agg_df = agg_df[agg_df['Discipline'] == selected_discipline]
-        page_df = page_df[page_df['Discipline'] == selected_discipline]
+    discipline_options = ['All'] + disciplines(agg_df)
+    selected_discipline = st.sidebar.selectbox(
+        "Select Discipline:",
+        discipline_options,
+        index=discipline_options.index(shared.discipline) if shared.discipline in discipline_options else 0
+    )
 
 # Metric thresholds
 st.sidebar.subheader("📊 Score Filters")
 
-# Extract numeric columns for filtering
-numeric_cols = agg_df.select_dtypes(include=[np.number]).columns.tolist()
-score_cols = [col for col in numeric_cols if 'Score' in col or 'score' in col.lower()]
-
 # Score column selection and range filter
+score_cols = score_columns(agg_df)
+selected_score_col = None
+score_range = None
 if score_cols:
-    # Find the index of 'pymupdf overall' score column
-    default_index = next((i for i, col in enumerate(score_cols) if 'pymupdf' in col.lower() and 'overall' in col.lower()), 0)
-    
     selected_score_col = st.sidebar.selectbox(
         "Select Score Column:",
         options=score_cols,
         help="Select the score column to filter by",
-        index=default_index
+        index=score_cols.index(shared.score_col if shared.score_col in score_cols
+                               else default_score_column(score_cols))
     )
     
-    # Get min and max values for the selected score column
-    min_val = float(agg_df[selected_score_col].min())
-    max_val = float(agg_df[selected_score_col].max())
+    # Slider bounds come from the selected discipline's documents
+    score_values = agg_df[selected_score_col]
+    if selected_discipline and selected_discipline != 'All':
+        score_values = score_values[agg_df['Discipline'] == selected_discipline]
+    min_val = float(score_values.min())
+    max_val = float(score_values.max())
     
     # Create range slider
     score_range = st.sidebar.slider(
         f"Score Range for {selected_score_col}:",
         min_value=min_val,
         max_value=max_val,
-        value=(min_val, max_val),
+        value=clamp_range(shared.score_range if shared.score_col == selected_score_col else None, min_val, max_val),
         step=0.05
     )
-    
-    # Filter by score range
-    agg_df = agg_df[(agg_df[selected_score_col] >= score_range[0]) & 
-                    (agg_df[selected_score_col] <= score_range[1])]
-    page_df = page_df[page_df['Filename'].isin(agg_df['Filename'])]
+    # The full range filters nothing, so it is left out of the spec and the link
+    if score_range == (min_val, max_val):
+        score_range = None
 
 # Word count filter
-word_count_cols = [col for col in numeric_cols if 'Word Count' in col or 'word count' in col.lower()]
-if word_count_cols:
-    min_words = st.sidebar.number_input("Minimum Word Count:", min_value=0, value=0, step=100)
-    mask = False
-    for col in word_count_cols:
-        mask |= (agg_df[col] >= min_words)
-    if min_words > 0:
-        agg_df = agg_df[mask]
-        page_df = page_df[page_df['Filename'].isin(agg_df['Filename'])]
+min_words = 0
+if word_count_columns(agg_df):
+    min_words = st.sidebar.number_input("Minimum Word Count:", min_value=0, value=shared.min_words, step=100)
+
+# Text statistics filter, with precomputed statistics of the extracted markdown
+stat_cols = text_statistic_columns(agg_df)
+selected_stat_col = None
+stat_range = None
+if stat_cols:
+    st.sidebar.subheader("📝 Text Statistics")
+    selected_stat_col = st.sidebar.selectbox(
+        "Select Statistic:",
+        options=['None'] + stat_cols,
+        index=stat_cols.index(shared.stat_col) + 1 if shared.stat_col in stat_cols else 0,
+        help="Filter documents by a statistic of a tool's extracted text"
+    )
+    if selected_stat_col == 'None':
+        selected_stat_col = None
+    else:
+        stat_values = agg_df[selected_stat_col].dropna()
+        if stat_values.empty:
+            st.sidebar.caption("No statistics for this column.")
+            selected_stat_col = None
+        elif stat_values.max() > stat_values.min():
+            min_val = float(stat_values.min())
+            max_val = float(stat_values.max())
+            stat_range = st.sidebar.slider(
+                f"Range for {selected_stat_col}:",
+                min_value=min_val,
+                max_value=max_val,
+                value=clamp_range(shared.stat_range if shared.stat_col == selected_stat_col else None,
+                                  min_val, max_val),
+                step=(max_val - min_val) / 100
+            )
+            if stat_range == (min_val, max_val):
+                stat_range = None
+        else:
+            st.sidebar.caption(f"{selected_stat_col} is {stat_values.min():g} everywhere.")
+            selected_stat_col = None
 
 # Search functionality
 st.sidebar.subheader("🔎 Search")
-search_term = st.sidebar.text_input("Search in filename:")
-if search_term:
-    if 'Filename' in agg_df.columns:
-        agg_df = agg_df[agg_df['Filename'].str.contains(search_term, case=False, na=False)]
-        page_df = page_df[page_df['Filename'].isin(agg_df['Filename'])]
+search_term = st.sidebar.text_input("Search in filename:", value=shared.search)
+
+spec = FilterSpec(
+    discipline=selected_discipline,
+    score_col=selected_score_col,
+    score_range=score_range,
+    min_words=min_words,
+    search=search_term,
+    stat_col=selected_stat_col,
+    stat_range=stat_range,
+)
+# Keep the link in sync with the filters
+link = link_update(st.session_state, st.query_params.to_dict(), spec, 'documents')
+if link is not None:
+    st.query_params.from_dict(link)
+# Filtered results are cached per process and shared by every session with the same filters
+try:
+    agg_df, page_df = filtered_documents(config, spec)
+except MemoryBudgetError as e:
+    st.warning(str(e))
+    st.stop()
+
+# File availability from the background file manifest, once its first scan is done.
+# The table looks it up for the rows on screen only
+files, files_key = None, None
+if config.pdf_dir or config.markdown_dir:
+    st.sidebar.subheader("📁 Files")
+    manifest = file_manifest(config)
+    if manifest.ready:
+        files = manifest
+        only_complete = st.sidebar.checkbox("Only documents with the PDF and all three extractions")
+        if only_complete:
+            # Checked against every filtered document, so cached per manifest generation
+            agg_df, page_df = cached_result(('complete_documents', manifest.generation), config, spec,
+                                            lambda: (manifest.complete(agg_df), manifest.complete(page_df)))
+        files_key = (manifest.generation, only_complete)
+    else:
+        st.sidebar.caption("Scanning PDF and markdown directories...")
 
 # Main content area
 col1, col2, col3 = st.columns([2, 2, 2])
@@ -159,58 +212,93 @@ with col3:
         unique_disciplines = agg_df['Discipline'].nunique()
         st.metric("Disciplines", unique_disciplines)
 
-# Display options
-st.subheader("📋 Results Table")
-col1, col2 = st.columns([3, 1])
-with col1:
-    # Define default columns to show (most important ones)
-    default_cols = []
-    available_cols = agg_df.columns.tolist()
-    
-    # Priority columns to show by default
-    priority_cols = [
-        'Filename', 'Discipline', 'Overall Score', 'Word Count', 
-        'Title', 'Abstract', 'Authors', 'Id Openalex'
-    ]
-    
-    # Add priority columns that exist in the dataframe
-    for col in priority_cols:
-        if col in available_cols:
-            default_cols.append(col)
-    
-    # Add any overall score columns
-    for col in available_cols:
-        if 'Overall' in col and 'Score' in col and col not in default_cols:
-            default_cols.append(col)
-    
-    # Fill up to 8 columns with remaining columns if needed
-    remaining_cols = [col for col in available_cols if col not in default_cols]
-    while len(default_cols) < 8 and remaining_cols:
-        default_cols.append(remaining_cols.pop(0))
-    
-    show_columns = st.multiselect(
-        "Select columns to display:",
-        options=available_cols,
-        default=default_cols
-    )
-with col2:
-    rows_per_page = st.selectbox("Rows per page:", [10, 25, 50, 100], index=1)
+# Interactive sections are fragments: paging, row selection and the export only
+# rerun their own fragment. Their inputs are the filtered frames, passed explicitly,
+# so a fragment rerun reuses the data of the last full run.
+def previous_page():
+    st.session_state.page_num = max(1, st.session_state.page_num - 1)
+
+def next_page(total_pages):
+    st.session_state.page_num = min(total_pages, st.session_state.page_num + 1)
+
+@st.fragment
+def page_details(page_df, filename):
+    """Page-level metrics and score chart of one document"""
+    with st.expander("📄 View Page-Level Details", expanded=True):
+        # Page number, score and word count rows for the selected document
+        page_metrics, page_num_col, score_cols = document_pages(page_df, filename)
+        
+        # Display page-level metrics
+        st.write("Page-Level Metrics:")
+        
+        if not page_metrics.columns.empty:
+            st.dataframe(page_metrics, use_container_width=True)
+            
+            # Add page-level visualization if we have page numbers and scores
+            if page_num_col and score_cols:
+                fig = go.Figure()
+                for score_col in score_cols:
+                    fig.add_trace(go.Scatter(
+                        x=page_metrics[page_num_col],
+                        y=page_metrics[score_col],
+                        mode='lines+markers',
+                        name=score_col
+                    ))
+                fig.update_layout(
+                    title="Page-Level Scores",
+                    xaxis_title="Page Number",
+                    yaxis_title="Score",
+                    height=300
+                )
+                st.plotly_chart(fig, use_container_width=True)
+        else:
+            st.warning("No page-level metrics available for this document.")
+
+@st.fragment
+def results_table(agg_df, page_df, spec, files, files_key):
+    """Column picker, paginated document table and the selected document's details"""
+    st.subheader("📋 Results Table")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        # Define default columns to show (most important ones)
+        available_cols = agg_df.columns.tolist()
+        # File availability and metadata columns are offered too, but only looked up for the rows on screen
+        if files is not None:
+            available_cols += files.columns
+        available_cols += [col for col in metadata_columns(config) if col not in available_cols]
+        
+        # Priority columns to show by default
+        priority_cols = [
+            'Filename', 'Discipline', 'Overall Score', 'Word Count', 
+            'Title', 'Abstract', 'Authors', 'Id Openalex'
+        ]
+        default_cols = default_display_columns(available_cols, priority_cols)
+        
+        show_columns = st.multiselect(
+            "Select columns to display:",
+            options=available_cols,
+            default=default_cols
+        )
+    with col2:
+        rows_per_page = st.selectbox("Rows per page:", [10, 25, 50, 100], index=1)
+
+    if not show_columns:
+        return
 
-if show_columns:
-    # Create pagination
-    total_rows = len(agg_df)
-    total_pages = (total_rows - 1) // rows_per_page + 1
-    
     # Initialize page number in session state if not exists
     if 'page_num' not in st.session_state:
         st.session_state.page_num = 1
     
-    # Calculate row range for current page (0-based indexing)
-    start_idx = (st.session_state.page_num - 1) * rows_per_page
-    end_idx = min(start_idx + rows_per_page, total_rows)
-    
-    # Display subset of data
-    page_df_subset = agg_df[show_columns].iloc[start_idx:end_idx].reset_index(drop=True)
+    # Display subset of data for the current page
+    total_rows = len(agg_df)
+    # Rendered table pages are cached per session (idle sessions are evicted)
+    view_key = ('documents', dataset_version(config), spec.canonical(), files_key,
+                tuple(show_columns), st.session_state.page_num, rows_per_page)
+    page_df_subset, start_idx, end_idx, total_pages = session_cache.get(
+        get_script_run_ctx().session_id, view_key,
+        lambda: paginate(agg_df, show_columns, st.session_state.page_num, rows_per_page, config=config,
+                         manifest=files)
+    )
     
     # Create interactive table with click functionality
     st.write(f"Showing rows {start_idx + 1}-{end_idx} of {total_rows}")
@@ -225,16 +313,16 @@ if show_columns:
         hide_index=True
     )
     
-    # Add pagination controls below the table
+    # Add pagination controls below the table; the callbacks run before the
+    # fragment reruns, so the table already shows the new page
     pagination_cols = st.columns([1, 2, 1])
     with pagination_cols[0]:
-        if st.button("⬅️ Previous", disabled=st.session_state.page_num <= 1):
-            st.session_state.page_num = max(1, st.session_state.page_num - 1)
+        st.button("⬅️ Previous", disabled=st.session_state.page_num <= 1, on_click=previous_page)
     with pagination_cols[1]:
         st.write(f"Page {st.session_state.page_num} of {total_pages}")
     with pagination_cols[2]:
-        if st.button("Next ➡️", disabled=st.session_state.page_num >= total_pages):
-            st.session_state.page_num = min(total_pages, st.session_state.page_num + 1)
+        st.button("Next ➡️", disabled=st.session_state.page_num >= total_pages, on_click=next_page,
+                  args=(total_pages,))
     
     # Row selection for PDF viewer
     if total_rows > 0:
@@ -245,74 +333,36 @@ if show_columns:
             selected_filename = agg_df.iloc[actual_row_idx].get('Filename', f'Row {actual_row_idx + 1}')
             
             st.info(f"Selected: {selected_filename}")
+            # Start reading the document's files for the viewer in the background
+            prefetch_document(config, selected_filename, agg_df.iloc[actual_row_idx]['Discipline'])
             if st.button("🔍 View PDF & Markdown", type="primary"):
-                # Store selected data in session state
+                # Only the document's IDs go in session state; the viewer looks its row up
                 selected_row = agg_df.iloc[actual_row_idx]
-                st.session_state.selected_row_data = selected_row.to_dict()
-                st.session_state.selected_file = selected_row.get('Filename', '')
+                select(st.session_state, selected_row['Filename'], selected_row['Discipline'])
                 # Directly navigate to the PDF viewer page
                 st.switch_page("pages/3_pdf_vis.py")
             
             # Show expandable page-level details
-            with st.expander("📄 View Page-Level Details", expanded=True):
-                # Filter page_df for the selected document
-                doc_pages = page_df[page_df['Filename'] == selected_filename]
-                
-                # Display page-level metrics
-                st.write("Page-Level Metrics:")
-                # Get the actual column names for page number and scores
-                page_num_col = next((col for col in doc_pages.columns if 'page' in col.lower() and ('num' in col.lower() or 'number' in col.lower())), None)
-                score_cols = [col for col in doc_pages.columns if 'score' in col.lower()]
-                word_count_col = next((col for col in doc_pages.columns if 'word' in col.lower() and 'count' in col.lower()), None)
-                
-                # Select available columns
-                display_cols = []
-                if page_num_col:
-                    display_cols.append(page_num_col)
-                if score_cols:
-                    display_cols.extend(score_cols)
-                if word_count_col:
-                    display_cols.append(word_count_col)
-                
-                if display_cols:
-                    page_metrics = doc_pages[display_cols]
-                    st.dataframe(page_metrics, use_container_width=True)
-                    
-                    # Add page-level visualization if we have page numbers and scores
-                    if page_num_col and score_cols:
-                        fig = go.Figure()
-                        for score_col in score_cols:
-                            fig.add_trace(go.Scatter(
-                                x=doc_pages[page_num_col],
-                                y=doc_pages[score_col],
-                                mode='lines+markers',
-                                name=score_col
-                            ))
-                        fig.update_layout(
-                            title="Page-Level Scores",
-                            xaxis_title="Page Number",
-                            yaxis_title="Score",
-                            height=300
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
-                else:
-                    st.warning("No page-level metrics available for this document.")
-            
-            
+            page_details(page_df, selected_filename)
         else:
             st.info("👆 Click on a row in the table above to view page-level details")
 
+@st.fragment
+def export_section(agg_df, files):
+    st.subheader("💾 Export Data")
+    if st.button("📁 Download Filtered Results as CSV"):
+        export_df = attach_metadata(agg_df, config)
+        if files is not None:
+            export_df = pd.concat([export_df, files.availability(export_df)], axis=1)
+        csv = export_df.to_csv(index=False)
+        st.download_button(
+            label="Download CSV",
+            data=csv,
+            file_name=f"filtered_results_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
 
-    
-   
+results_table(agg_df, page_df, spec, files, files_key)
 
 # Export functionality
-st.subheader("💾 Export Data")
-if st.button("📁 Download Filtered Results as CSV"):
-    csv = agg_df.to_csv(index=False)
-    st.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name=f"filtered_results_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        mime="text/csv"
-    ) 
\ No newline at end of file
+export_section(agg_df, files)
@@ -1,55 +1,64 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from pathlib import Path
 import plotly.express as px
 import plotly.graph_objects as go
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import (
+    TEXT_STATISTICS,
+    DataConfig,
+    DataLoadError,
+    MemoryBudgetError,
+    FilterSpec,
+    attach_metadata,
+    cached_result,
+    clamp_range,
+    dataset_version,
+    default_display_columns,
+    discipline_scores,
+    disciplines,
+    file_manifest,
+    filter_bounds,
+    filtered_pages,
+    link_filters,
+    link_update,
+    metadata_columns,
+    overall_score_columns,
+    page_column,
+    page_number_scores,
+    paginate,
+    prefetch_document,
+    score_histogram,
+    select,
+    session_cache,
+    text_statistic_columns,
+    text_statistic_scores,
+    word_count_columns,
+)
 
 # Page title
 st.set_page_config(page_title="📄 Page-Level Extraction Results", layout="wide")
 
-@st.cache_data
+config = DataConfig.from_state(st.session_state)
+
+# Frees the table pages cached for closed sessions (and idle ones) in the background
+if Runtime.exists():
+    session_cache.start(is_active=Runtime.instance().is_active_session)
+
 def load_data():
     """Load the page-level evaluation results data"""
     try:
-        # Load the page-level evaluation data
-        # data_path = Path("output/page_scores_lt15_en.csv") # Old path
-        # metadata_path = Path("output/metadata_openalex(silver).pkl") # Old path
-
-        page_scores_path = Path(st.session_state.page_scores_csv)
-        metadata_path = Path(st.session_state.metadata_pkl)
-
-        if page_scores_path.exists() and metadata_path.exists(): # Check both paths
-            df = pd.read_csv(page_scores_path)
-            metadata = pd.read_pickle(metadata_path)
-
-            # Ensure 'filename' column exists in df for merging
-            if 'filename' not in df.columns:
-                if 'pdf_id' in df.columns:
-                    df['filename'] = df['pdf_id'].apply(lambda x: 'extracted_' + str(x).replace('/', '_').replace(':', '_').replace('.', '_'))
-                else:
-                    st.error("'filename' column missing and cannot be derived (no 'pdf_id' column present).")
-                    return pd.DataFrame()
-            
-            metadata['filename'] = metadata['id_gotriple'].apply(lambda x: 'extracted_'+ x.replace('/', '_').replace(':', '_').replace('.', '_'))
-            df = df.merge(metadata, on=['filename', 'discipline'], how='left')
-            # Clean up column names for better display
-            df.columns = [col.replace('_', ' ').title() for col in df.columns]
-            return df
-        else:
-            error_messages = []
-            if not page_scores_path.exists():
-                error_messages.append(f"Page scores data file not found: {page_scores_path}")
-            if not metadata_path.exists():
-                error_messages.append(f"Metadata file not found: {metadata_path}")
-            st.error("\n".join(error_messages))
-            return pd.DataFrame()
+        # With a memory budget, only each discipline's bounds; the rows come with the filters below
+        _, df = filter_bounds(config)
+        return df
+    except DataLoadError as e:
+        st.error(str(e))
     except KeyError as e:
         st.error(f"KeyError occurred: {str(e)}")
-        return pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+    return pd.DataFrame()
 
 # Load data
 df = load_data()
@@ -58,263 +67,383 @@ if df.empty:
     st.warning("No data available to display.")
     st.stop()
 
+# Filters start from the link's query parameters, so a filtered view can be shared
+try:
+    shared = link_filters(st.session_state, st.query_params.to_dict(), 'pages')
+except ValueError as e:
+    st.warning(f"Ignoring invalid filter parameters in the link: {e}")
+    shared = FilterSpec()
+
 # Sidebar filters
 st.sidebar.header("🔍 Filters")
 
 # Discipline filter
+selected_discipline = None
 if 'Discipline' in df.columns:
-    disciplines = ['All'] + sorted(df['Discipline'].unique().tolist())
-    selected_discipline = st.sidebar.selectbox("Select Discipline:", disciplines)
-    if selected_discipline != 'All':
-        df = df[df['Discipline'] == selected_discipline]
+    discipline_options = ['All'] + disciplines(df)
+    selected_discipline = st.sidebar.selectbox(
+        "Select Discipline:",
+        discipline_options,
+        index=discipline_options.index(shared.discipline) if shared.discipline in discipline_options else 0
+    )
 
 # Page number filter
-if 'Page Number' in df.columns or 'Page Num' in df.columns:
-    page_col = 'Page Number' if 'Page Number' in df.columns else 'Page Num'
-    max_page = int(df[page_col].max()) if not df[page_col].isna().all() else 1
-    min_page = int(df[page_col].min()) if not df[page_col].isna().all() else 1
+page_col = page_column(df)
+page_range = None
+if page_col:
+    page_values = df[page_col]
+    if selected_discipline and selected_discipline != 'All':
+        page_values = page_values[df['Discipline'] == selected_discipline]
+    max_page = int(page_values.max()) if not page_values.isna().all() else 1
+    min_page = int(page_values.min()) if not page_values.isna().all() else 1
     
     page_range = st.sidebar.slider(
         "Page Number Range:",
         min_value=min_page,
         max_value=max_page,
-        value=(min_page, max_page),
+        value=clamp_range(shared.page_range, min_page, max_page),
         step=1
     )
-    df = df[(df[page_col] >= page_range[0]) & (df[page_col] <= page_range[1])]
+    # The full range filters nothing, so it is left out of the spec and the link
+    if page_range == (min_page, max_page):
+        page_range = None
 
 # Metric thresholds
 st.sidebar.subheader("📊 Score Filters")
 
-# Extract numeric columns for filtering
-numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-score_cols = [col for col in numeric_cols if 'Score' in col or 'score' in col.lower()]
-
 # Overall score filter
-overall_score_cols = [col for col in score_cols if 'Overall' in col or 'overall' in col.lower()]
+overall_score_cols = overall_score_columns(df)
+min_score = None
 if overall_score_cols:
     min_score = st.sidebar.slider(
         "Minimum Overall Score:",
         min_value=0.0,
         max_value=1.0,
-        value=0.0,
+        value=min(max(shared.min_score or 0.0, 0.0), 1.0),
         step=0.05
     )
-    # Filter by any overall score column
-    mask = False
-    for col in overall_score_cols:
-        mask |= (df[col] >= min_score)
-    df = df[mask]
+    if min_score == 0.0:
+        min_score = None
 
 # Word count filter
-word_count_cols = [col for col in numeric_cols if 'Word Count' in col or 'word count' in col.lower()]
-if word_count_cols:
-    min_words = st.sidebar.number_input("Minimum Word Count:", min_value=0, value=0, step=100)
-    mask = False
-    for col in word_count_cols:
-        mask |= (df[col] >= min_words)
-    if min_words > 0:
-        df = df[mask]
+min_words = 0
+if word_count_columns(df):
+    min_words = st.sidebar.number_input("Minimum Word Count:", min_value=0, value=shared.min_words, step=100)
+
+# Text statistics filter, with precomputed statistics of the extracted markdown
+stat_cols = text_statistic_columns(df)
+selected_stat_col = None
+stat_range = None
+if stat_cols:
+    st.sidebar.subheader("📝 Text Statistics")
+    selected_stat_col = st.sidebar.selectbox(
+        "Select Statistic:",
+        options=['None'] + stat_cols,
+        index=stat_cols.index(shared.stat_col) + 1 if shared.stat_col in stat_cols else 0,
+        help="Filter pages by a statistic of a tool's extracted text"
+    )
+    if selected_stat_col == 'None':
+        selected_stat_col = None
+    else:
+        stat_values = df[selected_stat_col].dropna()
+        if stat_values.empty:
+            st.sidebar.caption("No statistics for this column.")
+            selected_stat_col = None
+        elif stat_values.max() > stat_values.min():
+            min_val = float(stat_values.min())
+            max_val = float(stat_values.max())
+            stat_range = st.sidebar.slider(
+                f"Range for {selected_stat_col}:",
+                min_value=min_val,
+                max_value=max_val,
+                value=clamp_range(shared.stat_range if shared.stat_col == selected_stat_col else None,
+                                  min_val, max_val),
+                step=(max_val - min_val) / 100
+            )
+            if stat_range == (min_val, max_val):
+                stat_range = None
+        else:
+            st.sidebar.caption(f"{selected_stat_col} is {stat_values.min():g} everywhere.")
+            selected_stat_col = None
 
 # Search functionality
 st.sidebar.subheader("🔎 Search")
-search_term = st.sidebar.text_input("Search in filename:")
-if search_term:
-    if 'Filename' in df.columns:
-        df = df[df['Filename'].str.contains(search_term, case=False, na=False)]
+search_term = st.sidebar.text_input("Search in filename:", value=shared.search)
+
+spec = FilterSpec(
+    discipline=selected_discipline,
+    page_range=page_range,
+    min_score=min_score,
+    min_words=min_words,
+    search=search_term,
+    stat_col=selected_stat_col,
+    stat_range=stat_range,
+)
+# Keep the link in sync with the filters
+link = link_update(st.session_state, st.query_params.to_dict(), spec, 'pages')
+if link is not None:
+    st.query_params.from_dict(link)
+# Filtered results are cached per process and shared by every session with the same filters
+try:
+    df = filtered_pages(config, spec)
+except MemoryBudgetError as e:
+    st.warning(str(e))
+    st.stop()
+
+# File availability from the background file manifest, once its first scan is done.
+# The table looks it up for the rows on screen only
+files, files_key = None, None
+if config.pdf_dir or config.markdown_dir:
+    st.sidebar.subheader("📁 Files")
+    manifest = file_manifest(config)
+    if manifest.ready:
+        files = manifest
+        only_complete = st.sidebar.checkbox("Only pages with the PDF and all three extractions")
+        if only_complete:
+            # Checked against every filtered page, so cached per manifest generation
+            df = cached_result(('complete_pages', manifest.generation), config, spec, lambda: manifest.complete(df))
+        files_key = (manifest.generation, only_complete)
+    else:
+        st.sidebar.caption("Scanning PDF and markdown directories...")
 
 # Main content area
 col1, col2, col3 = st.columns([2, 2, 2])
 
+# Counts are cached with the filtered pages
+total_pages, avg_score, unique_docs = cached_result(('page_metrics', files_key), config, spec, lambda: (
+    len(df),
+    df[overall_score_cols[0]].mean() if overall_score_cols else None,
+    df['Filename'].nunique() if 'Filename' in df.columns else None,
+))
 with col1:
-    st.metric("Total Pages", len(df))
+    st.metric("Total Pages", total_pages)
 with col2:
-    if overall_score_cols:
-        avg_score = df[overall_score_cols[0]].mean()
+    if avg_score is not None:
         st.metric("Average Overall Score", f"{avg_score:.3f}")
 with col3:
-    if 'Filename' in df.columns:
-        unique_docs = df['Filename'].nunique()
+    if unique_docs is not None:
         st.metric("Unique Documents", unique_docs)
 
-# Display options
-st.subheader("📋 Page Results Table")
-col1, col2 = st.columns([3, 1])
-with col1:
-    # Define default columns to show (most important ones)
-    default_cols = []
-    available_cols = df.columns.tolist()
-    
-    # Priority columns to show by default
-    priority_cols = [
-        'Filename', 'Page Number', 'Page Num', 'Discipline',
-        'Overall Score', 'Word Count', 'Title', 'Abstract'
-    ]
-    
-    # Add priority columns that exist in the dataframe
-    for col in priority_cols:
-        if col in available_cols:
-            default_cols.append(col)
-    
-    # Add any overall score columns
-    for col in available_cols:
-        if 'Overall' in col and 'Score' in col and col not in default_cols:
-            default_cols.append(col)
-    
-    # Fill up to 8 columns with remaining columns if needed
-    remaining_cols = [col for col in available_cols if col not in default_cols]
-    while len(default_cols) < 8 and remaining_cols:
-        default_cols.append(remaining_cols.pop(0))
-    
-    show_columns = st.multiselect(
-        "Select columns to display:",
-        options=available_cols,
-        default=default_cols
-    )
-with col2:
-    rows_per_page = st.selectbox("Rows per page:", [10, 25, 50, 100], index=1)
-
-if show_columns:
-    # Create pagination
-    total_rows = len(df)
-    total_pages = (total_rows - 1) // rows_per_page + 1
-    
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        page_num = st.selectbox(
-            f"Page (1-{total_pages}):",
-            range(1, total_pages + 1),
-            key="page_selector"
+# Interactive sections are fragments: the page selector, row selection, chart
+# options and the export only rerun their own fragment. Their inputs are the
+# filtered frame and the filter state, passed explicitly, so a fragment rerun
+# reuses the data of the last full run.
+@st.fragment
+def results_table(df, spec, files, files_key):
+    """Column picker, paginated page table and the row selection for the viewer"""
+    st.subheader("📋 Page Results Table")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        # Define default columns to show (most important ones)
+        available_cols = df.columns.tolist()
+        # File availability and metadata columns are offered too, but only looked up for the rows on screen
+        if files is not None:
+            available_cols += files.columns
+        available_cols += [col for col in metadata_columns(config) if col not in available_cols]
+        
+        # Priority columns to show by default
+        priority_cols = [
+            'Filename', 'Page Number', 'Page Num', 'Discipline',
+            'Overall Score', 'Word Count', 'Title', 'Abstract'
+        ]
+        default_cols = default_display_columns(available_cols, priority_cols)
+        
+        show_columns = st.multiselect(
+            "Select columns to display:",
+            options=available_cols,
+            default=default_cols
         )
-    
-    # Calculate row range for current page
-    start_idx = (page_num - 1) * rows_per_page
-    end_idx = min(start_idx + rows_per_page, total_rows)
-    
-    # Display subset of data
-    page_df = df[show_columns].iloc[start_idx:end_idx].reset_index(drop=True)
-    
-    # Create interactive table with click functionality
-    st.write(f"Showing rows {start_idx + 1}-{end_idx} of {total_rows}")
-    
-    # Add a button column for navigation
-    display_df = page_df.copy()
-    
-    # Display the table with selection enabled
-    selected_rows = st.dataframe(
-        display_df,
-        use_container_width=True,
-        height=400,
-        on_select="rerun",
-        selection_mode="single-row",
-        hide_index=True
-    )
-    
-    # Row selection for PDF viewer
-    if total_rows > 0:
-        # Check if any row is selected
-        if selected_rows.selection.rows:
-            selected_table_idx = selected_rows.selection.rows[0]
-            actual_row_idx = start_idx + selected_table_idx
-            selected_filename = df.iloc[actual_row_idx].get('Filename', f'Row {actual_row_idx + 1}')
-            selected_page = df.iloc[actual_row_idx].get('Page Number', df.iloc[actual_row_idx].get('Page Num', 'N/A'))
-            
-            st.info(f"Selected: {selected_filename} - Page {selected_page}")
-            
-            if st.button("🔍 View PDF & Markdown", type="primary"):
-                # Store selected data in session state
-                selected_row = df.iloc[actual_row_idx]
-                st.session_state.selected_row_data = selected_row.to_dict()
-                st.session_state.selected_file = selected_row.get('Filename', '')
-                st.session_state.selected_page = selected_page
-                # Directly navigate to the PDF viewer page
-                st.switch_page("pages/3_pdf_vis.py")
-        else:
-            st.info("👆 Click on a row in the table above to select it, then click the button to view PDF & Markdown")
+    with col2:
+        rows_per_page = st.selectbox("Rows per page:", [10, 25, 50, 100], index=1)
 
-# Visualization section
-if len(df) > 0 and overall_score_cols:
-    st.subheader("📊 Score Distribution")
-    
-    # Score comparison chart
-    fig_scores = go.Figure()
-    
-    for i, col in enumerate(overall_score_cols[:3]):  # Limit to first 3 score columns
-        fig_scores.add_trace(go.Histogram(
-            x=df[col],
-            name=col.replace(' Overall Score', ''),
-            opacity=0.7,
-            nbinsx=20
-        ))
-    
-    fig_scores.update_layout(
-        title="Distribution of Overall Scores by Extraction Method (Page Level)",
-        xaxis_title="Score",
-        yaxis_title="Count",
-        barmode='overlay',
-        height=400
-    )
-    
-    st.plotly_chart(fig_scores, use_container_width=True)
-    
-    # Performance comparison by discipline
-    if 'Discipline' in df.columns and len(df['Discipline'].unique()) > 1:
-        st.subheader("📈 Performance by Discipline (Page Level)")
+    if show_columns:
+        # Create pagination
+        total_rows = len(df)
+        total_pages = max(1, (total_rows - 1) // rows_per_page + 1)
         
-        # Calculate average scores by discipline
-        discipline_scores = df.groupby('Discipline')[overall_score_cols[0]].agg(['mean', 'count']).reset_index()
-        discipline_scores.columns = ['Discipline', 'Average Score', 'Count']
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            page_num = st.selectbox(
+                f"Page (1-{total_pages}):",
+                range(1, total_pages + 1),
+                key="page_selector"
+            )
         
-        fig_discipline = px.bar(
-            discipline_scores,
-            x='Discipline',
-            y='Average Score',
-            title=f"Average {overall_score_cols[0]} by Discipline (Page Level)",
-            text='Count',
-            height=400
+        # Display subset of data for the current page
+        # Rendered table pages are cached per session (idle sessions are evicted)
+        view_key = ('pages', dataset_version(config), spec.canonical(), files_key,
+                    tuple(show_columns), page_num, rows_per_page)
+        page_df, start_idx, end_idx, total_pages = session_cache.get(
+            get_script_run_ctx().session_id, view_key,
+            lambda: paginate(df, show_columns, page_num, rows_per_page, config=config, manifest=files)
         )
         
-        fig_discipline.update_traces(texttemplate='%{text} pages', textposition='outside')
-        fig_discipline.update_layout(yaxis=dict(range=[0, 1]))
+        # Create interactive table with click functionality
+        st.write(f"Showing rows {start_idx + 1}-{end_idx} of {total_rows}")
         
-        st.plotly_chart(fig_discipline, use_container_width=True)
-    
-    # Page number vs performance analysis
-    page_col = 'Page Number' if 'Page Number' in df.columns else ('Page Num' if 'Page Num' in df.columns else None)
-    if page_col:
-        st.subheader("📄 Performance by Page Number")
+        # Add a button column for navigation
+        display_df = page_df.copy()
         
-        # Calculate average scores by page number
-        page_scores = df.groupby(page_col)[overall_score_cols[0]].agg(['mean', 'count']).reset_index()
-        page_scores.columns = ['Page Number', 'Average Score', 'Count']
+        # Display the table with selection enabled
+        selected_rows = st.dataframe(
+            display_df,
+            use_container_width=True,
+            height=400,
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True
+        )
         
-        # Only show pages with at least 5 samples
-        page_scores = page_scores[page_scores['Count'] >= 5]
+        # Row selection for PDF viewer
+        if total_rows > 0:
+            # Check if any row is selected
+            if selected_rows.selection.rows:
+                selected_table_idx = selected_rows.selection.rows[0]
+                actual_row_idx = start_idx + selected_table_idx
+                selected_filename = df.iloc[actual_row_idx].get('Filename', f'Row {actual_row_idx + 1}')
+                selected_page = df.iloc[actual_row_idx].get('Page Number', df.iloc[actual_row_idx].get('Page Num', 'N/A'))
+                
+                st.info(f"Selected: {selected_filename} - Page {selected_page}")
+                # Start reading the document's files for the viewer in the background
+                prefetch_document(config, selected_filename, df.iloc[actual_row_idx]['Discipline'])
+                
+                if st.button("🔍 View PDF & Markdown", type="primary"):
+                    # Only the page's IDs go in session state; the viewer looks its row up
+                    selected_row = df.iloc[actual_row_idx]
+                    select(st.session_state, selected_row['Filename'], selected_row['Discipline'], selected_page)
+                    # Directly navigate to the PDF viewer page
+                    st.switch_page("pages/3_pdf_vis.py")
+            else:
+                st.info("👆 Click on a row in the table above to select it, then click the button to view PDF & Markdown")
+
+@st.fragment
+def charts(df, spec, files_key):
+    """Score distribution, discipline, page-number and text-statistic charts"""
+    def aggregate(name, compute):
+        # Chart aggregates are cached with the filtered pages they come from
+        return cached_result((name, files_key), config, spec, compute)
+
+    overall_score_cols = overall_score_columns(df)
+    page_col = page_column(df)
+    stat_cols = text_statistic_columns(df)
+    if len(df) > 0 and overall_score_cols:
+        st.subheader("📊 Score Distribution")
         
-        if len(page_scores) > 0:
-            fig_page = px.scatter(
-                page_scores,
-                x='Page Number',
+        # Score comparison chart
+        fig_scores = go.Figure()
+        
+        # Binned on the server, so only the counts are sent (first 3 score columns)
+        histogram = aggregate('score_histogram', lambda: score_histogram(df, overall_score_cols[:3]))
+        for col, bins in histogram.groupby('Column', sort=False):
+            fig_scores.add_trace(go.Bar(
+                x=(bins['Bin Start'] + bins['Bin End']) / 2,
+                y=bins['Count'],
+                width=bins['Bin End'] - bins['Bin Start'],
+                name=col.replace(' Overall Score', ''),
+                opacity=0.7
+            ))
+        
+        fig_scores.update_layout(
+            title="Distribution of Overall Scores by Extraction Method (Page Level)",
+            xaxis_title="Score",
+            yaxis_title="Count",
+            barmode='overlay',
+            height=400
+        )
+        
+        st.plotly_chart(fig_scores, use_container_width=True)
+        
+        # Performance comparison by discipline
+        if 'Discipline' in df.columns and aggregate('discipline_count', lambda: df['Discipline'].nunique()) > 1:
+            st.subheader("📈 Performance by Discipline (Page Level)")
+            
+            # Calculate average scores by discipline
+            discipline_scores_df = aggregate('discipline_scores', lambda: discipline_scores(df, overall_score_cols[0]))
+            
+            fig_discipline = px.bar(
+                discipline_scores_df,
+                x='Discipline',
                 y='Average Score',
-                size='Count',
-                title=f"Average {overall_score_cols[0]} by Page Number",
-                hover_data=['Count'],
+                title=f"Average {overall_score_cols[0]} by Discipline (Page Level)",
+                text='Count',
                 height=400
             )
             
-            fig_page.update_layout(yaxis=dict(range=[0, 1]))
+            fig_discipline.update_traces(texttemplate='%{text} pages', textposition='outside')
+            fig_discipline.update_layout(yaxis=dict(range=[0, 1]))
             
-            st.plotly_chart(fig_page, use_container_width=True)
+            st.plotly_chart(fig_discipline, use_container_width=True)
+        
+        # Page number vs performance analysis
+        if page_col:
+            st.subheader("📄 Performance by Page Number")
             
-            st.caption("Only showing page numbers with at least 5 samples. Bubble size indicates number of pages.")
+            # Average scores by page number, only pages with at least 5 samples
+            page_scores = aggregate('page_number_scores',
+                                    lambda: page_number_scores(df, page_col, overall_score_cols[0], min_count=5))
+            
+            if len(page_scores) > 0:
+                fig_page = px.scatter(
+                    page_scores,
+                    x='Page Number',
+                    y='Average Score',
+                    size='Count',
+                    title=f"Average {overall_score_cols[0]} by Page Number",
+                    hover_data=['Count'],
+                    height=400
+                )
+                
+                fig_page.update_layout(yaxis=dict(range=[0, 1]))
+                
+                st.plotly_chart(fig_page, use_container_width=True)
+                
+                st.caption("Only showing page numbers with at least 5 samples. Bubble size indicates number of pages.")
+
+        # Score against a text statistic of the extracted markdown
+        if stat_cols:
+            st.subheader("📝 Performance by Text Statistic")
+
+            statistics = [name for name in TEXT_STATISTICS if any(col.startswith(f'{name} ') for col in stat_cols)]
+            statistic = st.selectbox("Text Statistic:", statistics)
+            stat_scores = aggregate(('text_statistic_scores', statistic), lambda: text_statistic_scores(df, statistic))
+
+            if len(stat_scores) > 0:
+                fig_stat = px.line(
+                    stat_scores,
+                    x='Statistic',
+                    y='Average Score',
+                    color='Tool',
+                    markers=True,
+                    title=f"Average Overall Score by {statistic} (deciles, Page Level)",
+                    hover_data=['Count'],
+                    height=400
+                )
+
+                fig_stat.update_layout(xaxis_title=statistic, yaxis=dict(range=[0, 1]))
+
+                st.plotly_chart(fig_stat, use_container_width=True)
+
+                st.caption("Each point is one decile of the tool's pages, placed at their mean statistic.")
+
+@st.fragment
+def export_section(df, files):
+    st.subheader("💾 Export Data")
+    if st.button("📁 Download Filtered Results as CSV"):
+        export_df = attach_metadata(df, config)
+        if files is not None:
+            export_df = pd.concat([export_df, files.availability(export_df)], axis=1)
+        csv = export_df.to_csv(index=False)
+        st.download_button(
+            label="Download CSV",
+            data=csv,
+            file_name=f"filtered_page_results_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
+
+results_table(df, spec, files, files_key)
+
+# Visualization section
+charts(df, spec, files_key)
 
 # Export functionality
-st.subheader("💾 Export Data")
-if st.button("📁 Download Filtered Results as CSV"):
-    csv = df.to_csv(index=False)
-    st.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name=f"filtered_page_results_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        mime="text/csv"
-    )
+export_section(df, files)
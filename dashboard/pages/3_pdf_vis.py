@@ -1,8 +1,29 @@
+import json
+
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-from pathlib import Path
-import base64
-import os
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from core import (
+    EXTRACTION_TOOLS,
+    DataConfig,
+    DataLoadError,
+    FileLocator,
+    clear_selection,
+    dataset_version,
+    document_metadata,
+    file_manifest,
+    load_markdown,
+    load_pdf,
+    prefetch_document,
+    score_breakdown,
+    selected_row,
+    selection,
+    session_cache,
+    tool_comparison,
+)
 
 # Configure page to use wide layout
 st.set_page_config(page_title="PDF & Markdown Viewer", layout="wide")
@@ -10,91 +31,157 @@ st.set_page_config(page_title="PDF & Markdown Viewer", layout="wide")
 # Initialize session state variables
 if 'selected_file' not in st.session_state:
     st.session_state.selected_file = None
-if 'selected_row_data' not in st.session_state:
-    st.session_state.selected_row_data = None
+if 'selected_discipline' not in st.session_state:
+    st.session_state.selected_discipline = None
+if 'selected_page' not in st.session_state:
+    st.session_state.selected_page = None
 if 'selected_pdf_file' not in st.session_state:
     st.session_state.selected_pdf_file = None
 if 'selected_markdown_file' not in st.session_state:
     st.session_state.selected_markdown_file = None
 
+# Frees the panes cached for closed sessions (and idle ones) in the background
+if Runtime.exists():
+    session_cache.start(is_active=Runtime.instance().is_active_session)
+
 # Page title
 st.markdown('<div class="main-header">📄 PDF & Markdown Viewer</div>', unsafe_allow_html=True)
 
-def display_pdf(file_path):
+def session_cached(key, compute):
+    """``compute()`` cached for this session; a pane is rendered once per file and section"""
+    return session_cache.get(get_script_run_ctx().session_id, key, compute)
+
+def get_locator():
+    """File locator for the PDF and markdown directories configured in app.py"""
+    config = DataConfig.from_state(st.session_state)
+    # Existence checks come from the background file manifest once it has scanned
+    return FileLocator.from_config(config, file_manifest(config))
+
+def display_pdf(file_path, filename, discipline):
     """Display PDF in Streamlit using an embedded iframe"""
     try:
-        with open(file_path, "rb") as f:
-            base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+        # Usually already encoded by the prefetch started when the row was selected
+        base64_pdf = load_pdf(get_locator(), filename, discipline)
+        if base64_pdf is None:
+            raise FileNotFoundError(file_path)
         
-        # Embed PDF in HTML
-        pdf_display = f'''
+        # Embed PDF in HTML; the encoding is cached per file version, so it identifies the version
+        return session_cached(('pdf_pane', filename, discipline, base64_pdf), lambda: f'''
         <iframe src="data:application/pdf;base64,{base64_pdf}" 
                 width="100%" height="600" type="application/pdf">
         </iframe>
-        '''
-        return pdf_display
+        ''')
     except Exception as e:
         st.error(f"Error loading PDF: {str(e)}")
         return None
 
-def load_markdown_content(filename, tool, discipline):
-    """Load markdown content for a specific tool"""
+def load_markdown_document(filename, tool, discipline):
+    """Load the markdown of a specific tool as a chunked document (cached per file version)"""
     try:
-        # Look for markdown files in the output/test directory
-        # md_path = Path(f"resources/extracted/{tool}/{discipline}/{filename}_{tool}.md") # Old path
-        base_md_path = Path(st.session_state.markdown_dir)
-        md_path = base_md_path / tool / discipline / f"{filename}_{tool}.md"
-
-        if md_path.exists():
-            with open(md_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        
-        # # Alternative path pattern
-        # alt_path = Path(f"output/test/{filename.replace('extracted_', '')}_{tool}.md")
-        # if alt_path.exists():
-        #     with open(alt_path, 'r', encoding='utf-8') as f:
-        #         return f.read()
-        
-        return None
-    except KeyError as e:
-        st.error(f"Path key 'markdown_dir' not found in session state: {e}. Ensure it's initialized in app.py.")
-        return None
+        return load_markdown(get_locator(), filename, tool, discipline)
     except Exception as e:
         st.error(f"Error loading {tool} markdown: {str(e)}")
         return None
 
-def find_pdf_file(filename, discipline):
-    """Find PDF file in the examples directory"""
+# Fixed-height rows let the viewer render only the lines scrolled into view
+LINE_HEIGHT = 18
+VIEWER_HEIGHT = 500
+VIEWER_HTML = """
+<div id="viewport" style="height: __HEIGHT__px; overflow: auto; border: 1px solid #ddd; background-color: #f9f9f9;
+     font: 12px/__LINE__px monospace; box-sizing: border-box;">
+  <div id="spacer" style="position: relative;">
+    <pre id="rows" style="position: absolute; left: 0; margin: 0; padding: 0 10px; font: inherit; white-space: pre;"></pre>
+  </div>
+</div>
+<script>
+const lines = __LINES__;
+const viewport = document.getElementById('viewport');
+const rows = document.getElementById('rows');
+document.getElementById('spacer').style.height = (lines.length * __LINE__) + 'px';
+let pending = false;
+function render() {
+  pending = false;
+  const first = Math.max(0, Math.floor(viewport.scrollTop / __LINE__) - 20);
+  const last = Math.min(lines.length, first + Math.ceil(viewport.clientHeight / __LINE__) + 40);
+  rows.style.top = (first * __LINE__) + 'px';
+  // Lines are HTML-escaped on the server
+  rows.innerHTML = lines.slice(first, last).join('\\n');
+}
+viewport.addEventListener('scroll', () => { if (!pending) { pending = true; requestAnimationFrame(render); } });
+render();
+</script>
+"""
+
+def markdown_viewer(document, section):
+    """Scrollable view of a section's escaped lines that only puts the visible ones in the DOM"""
+    # Escaped text has no '<', so the JSON cannot close the script tag. Documents
+    # are cached per file version, so the document identifies the version
+    viewer = session_cached(('markdown_pane', document, section), lambda: (
+        VIEWER_HTML.replace('__LINES__', json.dumps(document.escaped_lines(section)))
+        .replace('__HEIGHT__', str(VIEWER_HEIGHT)).replace('__LINE__', str(LINE_HEIGHT))))
+    components.html(viewer, height=VIEWER_HEIGHT + 10)
+
+def load_document_metadata(filename, discipline):
+    """Title, authors and other metadata of one document"""
     try:
-        # Remove 'extracted_' prefix if present
-        # clean_filename = filename.replace('extracted_', '') if filename.startswith('extracted_') else filename
-        
-        # Look in examples directory
-        # pdf_path = Path(f"resources/gotriple_pdfs/{discipline}/{filename}.pdf") # Old path
-        base_pdf_path = Path(st.session_state.pdf_dir)
-        pdf_path = base_pdf_path / discipline / f"{filename}.pdf"
-
-        # print(pdf_path)
-        if pdf_path.exists():
-            return pdf_path
-    
-        
-        return None
-    except KeyError as e:
-        st.error(f"Path key 'pdf_dir' not found in session state: {e}. Ensure it's initialized in app.py.")
+        return document_metadata(DataConfig.from_state(st.session_state), filename, discipline,
+                                 ['Title', 'Abstract', 'Authors', 'Publication Date', 'Primary Topic'])
+    except Exception as e:
+        st.error(f"Error loading document metadata: {str(e)}")
         return None
+
+def find_pdf_file(filename, discipline):
+    """Find PDF file in the configured PDF directory"""
+    try:
+        return get_locator().find_pdf(filename, discipline)
     except Exception as e:
         st.error(f"Error finding PDF: {str(e)}")
         return None
 
+def tool_tables(row_data):
+    """Tool comparison and per-criterion breakdown of the selected row, cached for the session"""
+    try:
+        version = dataset_version(DataConfig.from_state(st.session_state))
+    except DataLoadError:
+        # No dataset: the row only holds the document's IDs
+        return tool_comparison(row_data), score_breakdown(row_data)
+    return session_cached(('tool_tables', version, selection(st.session_state)),
+                          lambda: (tool_comparison(row_data), score_breakdown(row_data)))
+
+def load_selected_row():
+    """Scores of the selected page (or document), looked up in the shared dataset"""
+    current = selection(st.session_state)
+    if current is None:
+        return None
+    filename, discipline, page = current
+    try:
+        config = DataConfig.from_state(st.session_state)
+        row = selected_row(config, filename, discipline, page)
+        if row is None and page is not None:
+            row = selected_row(config, filename, discipline)
+        if row is not None:
+            return row
+    except DataLoadError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading scores: {str(e)}")
+    # The files can still be shown without scores
+    return {'Filename': filename, 'Discipline': discipline}
+
+row_data = load_selected_row()
+
+# Opened without a prefetch (e.g. from a bookmark): load every tool's markdown at once,
+# so switching tools does not wait for the file
+if row_data:
+    prefetch_document(DataConfig.from_state(st.session_state), row_data['Filename'], row_data['Discipline'])
+
 # Check if a file is selected
-if not st.session_state.selected_file or not st.session_state.selected_row_data:
+if not row_data:
     st.info("👆 You can select documents from the 'Results Overview' page, and select a tool to view the PDF and Markdown.")
 
 # Display selected file information if available
-if st.session_state.selected_file and st.session_state.selected_row_data:
+if row_data:
     filename = st.session_state.selected_file
-    row_data = st.session_state.selected_row_data
 
     st.success(f"📁 Viewing: **{filename}**")
 
@@ -122,151 +209,125 @@ if st.session_state.selected_file and st.session_state.selected_row_data:
                 st.metric("MinerU Score", f"{row_data['Overall Score Mineru']:.3f}")
             if 'Word Count Marker' in row_data:
                 st.metric("Marker Words", f"{int(row_data['Word Count Marker']):,}")
+
+        # Bibliographic details, looked up for this document only
+        details = load_document_metadata(filename, row_data.get('Discipline'))
+        if details:
+            if details.get('Title'):
+                st.markdown(f"**{details['Title']}**")
+            authors = details.get('Authors')
+            if authors is not None and len(authors) > 0:
+                st.caption(', '.join(str(author) for author in authors))
+            if details.get('Publication Date') is not None and not pd.isna(details['Publication Date']):
+                st.caption(f"Published {pd.Timestamp(details['Publication Date']):%Y-%m-%d}"
+                           + (f" · {details['Primary Topic']}" if details.get('Primary Topic') else ""))
+            if details.get('Abstract'):
+                with st.expander("Abstract"):
+                    st.write(details['Abstract'])
     else:
         st.subheader("📊 Document Metadata")
         st.info("ℹ️ Document metadata is not available. Please select a document from the 'Results Overview' page to view detailed metrics and scores.")
 
 
-# Tool selection
-extraction_tools = ['marker', 'pymupdf', 'mineru']
-selected_tool = st.selectbox(
-    "Select extraction tool:",
-    extraction_tools,
-    key="tool_selector"
-)
+# The two panes are fragments: switching the tool or the markdown section only
+# reruns the markdown pane, so the PDF is not re-encoded and resent. Both take
+# the selected document's IDs explicitly.
+@st.fragment
+def pdf_pane(filename, discipline):
+    st.subheader("📄 PDF Preview")
+    
+    pdf_path = find_pdf_file(filename, discipline)
+    if pdf_path:
+        st.info(f"📁 Current file: {pdf_path}")
+        pdf_html = display_pdf(pdf_path, filename, discipline)
+        if pdf_html:
+            st.markdown(pdf_html, unsafe_allow_html=True)
+        else:
+            st.error("Failed to display PDF")
+    else:
+        st.warning(f"PDF file not found for: {filename}, current path: {pdf_path}")
+
+@st.fragment
+def markdown_pane(filename, discipline):
+    st.subheader("📝 Extracted Markdown")
+
+    # Tool selection
+    selected_tool = st.selectbox(
+        "Select extraction tool:",
+        EXTRACTION_TOOLS,
+        key="tool_selector"
+    )
+    
+    # Load and display markdown content
+    document = load_markdown_document(filename, selected_tool, discipline)
+    
+    if document:
+        # Show current file path
+        md_path = get_locator().markdown_path(filename, selected_tool, discipline)
+        st.info(f"📁 Current file: {md_path}")
         
+        # Large files are sent one section at a time
+        st.markdown("**Markdown Content:**")
+        section = 0
+        if len(document) > 1:
+            if st.session_state.get('markdown_section', 0) >= len(document):
+                st.session_state.markdown_section = 0
+            section = st.select_slider(
+                "Section:",
+                options=range(len(document)),
+                format_func=lambda i: "Lines {:,}–{:,}".format(*document.chunk_lines(i)),
+                key='markdown_section'
+            )
+        markdown_viewer(document, section)
+
+        # Markdown statistics, computed once per file
+        stats = document.stats
+        col_a, col_b, col_c = st.columns(3)
+        with col_a:
+            st.metric("Lines", stats.lines)
+        with col_b:
+            st.metric("Words", stats.words)
+        with col_c:
+            st.metric("Characters", stats.chars)
+
+        # Download button for markdown
+        st.download_button(
+            label=f"📥 Download {selected_tool.title()} Markdown",
+            data=document.text,
+            file_name=f"{filename}_{selected_tool}.md",
+            mime="text/markdown"
+        )
+    else:
+        st.warning(f"Markdown file not found for {selected_tool} extraction")
 
 # Main content area with PDF and markdown side by side
 col1, col2 = st.columns([1, 1])
 
 with col1:
-    st.subheader("📄 PDF Preview")
-    
-    if st.session_state.selected_file and st.session_state.selected_row_data:
-        # Fallback to resources directory
-        
-        filename = st.session_state.selected_file
-        row_data = st.session_state.selected_row_data
-        
-        pdf_path = find_pdf_file(filename, row_data.get('Discipline', 'Unknown'))
-        if pdf_path:
-            st.info(f"📁 Current file: {pdf_path}")
-            pdf_html = display_pdf(pdf_path)
-            if pdf_html:
-                st.markdown(pdf_html, unsafe_allow_html=True)
-            else:
-                st.error("Failed to display PDF")
-        else:
-            st.warning(f"PDF file not found for: {filename}, current path: {pdf_path}")
+    if row_data:
+        pdf_pane(st.session_state.selected_file, row_data.get('Discipline', 'Unknown'))
     else:
+        st.subheader("📄 PDF Preview")
         st.info("Please select a PDF file above or from the Results Overview page")
 
 with col2:
-    st.subheader("📝 Extracted Markdown")
-    
-    if st.session_state.selected_file and st.session_state.selected_row_data:
-        # Fallback to extracted markdown from resources
-        filename = st.session_state.selected_file
-        row_data = st.session_state.selected_row_data
-        
-        
-        # Load and display markdown content
-        markdown_content = load_markdown_content(filename, selected_tool, row_data['Discipline'])
-        
-        if markdown_content:
-            # Show current file path
-            md_path = Path(f"resources/extracted/{selected_tool}/{row_data['Discipline']}/{filename}_{selected_tool}.md")
-            st.info(f"📁 Current file: {md_path}")
-            
-            print(f"md path: {md_path}")
-            
-            # Display markdown content in a scrollable container
-            st.markdown("**Markdown Content:**")
-            st.markdown(
-                f"""
-                <div style="height: 500px; overflow-y: scroll; border: 1px solid #ddd; padding: 10px; background-color: #f9f9f9;">
-                    <pre style="white-space: pre-wrap; font-size: 12px;">{markdown_content}</pre>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-            # Show markdown statistics
-            lines = markdown_content.split('\n')
-            words = len(markdown_content.split())
-            chars = len(markdown_content)
-            
-            col_a, col_b, col_c = st.columns(3)
-            with col_a:
-                st.metric("Lines", len(lines))
-            with col_b:
-                st.metric("Words", words)
-            with col_c:
-                st.metric("Characters", chars)
-
-            # Download button for markdown
-            st.download_button(
-                label=f"📥 Download {selected_tool.title()} Markdown",
-                data=markdown_content,
-                file_name=f"{filename}_{selected_tool}.md",
-                mime="text/markdown"
-            )
-        else:
-            st.warning(f"Markdown file not found for {selected_tool} extraction")
+    if row_data:
+        markdown_pane(st.session_state.selected_file, row_data['Discipline'])
     else:
+        st.subheader("📝 Extracted Markdown")
         st.info("Please select a markdown file above or from the Results Overview page")
 
 # Tool comparison section
 st.subheader("⚖️ Extraction Tool Comparison")
 
-if st.session_state.selected_row_data:
-    row_data = st.session_state.selected_row_data
-    
-    # Create comparison metrics
-    tools_data = []
-    
-    for tool in ['Pymupdf', 'Marker', 'Mineru']:
-        tool_info = {}
-        tool_info['Tool'] = tool
-        # Get scores
-        score_key = f'Overall Score {tool}'
-        if score_key in row_data and pd.notna(row_data[score_key]):
-            tool_info['Overall Score'] = round(row_data[score_key], 3)
-        else:
-            tool_info['Overall Score'] = 'N/A'
-        # Get word count (if available)
-        count_key = f'Word Count {tool}'
-        if count_key in row_data and pd.notna(row_data[count_key]):
-            tool_info['Word Count'] = int(row_data[count_key])
-        else:
-            # Try alternative: 'Pdf Page Count' or similar if needed
-            tool_info['Word Count'] = 'N/A'
-        # Get perplexity (if available)
-        perp_key = f'Perplexity {tool}'
-        if perp_key in row_data and pd.notna(row_data[perp_key]):
-            tool_info['Perplexity'] = round(row_data[perp_key], 2)
-        else:
-            tool_info['Perplexity'] = 'N/A'
-        tools_data.append(tool_info)
+if row_data:
     
     # Display comparison table
-    comparison_df = pd.DataFrame(tools_data)
+    comparison_df, detailed_df = tool_tables(row_data)
     st.dataframe(comparison_df, use_container_width=True)
     
     # Detailed scores breakdown
     with st.expander("🔍 Detailed Score Breakdown"):
-        score_types = ['Line Continuity', 'Paragraph Integrity', 'Content Sequencing', 
-                      'Layout Separation', 'Text Completeness']
-        detailed_data = []
-        for tool in ['Pymupdf', 'Marker', 'Mineru']:
-            tool_scores = {'Tool': tool}
-            for score_type in score_types:
-                score_key = f'{score_type} Score {tool}'
-                if score_key in row_data and pd.notna(row_data[score_key]):
-                    tool_scores[score_type] = round(row_data[score_key], 3)
-                else:
-                    tool_scores[score_type] = 'N/A'
-            detailed_data.append(tool_scores)
-        detailed_df = pd.DataFrame(detailed_data)
         st.dataframe(detailed_df, use_container_width=True)
 else:
     st.info("ℹ️ Tool comparison data is not available. Please select a document from the 'Results Overview' page to view extraction tool performance metrics.")
@@ -278,12 +339,10 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("🔙 Back to Results Overview", type="secondary"):
         # Clear selection and go back
-        st.session_state.selected_file = None
-        st.session_state.selected_row_data = None
+        clear_selection(st.session_state)
         st.info("Navigate to 'Results Overview' to select another document")
 
 with col2:
     if st.button("🔄 Clear Selection", type="secondary"):
-        st.session_state.selected_file = None
-        st.session_state.selected_row_data = None
+        clear_selection(st.session_state)
         st.rerun() 
\ No newline at end of file
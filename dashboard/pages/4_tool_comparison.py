@@ -0,0 +1,154 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from core import (
+    COMPARISON_CRITERIA,
+    DataConfig,
+    DataLoadError,
+    FilterSpec,
+    cached_comparison,
+    disciplines,
+    load_dataset,
+    page_column,
+)
+
+# Page title
+st.set_page_config(page_title="⚖️ Tool Comparison", layout="wide")
+
+config = DataConfig.from_state(st.session_state)
+
+def load_data():
+    """Load the page-level evaluation results data"""
+    try:
+        _, df = load_dataset(config)
+        return df
+    except DataLoadError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+    return pd.DataFrame()
+
+df = load_data()
+
+if df.empty:
+    st.warning("No data available to display.")
+    st.stop()
+
+st.title("⚖️ Tool vs Tool Comparison")
+st.markdown(
+    "Paired score differences (Tool A − Tool B on the same page or document) with "
+    "bootstrap confidence intervals. Documents are resampled as a whole, since the "
+    "pages of one document are not independent. A difference is marked significant "
+    "when its interval excludes zero."
+)
+
+# Sidebar filters
+st.sidebar.header("🔍 Filters")
+
+selected_discipline = None
+if 'Discipline' in df.columns:
+    selected_discipline = st.sidebar.selectbox("Select Discipline:", ['All'] + disciplines(df))
+
+page_col = page_column(df)
+page_range = None
+if page_col and not df[page_col].isna().all():
+    min_page, max_page = int(df[page_col].min()), int(df[page_col].max())
+    if max_page > min_page:
+        page_range = st.sidebar.slider(
+            "Page Number Range:",
+            min_value=min_page,
+            max_value=max_page,
+            value=(min_page, max_page),
+            step=1
+        )
+
+st.sidebar.subheader("📐 Comparison")
+level = st.sidebar.radio("Unit:", ['page', 'document'], format_func=str.title)
+n_boot = st.sidebar.select_slider("Bootstrap replicates:", options=[200, 500, 1000, 2000], value=1000)
+confidence = st.sidebar.select_slider("Confidence level:", options=[0.9, 0.95, 0.99], value=0.95)
+
+# Page range only applies to page units; documents are filtered on their own columns
+spec = FilterSpec(
+    discipline=selected_discipline,
+    page_range=page_range if level == 'page' else None,
+)
+
+with st.spinner("Running bootstrap..."):
+    results = cached_comparison(config, spec, level=level, n_boot=n_boot, confidence=confidence)
+
+if results.empty:
+    st.warning("No paired scores available for the current filters.")
+    st.stop()
+
+# The cached frame is shared between sessions, so derive a copy
+results = results.assign(Pair=results['Tool A'] + ' − ' + results['Tool B'])
+criterion = st.selectbox("Criterion:", [c for c in COMPARISON_CRITERIA if c in set(results['Criterion'])])
+subset = results[results['Criterion'] == criterion]
+
+# Metrics for the overall slice
+overall = subset[subset['Discipline'] == 'All']
+cols = st.columns(len(overall))
+for col, (_, row) in zip(cols, overall.iterrows()):
+    with col:
+        st.metric(
+            row['Pair'],
+            f"{row['Mean Difference']:+.3f}",
+            f"{'significant' if row['Significant'] else 'n.s.'}",
+            delta_color='normal' if row['Significant'] else 'off'
+        )
+
+# Forest plot of mean differences with confidence intervals
+st.subheader(f"📊 Mean {criterion} Score Difference")
+fig_forest = go.Figure()
+for pair, group in subset.groupby('Pair', sort=False):
+    fig_forest.add_trace(go.Scatter(
+        x=group['Mean Difference'],
+        y=group['Discipline'],
+        mode='markers',
+        name=pair,
+        error_x=dict(
+            type='data',
+            symmetric=False,
+            array=group['CI High'] - group['Mean Difference'],
+            arrayminus=group['Mean Difference'] - group['CI Low']
+        ),
+        customdata=group[['N', 'CI Low', 'CI High']],
+        hovertemplate="%{y}: %{x:.3f} [%{customdata[1]:.3f}, %{customdata[2]:.3f}], n=%{customdata[0]}"
+    ))
+fig_forest.add_vline(x=0, line_dash='dash', line_color='gray')
+fig_forest.update_layout(
+    xaxis_title="Mean Difference (Tool A − Tool B)",
+    yaxis=dict(autorange='reversed'),
+    height=max(300, 40 * subset['Discipline'].nunique() + 120)
+)
+st.plotly_chart(fig_forest, use_container_width=True)
+
+# Win rates per pair and discipline
+st.subheader("🏆 Win Rate of Tool A")
+win_rates = subset.pivot(index='Discipline', columns='Pair', values='Win Rate A')
+fig_wins = px.imshow(win_rates, text_auto='.2f', zmin=0, zmax=1, aspect='auto',
+                     color_continuous_scale='RdBu', height=max(300, 40 * len(win_rates) + 100))
+st.plotly_chart(fig_wins, use_container_width=True)
+st.caption("Share of paired units where Tool A scores higher than Tool B; ties count for neither.")
+
+# Full results table
+st.subheader("📋 All Criteria")
+st.dataframe(
+    results.drop(columns='Pair'),
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        col: st.column_config.NumberColumn(format="%.3f")
+        for col in ['Mean Difference', 'CI Low', 'CI High', 'Win Rate A', 'Win Rate Low', 'Win Rate High', 'Tie Rate']
+    }
+)
+
+st.subheader("💾 Export Data")
+st.download_button(
+    label="Download Comparison as CSV",
+    data=results.drop(columns='Pair').to_csv(index=False),
+    file_name=f"tool_comparison_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
+    mime="text/csv"
+)
@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+
+from core import (
+    COMPARISON_CRITERIA,
+    TOOLS,
+    TRIAGE_K,
+    DataConfig,
+    DataLoadError,
+    disciplines,
+    load_dataset,
+    page_column,
+    prefetch_document,
+    select,
+    triage_index,
+)
+
+# Page title
+st.set_page_config(page_title="🚑 Worst Pages Triage", layout="wide")
+
+config = DataConfig.from_state(st.session_state)
+
+def load_data():
+    """Load the page-level results and their triage index"""
+    try:
+        _, df = load_dataset(config)
+        return df, triage_index(config)
+    except DataLoadError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+    return pd.DataFrame(), None
+
+df, index = load_data()
+
+if df.empty:
+    st.warning("No data available to display.")
+    st.stop()
+
+st.title("🚑 Worst Pages Triage")
+st.markdown("Precomputed lists of the lowest and highest scoring pages per tool and criterion, "
+            "and of the pages where two tools disagree the most.")
+
+# Sidebar options
+st.sidebar.header("🔍 Triage")
+
+selected_discipline = 'All'
+if 'Discipline' in df.columns:
+    selected_discipline = st.sidebar.selectbox("Select Discipline:", ['All'] + disciplines(df))
+
+mode = st.sidebar.radio("List:", ["Lowest scores", "Highest scores", "Largest disagreement"])
+criterion = st.sidebar.selectbox("Criterion:", COMPARISON_CRITERIA)
+
+if mode == "Largest disagreement":
+    high_tool = st.sidebar.selectbox("Scores high:", TOOLS, index=1)
+    low_tool = st.sidebar.selectbox("Scores low:", [tool for tool in TOOLS if tool != high_tool])
+    positions = index.disagreement(high_tool, low_tool, criterion, selected_discipline)
+    score_cols = [f'{criterion} Score {high_tool}', f'{criterion} Score {low_tool}']
+else:
+    tool = st.sidebar.selectbox("Tool:", TOOLS)
+    lookup = index.worst if mode == "Lowest scores" else index.best
+    positions = lookup(tool, criterion, selected_discipline)
+    score_cols = [f'{criterion} Score {t}' for t in [tool] + [t for t in TOOLS if t != tool]]
+
+top_k = st.sidebar.slider("Pages to show:", min_value=10, max_value=TRIAGE_K, value=50, step=10)
+positions = positions[:top_k]
+
+if len(positions) == 0:
+    st.warning("No scores available for this selection.")
+    st.stop()
+
+# Only the listed rows are materialised
+rows = df.iloc[positions]
+page_col = page_column(df)
+show_columns = [col for col in ['Filename', page_col, 'Discipline'] + score_cols if col in rows.columns]
+table = rows[show_columns]
+if mode == "Largest disagreement":
+    table = table.assign(Difference=rows[score_cols[0]] - rows[score_cols[1]])
+
+# Row selection only reruns the table fragment, not the index lookups above
+@st.fragment
+def triage_table(rows, table, page_col, mode):
+    """Listed pages and the row selection for the viewer"""
+    st.subheader(f"📋 {mode}: {len(table)} pages")
+    selected_rows = st.dataframe(
+        table,
+        use_container_width=True,
+        height=500,
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True
+    )
+
+    if selected_rows.selection.rows:
+        selected_row = rows.iloc[selected_rows.selection.rows[0]]
+        selected_page = selected_row.get(page_col, 'N/A')
+        st.info(f"Selected: {selected_row.get('Filename', '')} - Page {selected_page}")
+        # Start reading the document's files for the viewer in the background
+        prefetch_document(config, selected_row['Filename'], selected_row['Discipline'])
+
+        if st.button("🔍 View PDF & Markdown", type="primary"):
+            select(st.session_state, selected_row['Filename'], selected_row['Discipline'], selected_page)
+            st.switch_page("pages/3_pdf_vis.py")
+    else:
+        st.info("👆 Click on a row in the table above to select it, then click the button to view PDF & Markdown")
+
+triage_table(rows, table, page_col, mode)
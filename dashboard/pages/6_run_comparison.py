@@ -0,0 +1,131 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from core import (
+    COMPARISON_CRITERIA,
+    TOOLS,
+    DataConfig,
+    RunStore,
+    raw_name,
+    run_deltas,
+)
+
+# Page title
+st.set_page_config(page_title="🔁 Run Comparison", layout="wide")
+
+config = DataConfig.from_state(st.session_state)
+
+st.title("🔁 Run-to-Run Comparison")
+st.markdown("Score changes between two benchmark runs on the pages (or documents) scored in both.")
+
+if not RunStore.exists(config.runs_dir):
+    st.warning("No benchmark runs available. Add runs with `python dashboard/add_run.py` "
+               "and set the runs directory on the main page or with RUNS_DIR.")
+    st.stop()
+
+runs = {run['name']: run for run in RunStore(config.runs_dir).runs}
+names = list(runs)
+if len(names) < 2:
+    st.warning("At least two benchmark runs are needed for a comparison.")
+    st.stop()
+
+def describe(name):
+    run = runs[name]
+    return f"{name} ({run['created']}, {run['pages']:,} pages)"
+
+# Sidebar options
+st.sidebar.header("🔁 Runs")
+base = st.sidebar.selectbox("Base run:", names, index=len(names) - 2, format_func=describe)
+# Newest other run by default
+other = st.sidebar.selectbox("Compared run:", [name for name in names if name != base],
+                             index=len(names) - 2, format_func=describe)
+level = st.sidebar.radio("Unit:", ['page', 'document'], format_func=str.title)
+criterion = st.sidebar.selectbox("Criterion:", COMPARISON_CRITERIA)
+threshold = st.sidebar.slider("Change threshold:", min_value=0.0, max_value=0.5, value=0.05, step=0.01,
+                              help="Score changes smaller than this count as unchanged.")
+
+columns = tuple(raw_name(f'{criterion} Score {tool}') for tool in TOOLS)
+
+def load_deltas():
+    """Join the two runs on their shared document/page keys"""
+    try:
+        return run_deltas(config, base, other, level=level, columns=columns)
+    except Exception as e:
+        st.error(f"Error comparing runs: {str(e)}")
+    return pd.DataFrame(), None
+
+deltas, counts = load_deltas()
+
+if counts is None:
+    st.stop()
+
+unit = 'pages' if level == 'page' else 'documents'
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric(f"Matched {unit}", f"{counts['matched']:,}")
+with col2:
+    st.metric(f"Only in {base}", f"{counts['only_base']:,}")
+with col3:
+    st.metric(f"Only in {other}", f"{counts['only_other']:,}")
+
+if deltas.empty:
+    st.warning(f"The two runs have no {unit} in common.")
+    st.stop()
+
+# Per-tool summary of the change
+st.subheader(f"📊 {criterion} Score Change per Tool")
+summary = []
+for tool in TOOLS:
+    delta = deltas[f'{criterion} Score {tool} Delta']
+    summary.append({
+        'Tool': tool,
+        f'Mean ({base})': deltas[f'{criterion} Score {tool} ({base})'].mean(),
+        f'Mean ({other})': deltas[f'{criterion} Score {tool} ({other})'].mean(),
+        'Mean Delta': delta.mean(),
+        'Improved': int((delta > threshold).sum()),
+        'Regressed': int((delta < -threshold).sum()),
+        'Unchanged': int((delta.abs() <= threshold).sum()),
+    })
+summary = pd.DataFrame(summary)
+cols = st.columns(len(summary))
+for col, (_, row) in zip(cols, summary.iterrows()):
+    with col:
+        st.metric(row['Tool'], f"{row[f'Mean ({other})']:.3f}", f"{row['Mean Delta']:+.3f}")
+st.dataframe(summary, use_container_width=True, hide_index=True,
+             column_config={col: st.column_config.NumberColumn(format="%.3f")
+                            for col in [f'Mean ({base})', f'Mean ({other})', 'Mean Delta']})
+
+# Distribution of the per-unit changes; switching the tool only reruns this fragment
+@st.fragment
+def tool_changes(deltas, criterion, level, base, other):
+    """Histogram and largest regressions and improvements of one tool's deltas"""
+    tool = st.selectbox("Tool:", TOOLS)
+    delta_col = f'{criterion} Score {tool} Delta'
+    fig = px.histogram(deltas, x=delta_col, nbins=80, title=f"{tool}: {criterion} score change per {level}")
+    fig.add_vline(x=0, line_dash='dash', line_color='gray')
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Largest regressions and improvements
+    keys = ['Filename', 'Discipline'] + (['Page Num'] if level == 'page' else [])
+    shown = keys + [f'{criterion} Score {tool} ({base})', f'{criterion} Score {tool} ({other})', delta_col]
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("📉 Largest Regressions")
+        st.dataframe(deltas.nsmallest(50, delta_col)[shown], use_container_width=True, hide_index=True)
+    with col2:
+        st.subheader("📈 Largest Improvements")
+        st.dataframe(deltas.nlargest(50, delta_col)[shown], use_container_width=True, hide_index=True)
+
+tool_changes(deltas, criterion, level, base, other)
+
+st.subheader("💾 Export Data")
+# Only the changed units; a full page-level export can run to millions of rows
+delta_cols = [f'{criterion} Score {tool} Delta' for tool in TOOLS]
+changed = deltas[(deltas[delta_cols].abs() > threshold).any(axis=1)]
+st.download_button(
+    label=f"Download {len(changed):,} Changed {unit.title()} as CSV",
+    data=changed.to_csv(index=False),
+    file_name=f"run_deltas_{base}_{other}_{level}.csv",
+    mime="text/csv"
+)
@@ -0,0 +1,114 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from core import (
+    COMPARISON_CRITERIA,
+    TOOLS,
+    VARIABLES,
+    DataConfig,
+    DataLoadError,
+    moment_table,
+)
+
+# Page title
+st.set_page_config(page_title="📈 Criteria Analytics", layout="wide")
+
+config = DataConfig.from_state(st.session_state)
+
+def load_table():
+    """Load the correlation statistics of the current dataset"""
+    try:
+        return moment_table(config)
+    except DataLoadError as e:
+        st.error(str(e))
+    except Exception as e:
+        st.error(f"Error loading data: {str(e)}")
+    return None
+
+table = load_table()
+
+if table is None or len(table) == 0:
+    st.warning("No data available to display.")
+    st.stop()
+
+st.title("📈 Criteria Analytics")
+st.markdown(
+    "How the judge criteria relate to each other, to word count and to page number, per tool. "
+    "Statistics are precomputed per discipline and page number, so every filter combination is "
+    "assembled without a pass over the pages."
+)
+
+# Sidebar filters
+st.sidebar.header("🔍 Filters")
+selected_discipline = st.sidebar.selectbox("Select Discipline:", ['All'] + sorted(set(table.disciplines)))
+
+page_range = None
+pages = table.pages[table.pages >= 0]
+if len(pages) and pages.max() > pages.min():
+    min_page, max_page = int(pages.min()), int(pages.max())
+    page_range = st.sidebar.slider(
+        "Page Number Range:",
+        min_value=min_page,
+        max_value=max_page,
+        value=(min_page, max_page),
+        step=1
+    )
+
+n, _, _ = table.select(selected_discipline, page_range)
+cols = st.columns(len(TOOLS))
+for col, tool, count in zip(cols, table.tools, n):
+    with col:
+        st.metric(f"{tool} Pages", f"{int(count):,}")
+
+# Each chart with its own options is a fragment, so changing the tool or the
+# regression variables does not rebuild the other charts
+@st.fragment
+def correlation_matrix(table, selected_discipline, page_range):
+    """Correlation matrix for one tool"""
+    st.subheader("🔗 Correlation Matrix")
+    tool = st.selectbox("Tool:", table.tools)
+    corr = table.correlation(tool, selected_discipline, page_range)
+    fig_corr = px.imshow(corr, text_auto='.2f', zmin=-1, zmax=1, color_continuous_scale='RdBu', aspect='auto',
+                         height=550)
+    st.plotly_chart(fig_corr, use_container_width=True)
+
+correlation_matrix(table, selected_discipline, page_range)
+
+# Each variable's correlation with the overall score, side by side for all tools
+st.subheader("⚖️ Correlation with Overall Score")
+with_overall = pd.DataFrame({
+    name: table.correlation(name, selected_discipline, page_range)['Overall']
+    for name in table.tools
+}).drop(index='Overall')
+st.dataframe(with_overall, use_container_width=True,
+             column_config={name: st.column_config.NumberColumn(format="%.3f") for name in table.tools})
+
+@st.fragment
+def regression_lines(table, selected_discipline, page_range):
+    """Regression lines of two variables, one per tool"""
+    st.subheader("📉 Regression")
+    col1, col2 = st.columns(2)
+    with col1:
+        x = st.selectbox("X:", VARIABLES, index=VARIABLES.index('Word Count'))
+    with col2:
+        y = st.selectbox("Y:", [v for v in VARIABLES if v != x], index=0)
+    lines = table.regression(x, y, selected_discipline, page_range)
+
+    fig_lines = go.Figure()
+    for _, row in lines.iterrows():
+        if row['N'] < 2 or np.isnan(row['Slope']):
+            continue
+        # Over mean ± 2 SD of X; the statistics carry no minimum or maximum
+        xs = np.array([row['Mean X'] - 2 * row['SD X'], row['Mean X'] + 2 * row['SD X']])
+        fig_lines.add_trace(go.Scatter(x=xs, y=row['Intercept'] + row['Slope'] * xs, mode='lines',
+                                       name=f"{row['Tool']} (r={row['R']:.2f})"))
+    fig_lines.update_layout(xaxis_title=x, yaxis_title=y if y not in COMPARISON_CRITERIA else f"{y} Score")
+    st.plotly_chart(fig_lines, use_container_width=True)
+    st.dataframe(lines.drop(columns=['Mean X', 'SD X']), use_container_width=True, hide_index=True,
+                 column_config={col: st.column_config.NumberColumn(format="%.4f")
+                                for col in ['Slope', 'Intercept', 'R']})
+
+regression_lines(table, selected_discipline, page_range)
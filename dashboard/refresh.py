@@ -0,0 +1,45 @@
+"""Rebuild the derived data of a column store after a new benchmark run.
+
+Optionally (re)builds the store from the page-score CSV, then computes the
+document aggregates and correlation statistics across a process pool (see
+``core/parallel.py``).
+
+Usage:
+    python dashboard/refresh.py --csv data/page_scores_full.csv --store /data/store
+    python dashboard/refresh.py --store /data/store --workers 8
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+
+from core import ColumnStore, DataConfig, refresh_derived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh derived benchmark data")
+    parser.add_argument('--store', type=Path, help="Column store directory (default: STORE_DIR)")
+    parser.add_argument('--csv', type=Path, help="Build the store from this page-score CSV first")
+    parser.add_argument('--chunk-rows', type=int, default=None,
+                        help="CSV rows per ingest chunk (smaller chunks give more, smaller partitions)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes")
+    args = parser.parse_args()
+
+    store_dir = args.store or DataConfig.from_env().store_dir
+    if store_dir is None:
+        parser.error("--store or STORE_DIR is required")
+
+    if args.csv:
+        start = time.perf_counter()
+        kwargs = {'chunk_rows': args.chunk_rows} if args.chunk_rows else {}
+        store = ColumnStore.build(args.csv, store_dir, **kwargs)
+        print(f"Built store with {store.rows:,} rows in {len(store.partitions)} partitions "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    start = time.perf_counter()
+    refresh_derived(store_dir, workers=args.workers)
+    print(f"Refreshed derived data with {args.workers} workers ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Headless benchmark report.
+
+Runs the Overall Results aggregations (per discipline, per tool, per page
+number, per criterion) in a single streaming pass over the columnar store and
+writes ``report.json`` plus a static ``report.html`` with pre-rendered
+figures. Partitions are read one at a time, in slices that fit
+``--memory-budget-mb``, so the full dataset never has to be in memory.
+
+Usage:
+    python dashboard/report.py --out reports/run-2026-10
+    python dashboard/report.py --csv page_scores_full.csv --store /data/store --out reports/
+"""
+import argparse
+import html
+import json
+from pathlib import Path
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from core import ColumnStore, DataConfig, summarize_parallel, summarize_store
+
+
+def build_figures(tables):
+    """Plotly figures for the summary tables, keyed by section title"""
+    figures = {}
+
+    histograms = tables['histograms']
+    fig = go.Figure()
+    for col in [c for c in histograms.columns if c.startswith('Overall Score')]:
+        fig.add_trace(go.Bar(
+            x=(histograms['Bin Start'] + histograms['Bin End']) / 2,
+            y=histograms[col],
+            name=col.replace('Overall Score ', ''),
+            opacity=0.7
+        ))
+    fig.update_layout(title="Distribution of Overall Scores by Extraction Method (Page Level)",
+                      xaxis_title="Score", yaxis_title="Count", barmode='overlay', height=400)
+    figures['Score Distribution'] = fig
+
+    disciplines = tables['disciplines']
+    overall_cols = [c for c in disciplines.columns if c.startswith('Overall Score')]
+    long = disciplines.melt(id_vars=['Discipline'], value_vars=overall_cols,
+                            var_name='Tool', value_name='Average Score')
+    long['Tool'] = long['Tool'].str.replace('Overall Score ', '')
+    fig = px.bar(long, x='Discipline', y='Average Score', color='Tool', barmode='group',
+                 title="Average Overall Score by Discipline (Page Level)", height=400)
+    fig.update_layout(yaxis=dict(range=[0, 1]))
+    figures['Performance by Discipline'] = fig
+
+    criteria = tables['tools'].set_index('Tool').drop(columns=['Word Count'], errors='ignore')
+    fig = px.imshow(criteria, text_auto='.3f', zmin=0, zmax=1, aspect='auto',
+                    title="Average Score by Criterion and Tool", height=350)
+    figures['Criterion Breakdown'] = fig
+
+    if 'page_numbers' in tables and not tables['page_numbers'].empty:
+        page_numbers = tables['page_numbers']
+        overall_cols = [c for c in page_numbers.columns if c.startswith('Overall Score')]
+        long = page_numbers.melt(id_vars=['Page Number', 'Count'], value_vars=overall_cols,
+                                 var_name='Tool', value_name='Average Score')
+        long['Tool'] = long['Tool'].str.replace('Overall Score ', '')
+        fig = px.scatter(long, x='Page Number', y='Average Score', color='Tool', size='Count',
+                         title="Average Overall Score by Page Number", height=400)
+        fig.update_layout(yaxis=dict(range=[0, 1]))
+        figures['Performance by Page Number'] = fig
+    return figures
+
+
+def render_html(tables, figures, source):
+    """Self-contained HTML page with the figures and summary tables"""
+    sections = []
+    for i, (title, fig) in enumerate(figures.items()):
+        # Inline plotly.js once so the report works offline
+        sections.append(f"<h2>{html.escape(title)}</h2>"
+                        + fig.to_html(full_html=False, include_plotlyjs=(i == 0)))
+    for name in ('disciplines', 'tools', 'criteria'):
+        sections.append(f"<h2>{html.escape(name.title())}</h2>"
+                        + tables[name].to_html(index=False, float_format='{:.3f}'.format, border=0))
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>PDF Extraction Benchmark Report</title>
+<style>body {{ font-family: sans-serif; margin: 2rem; }} table {{ border-collapse: collapse; }}
+td, th {{ padding: 4px 10px; border-bottom: 1px solid #ddd; text-align: right; }}</style></head>
+<body><h1>📊 PDF Extraction Benchmark Report</h1>
+<p>Source: {html.escape(source)} &middot; generated {pd.Timestamp.now():%Y-%m-%d %H:%M}</p>
+{''.join(sections)}
+</body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a static benchmark report")
+    parser.add_argument('--out', type=Path, required=True, help="Output directory")
+    parser.add_argument('--store', type=Path, help="Column store directory (default: STORE_DIR)")
+    parser.add_argument('--csv', type=Path, help="Build the store from this page-score CSV first")
+    parser.add_argument('--memory-budget-mb', type=int, default=512,
+                        help="Upper bound on the page data held in memory at once")
+    parser.add_argument('--discipline', action='append', help="Restrict to a discipline (repeatable)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes; the memory budget is shared between them")
+    args = parser.parse_args()
+
+    config = DataConfig.from_env()
+    store_dir = args.store or config.store_dir
+    if store_dir is None:
+        parser.error("--store or STORE_DIR is required")
+    if args.csv:
+        print(f"Building column store {store_dir} from {args.csv}")
+        store = ColumnStore.build(args.csv, store_dir)
+    else:
+        store = ColumnStore(store_dir)
+
+    max_bytes = args.memory_budget_mb * 1024 ** 2
+    if args.workers > 1:
+        accumulator = summarize_parallel(store, args.workers, disciplines=args.discipline, max_bytes=max_bytes)
+    else:
+        accumulator = summarize_store(store, disciplines=args.discipline, max_bytes=max_bytes)
+    tables = accumulator.result()
+    if not tables:
+        parser.error("No rows matched")
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    report = {
+        'source': store.manifest['source'],
+        'version': store.version,
+        'tables': {name: json.loads(df.to_json(orient='records')) for name, df in tables.items()},
+    }
+    (args.out / 'report.json').write_text(json.dumps(report, indent=1))
+    figures = build_figures(tables)
+    (args.out / 'report.html').write_text(render_html(tables, figures, store.manifest['source']), encoding='utf-8')
+    print(f"Report written to {args.out / 'report.html'} and {args.out / 'report.json'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Compute text statistics of the extracted markdown for the dashboard.
+
+Processes every ``<markdown_dir>/<tool>/<discipline>/*_<tool>.md`` file in
+parallel and writes per-page and per-document statistics (see
+``core/textstats.py``). Point TEXT_STATS_DIR at the output to get them as
+filterable columns next to the scores. Re-run after the markdown changes.
+
+Usage:
+    python dashboard/text_stats.py --out /data/text_stats
+    python dashboard/text_stats.py --markdown-dir /data/extracted --out /data/text_stats --workers 8
+"""
+import argparse
+import time
+from pathlib import Path
+
+from core import ColumnStore, DataConfig, build_text_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute text statistics of the extracted markdown")
+    parser.add_argument('--markdown-dir', type=Path, help="Extracted markdown directory (default: MARKDOWN_DIR)")
+    parser.add_argument('--out', type=Path, help="Output directory (default: TEXT_STATS_DIR)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    config = DataConfig.from_env()
+    markdown_dir = args.markdown_dir or config.markdown_dir
+    out = args.out or config.text_stats_dir
+    if markdown_dir is None or not markdown_dir.is_dir():
+        parser.error(f"Markdown directory not found: {markdown_dir} (--markdown-dir or MARKDOWN_DIR)")
+    if out is None:
+        parser.error("--out or TEXT_STATS_DIR is required")
+
+    start = time.perf_counter()
+    files = build_text_stats(markdown_dir, out, workers=args.workers)
+    pages, documents = ColumnStore(out / 'pages'), ColumnStore(out / 'documents')
+    print(f"Processed {files:,} files: {pages.rows:,} pages, {documents.rows:,} documents "
+          f"written to {out} ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dashboard'))
+from core import bootstrap_differences, compare_tools  # noqa: E402
+
+
+def clustered_differences(rng, documents=60, pages=20):
+    """Page differences with a true mean of zero and a strong per-document effect"""
+    effects = rng.normal(0.0, 0.2, documents)
+    diffs = np.repeat(effects, pages) + rng.normal(0.0, 0.02, documents * pages)
+    return diffs[:, None], np.repeat(np.arange(documents), pages)
+
+
+def coverage(clustered, max_units=10_000, trials=200):
+    """Share of trials whose 95% interval contains the true mean difference"""
+    rng = np.random.default_rng(1)
+    covered = 0
+    for _ in range(trials):
+        diffs, clusters = clustered_differences(rng)
+        # The data differ per trial; the shared weights can stay the same
+        stats = bootstrap_differences(diffs, n_boot=500, clusters=clusters if clustered else None,
+                                      max_units=max_units)
+        covered += stats['mean_low'][0] <= 0 <= stats['mean_high'][0]
+    return covered / trials
+
+
+def test_document_bootstrap_covers_the_true_mean():
+    assert 0.88 <= coverage(clustered=True) <= 0.99
+
+
+def test_document_bootstrap_covers_with_m_out_of_n():
+    # 30 of 60 documents per replicate
+    assert 0.85 <= coverage(clustered=True, max_units=30) <= 1.0
+
+
+def test_page_bootstrap_is_too_narrow_on_clustered_pages():
+    assert coverage(clustered=False) < 0.5
+
+
+def test_compare_tools_resamples_documents():
+    rng = np.random.default_rng(0)
+    diffs, clusters = clustered_differences(rng)
+    df = pd.DataFrame({
+        'Filename': [f'doc{c}' for c in clusters],
+        'Discipline': 'hist',
+        'Overall Score Marker': 0.5 + diffs[:, 0],
+        'Overall Score Pymupdf': 0.5,
+    })
+    result = compare_tools(df, pairs=[('Marker', 'Pymupdf')], criteria=['Overall'], n_boot=500)
+    expected = bootstrap_differences(diffs, n_boot=500, clusters=clusters)
+    overall = result[result['Discipline'] == 'All'].iloc[0]
+    assert np.isclose(overall['CI Low'], expected['mean_low'][0])
+    assert np.isclose(overall['CI High'], expected['mean_high'][0])
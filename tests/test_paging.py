@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dashboard'))
+from core import MemoryBudgetError  # noqa: E402
+from core.paging import PartitionCache  # noqa: E402
+
+
+def test_partition_over_the_budget_is_not_loaded():
+    cache = PartitionCache(max_bytes=1000)
+    loads = []
+    with pytest.raises(MemoryBudgetError):
+        cache.get(('part',), 2000, lambda: loads.append(1))
+    assert loads == []
+    assert len(cache) == 0
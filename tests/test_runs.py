@@ -0,0 +1,61 @@
+import multiprocessing
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dashboard'))
+from core.runs import RunStore  # noqa: E402
+
+
+def page_scores(docs, seed):
+    rng = np.random.default_rng(seed)
+    rows = [(doc, 'hist' if i % 2 else 'bio', page) for i, doc in enumerate(docs) for page in (1, 2, 3)]
+    df = pd.DataFrame(rows, columns=['pdf_id', 'discipline', 'page_num'])
+    df['overall_score_marker'] = rng.random(len(df))
+    return df
+
+
+def test_pages_without_a_number_are_left_out_of_the_page_join(tmp_path):
+    base = page_scores(['a', 'b', 'c'], 0)
+    other = page_scores(['a', 'b', 'c'], 1)
+    base.loc[1, 'page_num'] = np.nan
+    other.loc[4, 'page_num'] = np.nan
+    base.to_csv(tmp_path / 'base.csv', index=False)
+    other.to_csv(tmp_path / 'other.csv', index=False)
+    store = RunStore(tmp_path / 'runs')
+    assert store.add_run('base', tmp_path / 'base.csv', chunk_rows=4)['unnumbered_pages'] == 1
+    store.add_run('other', tmp_path / 'other.csv', chunk_rows=4)
+
+    frame, counts = store.page_deltas('base', 'other')
+    assert counts == {'matched': 7, 'only_base': 1, 'only_other': 1}
+    expected = base.dropna().merge(other.dropna(), on=['pdf_id', 'discipline', 'page_num'])
+    expected = expected.sort_values(['pdf_id', 'page_num'])
+    result = frame.sort_values(['Filename', 'Page Num'])
+    np.testing.assert_array_equal(result['Page Num'].to_numpy(), expected['page_num'].to_numpy())
+    np.testing.assert_allclose(result['Overall Score Marker Delta'].to_numpy(),
+                               (expected['overall_score_marker_y'] - expected['overall_score_marker_x']).to_numpy())
+
+
+def _add_run(root, name, csv_path):
+    RunStore(root).add_run(name, csv_path)
+
+
+def test_concurrent_ingests_share_one_document_dictionary(tmp_path):
+    names = ['first', 'second']
+    for k, name in enumerate(names):
+        page_scores([f'{name}-{i}' for i in range(50)], k).to_csv(tmp_path / f'{name}.csv', index=False)
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=_add_run, args=(tmp_path / 'runs', name, tmp_path / f'{name}.csv'))
+                 for name in names]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    store = RunStore(tmp_path / 'runs')
+    assert sorted(store.names) == names
+    assert len(store.documents()) == 100
+    for name in names:
+        pages = store.read_pages(name)
+        assert pages['filename'].str.startswith(f'extracted_{name}-').all()
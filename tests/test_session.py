@@ -0,0 +1,32 @@
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dashboard'))
+from core.session import SessionCache  # noqa: E402
+
+
+def test_ended_sessions_are_dropped():
+    active = {'a', 'b'}
+    cache = SessionCache()
+    cache.is_active = active.__contains__
+    for session_id in ('a', 'b'):
+        cache.get(session_id, 'view', lambda: 1)
+    active.discard('a')
+    assert cache.evict_idle() == 1
+    assert len(cache) == 1
+
+
+def test_idle_sessions_are_dropped_on_a_timer():
+    now = [0.0]
+    cache = SessionCache(idle_seconds=10, clock=lambda: now[0])
+    cache.get('a', 'view', lambda: 1)
+    now[0] = 11.0
+    cache.start(interval=0.01)
+    try:
+        deadline = time.monotonic() + 5
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop()
+    assert len(cache) == 0
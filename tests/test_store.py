@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dashboard'))
+from core import DataLoadError  # noqa: E402
+from core.store import ColumnStore  # noqa: E402
+
+
+def page_scores():
+    return pd.DataFrame({
+        'pdf_id': ['a', 'a', 'b', 'b', 'c', 'c', 'd', 'd'],
+        'discipline': ['hist'] * 4 + ['bio'] * 4,
+        'page_num': [1, 2, 1, 2, 1, 2, 1, 2],
+        'score': np.arange(8) / 10,
+        # Empty in the first chunks, text or numbers later
+        'note': [None] * 4 + ['x', '12', None, 'y'],
+        'late': [None] * 6 + [1.5, None],
+    })
+
+
+def read_all(store):
+    return pd.concat([store.read(partition) for partition in store.partitions], ignore_index=True)
+
+
+def test_column_kinds_are_fixed_across_chunks(tmp_path):
+    df = page_scores()
+    df.to_csv(tmp_path / 'pages.csv', index=False)
+    store = ColumnStore.build(tmp_path / 'pages.csv', tmp_path / 'store', chunk_rows=3)
+
+    assert store.columns['note'] == 'category'
+    assert store.columns['late'] == 'numeric'
+    result = read_all(store).sort_values(['Pdf Id', 'Page Num'], ignore_index=True)
+    assert result['Note'].astype(object).fillna('').tolist() == df['note'].fillna('').tolist()
+    np.testing.assert_array_equal(result['Late'].to_numpy(), df['late'].to_numpy(dtype=float))
+    np.testing.assert_array_equal(result['Score'].to_numpy(), df['score'].to_numpy())
+
+
+def test_text_in_a_numeric_column_fails(tmp_path):
+    df = page_scores().astype({'score': object})
+    df.loc[7, 'score'] = 'pending'
+    df.to_csv(tmp_path / 'pages.csv', index=False)
+    with pytest.raises(DataLoadError, match="'score'"):
+        ColumnStore.build(tmp_path / 'pages.csv', tmp_path / 'store', chunk_rows=3)
+
+
+@pytest.mark.parametrize('order', [[0, 2, 1, 3, 4, 5, 6, 7], [0, 1, 2, 4, 5, 3, 6, 7]])
+def test_documents_must_be_contiguous(tmp_path, order):
+    # Split within a chunk, and across chunks
+    page_scores().iloc[order].to_csv(tmp_path / 'pages.csv', index=False)
+    with pytest.raises(DataLoadError, match='not contiguous'):
+        ColumnStore.build(tmp_path / 'pages.csv', tmp_path / 'store', chunk_rows=3)
+
+
+def test_documents_are_counted_once(tmp_path):
+    page_scores().to_csv(tmp_path / 'pages.csv', index=False)
+    store = ColumnStore.build(tmp_path / 'pages.csv', tmp_path / 'store', chunk_rows=3)
+    documents = read_all(store).groupby(['Filename', 'Discipline'], observed=True).size()
+    assert len(documents) == 4
+    assert (documents == 2).all()